@@ -10,6 +10,7 @@ from edmunds.foundation.concerns.database import Database as ConcernsDatabase
 from edmunds.foundation.concerns.localization import Localization as ConcernsLocalization
 from edmunds.foundation.concerns.cache import Cache as ConcernsCache
 from edmunds.foundation.concerns.auth import Auth as ConcernsAuth
+from edmunds.foundation.concerns.metrics import Metrics as ConcernsMetrics
 from edmunds.exceptions.exceptionsserviceprovider import ExceptionsServiceProvider
 from edmunds.log.providers.logserviceprovider import LogServiceProvider
 from edmunds.session.providers.sessionserviceprovider import SessionServiceProvider
@@ -21,6 +22,7 @@ from edmunds.http.providers.httpserviceprovider import HttpServiceProvider
 from edmunds.auth.providers.authserviceprovider import AuthServiceProvider
 from edmunds.foundation.providers.runtimeenvironmentprovider import RuntimeEnvironmentServiceProvider
 from edmunds.profiler.providers.profilerserviceprovider import ProfilerServiceProvider
+from edmunds.metrics.providers.metricsserviceprovider import MetricsServiceProvider
 from edmunds.config.config import Config
 from edmunds.http.request import Request
 from edmunds.http.response import Response
@@ -37,7 +39,8 @@ class Application(Flask,
                   ConcernsDatabase,
                   ConcernsLocalization,
                   ConcernsCache,
-                  ConcernsAuth):
+                  ConcernsAuth,
+                  ConcernsMetrics):
     """
     The Edmunds Application
     """
@@ -67,6 +70,7 @@ class Application(Flask,
         self._init_database()
 
         self.register(RuntimeEnvironmentServiceProvider)
+        self.register(MetricsServiceProvider)
         self.register(ProfilerServiceProvider)
         self.register(HttpServiceProvider)
         self.register(StorageServiceProvider)
@@ -114,6 +118,7 @@ class Application(Flask,
             endpoint = options.pop('endpoint')
         else:
             endpoint = 'edmunds.route.%s' % rule
+        route.endpoint = endpoint
 
         # Add route
         self.add_url_rule(rule, endpoint=endpoint, view_func=route.handle)
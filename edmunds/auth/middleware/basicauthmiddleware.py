@@ -8,6 +8,8 @@ class BasicAuthMiddleware(RequestMiddleware):
     Basic Authentication Middleware
     """
 
+    stateless = True
+
     def before(self, realm=None):
         """
         Handle before the request
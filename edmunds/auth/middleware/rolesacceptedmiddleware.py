@@ -9,6 +9,8 @@ class RolesAcceptedMiddleware(RequestMiddleware):
     Roles accepted Middleware
     """
 
+    stateless = True
+
     def before(self, *roles):
         """
         Handle before the request
@@ -9,6 +9,8 @@ class RolesRequiredMiddleware(RequestMiddleware):
     Roles required Middleware
     """
 
+    stateless = True
+
     def before(self, *roles):
         """
         Handle before the request
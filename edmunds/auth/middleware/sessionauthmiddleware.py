@@ -8,6 +8,8 @@ class SessionAuthMiddleware(RequestMiddleware):
     Session Authentication Middleware
     """
 
+    stateless = True
+
     def before(self):
         """
         Handle before the request
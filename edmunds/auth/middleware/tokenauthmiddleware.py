@@ -8,6 +8,8 @@ class TokenAuthMiddleware(RequestMiddleware):
     Token Authentication Middleware
     """
 
+    stateless = True
+
     def before(self):
         """
         Handle before the request
@@ -2,7 +2,11 @@
 from edmunds.foundation.patterns.manager import Manager
 from edmunds.cache.drivers.file import File
 from edmunds.cache.drivers.memcached import Memcached
+from edmunds.cache.drivers.memory import Memory
 from edmunds.cache.drivers.redis import Redis
+from edmunds.cache.drivers.tiered import Tiered
+from edmunds.cache.serializer import Serializer
+from threading import local
 import os
 
 
@@ -22,6 +26,92 @@ class CacheManager(Manager):
 
         self._cache_path = os.path.join(os.sep, 'cache')
 
+    def _resolve(self, name):
+        """
+        Resolve the instance
+        :param name:    The name of the instance
+        :type  name:    str
+        :return:        The driver
+        :rtype:         BaseCache
+        """
+
+        driver = super(CacheManager, self)._resolve(name)
+
+        registry = self._app.metrics()
+        if registry is not None:
+            self._meter(driver, name, registry)
+
+        return driver
+
+    def _meter(self, driver, name, registry):
+        """
+        Count the hits and misses of the public lookups of the driver.
+        Lookups the driver does itself, like fetching the generations
+        of tags or the entry of remember, are not counted.
+        :param driver:      The driver
+        :type  driver:      BaseCache
+        :param name:        The name of the instance
+        :type  name:        str
+        :param registry:    The metrics registry
+        :type  registry:    edmunds.metrics.registry.Registry
+        """
+
+        labels = (('instance', name),)
+        state = local()
+
+        def public(method, meter=None):
+            def metered(*args, **kwargs):
+                if getattr(state, 'internal', False):
+                    return method(*args, **kwargs)
+                state.internal = True
+                try:
+                    result = method(*args, **kwargs)
+                finally:
+                    state.internal = False
+                if meter is not None:
+                    meter(result)
+                return result
+            return metered
+
+        def meter_get(value):
+            registry.inc('edmunds_cache_misses_total' if value is None else 'edmunds_cache_hits_total', labels)
+
+        def meter_get_many(values):
+            misses = values.count(None)
+            if misses:
+                registry.inc('edmunds_cache_misses_total', labels, misses)
+            if len(values) > misses:
+                registry.inc('edmunds_cache_hits_total', labels, len(values) - misses)
+
+        driver.get = public(driver.get, meter_get)
+        driver.get_many = public(driver.get_many, meter_get_many)
+        # Storing tagged values fetches the generations of the tags
+        driver.set = public(driver.set)
+        driver.add = public(driver.add)
+        driver.set_many = public(driver.set_many)
+
+        remember = getattr(driver, 'remember', None)
+        if remember is None:
+            return
+        remember = public(remember)
+
+        def metered_remember(key, timeout, producer, *args, **kwargs):
+            produced = []
+
+            def metered_producer():
+                # Lookups of the producer are public again
+                produced.append(True)
+                state.internal = False
+                try:
+                    return producer()
+                finally:
+                    state.internal = True
+
+            value = remember(key, timeout, metered_producer, *args, **kwargs)
+            registry.inc('edmunds_cache_misses_total' if produced else 'edmunds_cache_hits_total', labels)
+            return value
+        driver.remember = metered_remember
+
     def _create_file(self, config):
         """
         Create File instance
@@ -52,9 +142,35 @@ class CacheManager(Manager):
             options['default_timeout'] = config['default_timeout']
         if 'mode' in config:
             options['mode'] = config['mode']
+        if 'shard_depth' in config:
+            options['shard_depth'] = config['shard_depth']
+        if 'serializer' in config or 'compression' in config:
+            options['serializer'] = self._get_serializer(config)
 
         return File(cache_dir, **options)
 
+    def _get_serializer(self, config):
+        """
+        Get Serializer for the instance
+        :param config:  The config
+        :type  config:  dict
+        :return:        Serializer instance
+        :rtype:         Serializer
+        """
+
+        options = {}
+
+        if 'serializer' in config:
+            options['method'] = config['serializer']
+        if 'compression' in config:
+            options['compression'] = config['compression']
+        if 'compress_threshold' in config:
+            options['compress_threshold'] = config['compress_threshold']
+        if 'compress_level' in config:
+            options['compress_level'] = config['compress_level']
+
+        return Serializer(**options)
+
     def _create_redis(self, config):
         """
         Create Redis instance
@@ -78,6 +194,21 @@ class CacheManager(Manager):
             options['default_timeout'] = config['default_timeout']
         if 'key_prefix' in config:
             options['key_prefix'] = config['key_prefix']
+        # Connection pool
+        if 'max_connections' in config:
+            options['max_connections'] = config['max_connections']
+        if 'socket_timeout' in config:
+            options['socket_timeout'] = config['socket_timeout']
+        if 'socket_connect_timeout' in config:
+            options['socket_connect_timeout'] = config['socket_connect_timeout']
+        if 'socket_keepalive' in config:
+            options['socket_keepalive'] = config['socket_keepalive']
+        if 'socket_keepalive_options' in config:
+            options['socket_keepalive_options'] = config['socket_keepalive_options']
+        if 'retry_on_timeout' in config:
+            options['retry_on_timeout'] = config['retry_on_timeout']
+        if 'serializer' in config or 'compression' in config:
+            options['serializer'] = self._get_serializer(config)
 
         return Redis(**options)
 
@@ -98,5 +229,53 @@ class CacheManager(Manager):
             options['default_timeout'] = config['default_timeout']
         if 'key_prefix' in config:
             options['key_prefix'] = config['key_prefix']
+        if 'serializer' in config or 'compression' in config:
+            options['serializer'] = self._get_serializer(config)
 
         return Memcached(**options)
+
+    def _create_memory(self, config):
+        """
+        Create Memory instance
+        :param config:  The config
+        :type  config:  dict
+        :return:        Memory instance
+        :rtype:         Memory
+        """
+
+        options = {}
+
+        if 'threshold' in config:
+            options['threshold'] = config['threshold']
+        if 'max_bytes' in config:
+            options['max_bytes'] = config['max_bytes']
+        if 'policy' in config:
+            options['policy'] = config['policy']
+        if 'default_timeout' in config:
+            options['default_timeout'] = config['default_timeout']
+
+        return Memory(**options)
+
+    def _create_tiered(self, config):
+        """
+        Create Tiered instance
+        :param config:  The config
+        :type  config:  dict
+        :return:        Tiered instance
+        :rtype:         Tiered
+        """
+
+        if 'near' not in config or 'remote' not in config:
+            raise RuntimeError("Cache-driver '%s' is missing some configuration ('near' and 'remote' are required)." % config['name'])
+
+        near = self._resolve_loading_instance(config['near'])
+        remote = self._resolve_loading_instance(config['remote'])
+
+        options = {}
+
+        if 'near_timeout' in config:
+            options['near_timeout'] = config['near_timeout']
+        if 'invalidation_channel' in config:
+            options['invalidation_channel'] = config['invalidation_channel']
+
+        return Tiered(near, remote, **options)
@@ -0,0 +1,157 @@
+
+from edmunds.support.lazyattribute import LazyAttribute
+from threading import Event, Lock
+from time import time, sleep
+from math import log
+from random import random
+
+
+class Remember(object):
+    """
+    This class concerns remember code for cache drivers to extend from
+    """
+
+    # Seconds between checks while another process holds the lock
+    remember_lock_interval = 0.05
+
+    def remember(self, key, timeout, producer, stale_timeout=0, lock_timeout=None, beta=1.0, tags=None):
+        """
+        Get the value or produce and store it.
+        Only one thread in this process produces a key at once,
+        the others wait for its value. While a stale or early
+        refreshed value is available, it is returned instead of
+        waiting. Values are stored as (value, expires, delta) so
+        they should be fetched with remember.
+        :param key:             The key
+        :type  key:             str
+        :param timeout:         The timeout in seconds (0 never expires, None for default)
+        :type  timeout:         int
+        :param producer:        Function that produces the value
+        :type  producer:        callable
+        :param stale_timeout:   Seconds a value can be served stale after it expired
+        :type  stale_timeout:   int
+        :param lock_timeout:    Seconds to lock the key between processes while
+                                producing (None does not lock)
+        :type  lock_timeout:    int
+        :param beta:            Eagerness of refreshing early (0 does not refresh early)
+        :type  beta:            float
+        :param tags:            The tags to invalidate the value with
+        :type  tags:            list
+        :return:                The value
+        """
+
+        if timeout is None:
+            timeout = self.default_timeout
+
+        entry = self.get(key)
+        if entry is not None:
+            value, expires, delta = entry
+            if expires == 0:
+                return value
+            # Refresh early with a chance that increases when the value
+            # nears expiry and takes longer to produce
+            if time() - delta * beta * log(1.0 - random()) < expires:
+                return value
+
+        flights, flights_lock = self._remember_flights
+        with flights_lock:
+            flight = flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                flights[key] = flight
+
+        if not leader:
+            if entry is not None:
+                return entry[0]
+            flight.event.wait()
+            if flight.entry is not None:
+                return flight.entry[0]
+            # Producing failed for the leader
+            return producer()
+
+        try:
+            flight.entry = self._remember_produce(key, timeout, producer, entry, stale_timeout, lock_timeout, tags)
+            return flight.entry[0]
+        finally:
+            with flights_lock:
+                del flights[key]
+            flight.event.set()
+
+    def _remember_produce(self, key, timeout, producer, stale_entry, stale_timeout, lock_timeout, tags):
+        """
+        Produce the value and store it
+        :param key:             The key
+        :type  key:             str
+        :param timeout:         The timeout in seconds (0 never expires)
+        :type  timeout:         int
+        :param producer:        Function that produces the value
+        :type  producer:        callable
+        :param stale_entry:     The stale entry or None
+        :type  stale_entry:     tuple
+        :param stale_timeout:   Seconds a value can be served stale after it expired
+        :type  stale_timeout:   int
+        :param lock_timeout:    Seconds to lock the key between processes while producing
+        :type  lock_timeout:    int
+        :param tags:            The tags to invalidate the value with
+        :type  tags:            list
+        :return:                The entry
+        :rtype:                 tuple
+        """
+
+        lock_key = None
+        if lock_timeout is not None:
+            lock_key = '%s:remember-lock' % key
+            lock_expires = time() + lock_timeout
+            while not self.add(lock_key, 1, timeout=lock_timeout):
+                # Another process is producing the value
+                if stale_entry is not None:
+                    return stale_entry
+                if time() >= lock_expires:
+                    lock_key = None
+                    break
+                sleep(self.remember_lock_interval)
+                entry = self.get(key)
+                if entry is not None:
+                    return entry
+
+        try:
+            started = time()
+            value = producer()
+            now = time()
+
+            if timeout > 0:
+                entry = (value, now + timeout, now - started)
+                self.set(key, entry, timeout=timeout + stale_timeout, tags=tags)
+            else:
+                entry = (value, 0, now - started)
+                self.set(key, entry, timeout=0, tags=tags)
+            return entry
+
+        finally:
+            if lock_key is not None:
+                self.delete(lock_key)
+
+    def _load_remember_flights(self):
+        """
+        The keys being produced in this process and their lock
+        :rtype: tuple
+        """
+
+        return {}, Lock()
+
+    _remember_flights = LazyAttribute(_load_remember_flights, slot='_lazy_remember_flights', locked=True)
+
+
+class _Flight(object):
+    """
+    Producing of a key other threads can wait for
+    """
+
+    def __init__(self):
+        """
+        Initiate the flight
+        """
+
+        self.event = Event()
+        self.entry = None
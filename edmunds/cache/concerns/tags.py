@@ -0,0 +1,126 @@
+
+from random import randint
+
+
+class Tags(object):
+    """
+    This class concerns tags code for cache drivers to extend from.
+    Tagged values are stored with the generation of their tags.
+    Invalidating a tag increments its generation, so all values
+    stored with an older generation are no longer returned.
+    """
+
+    def invalidate_tags(self, tags):
+        """
+        Invalidate all values stored with these tags
+        :param tags:    The tags
+        :type  tags:    list
+        """
+
+        for tag in tags:
+            self.inc(self._get_tag_key(tag))
+
+    def _get_tag_key(self, tag):
+        """
+        Get the key of the generation of a tag
+        :param tag:     The tag
+        :type  tag:     str
+        :return:        The key
+        :rtype:         str
+        """
+
+        return '_tag.%s' % tag
+
+    def _tag_value(self, value, tags):
+        """
+        Tag the value with the current generation of the tags
+        :param value:   The value
+        :param tags:    The tags
+        :type  tags:    list
+        :return:        The tagged value
+        :rtype:         dict
+        """
+
+        return self._tag_mapping({None: value}, tags)[None]
+
+    def _tag_mapping(self, mapping, tags):
+        """
+        Tag the values with the current generation of the tags
+        :param mapping: The keys and values
+        :type  mapping: dict
+        :param tags:    The tags
+        :type  tags:    list
+        :return:        The keys and tagged values
+        :rtype:         dict
+        """
+
+        tag_keys = [self._get_tag_key(tag) for tag in tags]
+        generations = self.get_many(*tag_keys)
+
+        for index, generation in enumerate(generations):
+            if generation is not None:
+                continue
+            # Start at a random generation so a generation that got
+            # evicted does not validate old values again
+            generation = randint(1, 2 ** 31 - 1)
+            if not self.add(tag_keys[index], generation, timeout=0):
+                generation = self.get(tag_keys[index])
+            generations[index] = generation
+
+        tag_generations = dict(zip(tags, generations))
+
+        return dict((key, {'_tagged_value': mapping[key], '_tag_generations': tag_generations}) for key in mapping)
+
+    def _untag_value(self, value):
+        """
+        Get the value of a tagged value
+        :param value:   The (tagged) value
+        :return:        The value or None when a tag was invalidated
+        """
+
+        if not self._is_tagged(value):
+            return value
+        return self._untag_values([value])[0]
+
+    def _untag_values(self, values):
+        """
+        Get the values of tagged values. The current generations
+        of all tags are fetched at once.
+        :param values:  The (tagged) values
+        :type  values:  list
+        :return:        The values or None when a tag was invalidated
+        :rtype:         list
+        """
+
+        tagged_indexes = [index for index, value in enumerate(values) if self._is_tagged(value)]
+        if not tagged_indexes:
+            return values
+
+        tags = set()
+        for index in tagged_indexes:
+            tags.update(values[index]['_tag_generations'])
+        tags = list(tags)
+        current_generations = dict(zip(tags, self.get_many(*[self._get_tag_key(tag) for tag in tags])))
+
+        values = list(values)
+        for index in tagged_indexes:
+            tag_generations = values[index]['_tag_generations']
+            valid = True
+            for tag in tag_generations:
+                generation = current_generations[tag]
+                if generation is None or generation != tag_generations[tag]:
+                    valid = False
+                    break
+            values[index] = values[index]['_tagged_value'] if valid else None
+
+        return values
+
+    def _is_tagged(self, value):
+        """
+        Check if value is tagged
+        :param value:   The value
+        :return:        Is tagged
+        :rtype:         bool
+        """
+
+        return type(value) is dict and len(value) == 2 and '_tag_generations' in value and '_tagged_value' in value
@@ -1,9 +1,534 @@
 
-from werkzeug.contrib.cache import FileSystemCache
+from werkzeug.contrib.cache import BaseCache
+from werkzeug.posixemulation import rename
+from edmunds.cache.concerns.remember import Remember as ConcernsRemember
+from edmunds.cache.concerns.tags import Tags as ConcernsTags
+from hashlib import md5
+from time import time
+import errno
+import os
+import tempfile
+try:
+    import cPickle as pickle
+except ImportError:  # pragma: no cover
+    import pickle
 
 
-class File(FileSystemCache):
+class File(BaseCache, ConcernsRemember, ConcernsTags):
     """
     File Driver
+    Entries are sharded over hashed subdirectories and written
+    atomically by renaming a temporary file. Expiry is tracked in
+    append-only index files per time bucket so pruning only visits
+    expired entries instead of the whole cache directory. The
+    index is compacted to the live entries when over the threshold,
+    evicting down to a low-water mark so compaction is amortized over
+    the writes that follow. Pruning is limited to once per interval,
+    unless a burst of writes would overshoot the threshold by more
+    than the room freed by the last compaction.
     """
-    pass
+
+    #: used for temporary files
+    _fs_transaction_suffix = '.__edmunds_cache'
+    #: directory of the expiry index
+    _fs_expiry_directory = '_expiry'
+    #: bucket of the entries that never expire
+    _fs_never_bucket = 'never'
+    #: seconds of expiry per index bucket
+    _expiry_bucket_seconds = 60
+    #: minimum seconds between prunes
+    _prune_interval = 1
+    #: part of the threshold kept when compacting
+    _low_water_ratio = 2 / 3.0
+    #: length of a line in the expiry index
+    _expiry_line_length = len('%010d %s\n' % (0, md5(b'').hexdigest()))
+
+    def __init__(self, cache_dir, threshold=500, default_timeout=300, mode=0o600, shard_depth=2, serializer=None):
+        """
+        Initiate the instance
+        :param cache_dir:       The directory of the cache
+        :type  cache_dir:       str
+        :param threshold:       The maximum number of entries (0 is no threshold)
+        :type  threshold:       int
+        :param default_timeout: The default timeout in seconds (0 never expires)
+        :type  default_timeout: int
+        :param mode:            The file mode of the cache files
+        :type  mode:            int
+        :param shard_depth:     The number of subdirectory levels (256 per level)
+        :type  shard_depth:     int
+        :param serializer:      The serializer (default pickle)
+        :type  serializer:      edmunds.cache.serializer.Serializer
+        """
+
+        super(File, self).__init__(default_timeout=default_timeout)
+
+        self._path = cache_dir
+        self._threshold = threshold
+        self._mode = mode
+        self._shard_depth = shard_depth
+        self.serializer = serializer
+        self._expiry_path = os.path.join(cache_dir, self._fs_expiry_directory)
+        self._next_prune = 0
+        self._pending_writes = 0
+        self._low_water = max(0, min(threshold - 1, int(threshold * self._low_water_ratio)))
+
+        self._makedirs(self._expiry_path)
+
+    def _normalize_timeout(self, timeout):
+        """
+        Normalize timeout to the time it expires
+        :param timeout: The timeout
+        :type  timeout: int
+        :return:        Expires (0 never expires)
+        :rtype:         int
+        """
+
+        timeout = super(File, self)._normalize_timeout(timeout)
+        if timeout != 0:
+            timeout = time() + timeout
+        return int(timeout)
+
+    def _get_hash(self, key):
+        """
+        Get the hash of the key
+        :param key:     The key
+        :type  key:     str
+        :return:        The hash
+        :rtype:         str
+        """
+
+        if not isinstance(key, bytes):
+            key = key.encode('utf-8')
+        return md5(key).hexdigest()
+
+    def _get_filename(self, key):
+        """
+        Get the filename of the key
+        :param key:     The key
+        :type  key:     str
+        :return:        The filename
+        :rtype:         str
+        """
+
+        return self._get_hash_filename(self._get_hash(key))
+
+    def _get_hash_filename(self, key_hash):
+        """
+        Get the filename of the hash of a key
+        :param key_hash:    The hash of the key
+        :type  key_hash:    str
+        :return:            The filename
+        :rtype:             str
+        """
+
+        shards = [key_hash[index * 2:index * 2 + 2] for index in range(self._shard_depth)]
+        return os.path.join(self._path, *(shards + [key_hash]))
+
+    def get(self, key):
+        """
+        Get value
+        :param key:     The key
+        :type  key:     str
+        :return:        The value or None
+        """
+
+        filename = self._get_filename(key)
+        try:
+            with open(filename, 'rb') as f:
+                expires = pickle.load(f)
+                if expires == 0 or expires >= time():
+                    if self.serializer is not None:
+                        return self._untag_value(self.serializer.loads(f.read()))
+                    return self._untag_value(pickle.load(f))
+            os.remove(filename)
+        except (IOError, OSError):
+            pass
+        except (EOFError, ValueError, pickle.PickleError):
+            # A corrupt entry is a miss
+            try:
+                os.remove(filename)
+            except (IOError, OSError):
+                pass
+        return None
+
+    def has(self, key):
+        """
+        Check if key exists
+        :param key:     The key
+        :type  key:     str
+        :return:        Exists
+        :rtype:         bool
+        """
+
+        return self._get_expires(self._get_filename(key), remove_expired=True) is not None
+
+    def set(self, key, value, timeout=None, tags=None):
+        """
+        Set value
+        :param key:     The key
+        :type  key:     str
+        :param value:   The value
+        :param timeout: The timeout in seconds (0 never expires)
+        :type  timeout: int
+        :param tags:    The tags to invalidate the value with
+        :type  tags:    list
+        :return:        Whether the value has been stored
+        :rtype:         bool
+        """
+
+        if tags:
+            value = self._tag_value(value, tags)
+        return self._write(key, value, timeout, overwrite=True)
+
+    def add(self, key, value, timeout=None, tags=None):
+        """
+        Atomically add value if the key does not exist yet
+        :param key:     The key
+        :type  key:     str
+        :param value:   The value
+        :param timeout: The timeout in seconds (0 never expires)
+        :type  timeout: int
+        :param tags:    The tags to invalidate the value with
+        :type  tags:    list
+        :return:        Whether the value has been stored
+        :rtype:         bool
+        """
+
+        if tags:
+            value = self._tag_value(value, tags)
+        return self._write(key, value, timeout, overwrite=False)
+
+    def set_many(self, mapping, timeout=None, tags=None):
+        """
+        Set multiple values
+        :param mapping: The keys and values
+        :type  mapping: dict
+        :param timeout: The timeout in seconds (0 never expires)
+        :type  timeout: int
+        :param tags:    The tags to invalidate the values with
+        :type  tags:    list
+        :return:        Whether all values have been stored
+        :rtype:         bool
+        """
+
+        if tags:
+            mapping = self._tag_mapping(mapping, tags)
+        stored = True
+        for key in mapping:
+            if not self.set(key, mapping[key], timeout=timeout):
+                stored = False
+        return stored
+
+    def delete(self, key):
+        """
+        Delete value
+        :param key:     The key
+        :type  key:     str
+        :return:        Whether the key existed
+        :rtype:         bool
+        """
+
+        try:
+            os.remove(self._get_filename(key))
+        except (IOError, OSError):
+            return False
+        return True
+
+    def clear(self):
+        """
+        Clear the cache
+        :return:    Cleared
+        :rtype:     bool
+        """
+
+        cleared = True
+        for root, subdirs, files in os.walk(self._path):
+            for file in files:
+                try:
+                    os.remove(os.path.join(root, file))
+                except (IOError, OSError):
+                    cleared = False
+        return cleared
+
+    def _write(self, key, value, timeout, overwrite):
+        """
+        Write the value to a temporary file and move it in place
+        :param key:         The key
+        :type  key:         str
+        :param value:       The value
+        :param timeout:     The timeout in seconds (0 never expires)
+        :type  timeout:     int
+        :param overwrite:   Overwrite an existing value
+        :type  overwrite:   bool
+        :return:            Whether the value has been stored
+        :rtype:             bool
+        """
+
+        self._prune()
+
+        expires = self._normalize_timeout(timeout)
+        key_hash = self._get_hash(key)
+        filename = self._get_hash_filename(key_hash)
+        directory = os.path.dirname(filename)
+
+        try:
+            self._makedirs(directory)
+            fd, tmp = tempfile.mkstemp(suffix=self._fs_transaction_suffix, dir=directory)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(expires, f, 1)
+                if self.serializer is not None:
+                    f.write(self.serializer.dumps(value))
+                else:
+                    pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+            os.chmod(tmp, self._mode)
+
+            if overwrite:
+                rename(tmp, filename)
+            elif not self._link(tmp, filename):
+                return False
+        except (IOError, OSError):
+            return False
+
+        self._index_expiry(key_hash, expires)
+        return True
+
+    def _link(self, tmp, filename):
+        """
+        Move the temporary file in place when no value exists
+        :param tmp:         The temporary file
+        :type  tmp:         str
+        :param filename:    The filename
+        :type  filename:    str
+        :return:            Whether the file has been moved
+        :rtype:             bool
+        """
+
+        try:
+            # Linking fails when the file exists, so only one writer can win
+            os.link(tmp, filename)
+            return True
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+            # An expired value can be replaced
+            if self._get_expires(filename, remove_expired=False) is not None:
+                return False
+            rename(tmp, filename)
+            tmp = None
+            return True
+        finally:
+            if tmp is not None:
+                os.remove(tmp)
+
+    def _get_expires(self, filename, remove_expired):
+        """
+        Get the time the file expires
+        :param filename:        The filename
+        :type  filename:        str
+        :param remove_expired:  Remove the file when it expired
+        :type  remove_expired:  bool
+        :return:                Expires or None when missing or expired
+        :rtype:                 int
+        """
+
+        try:
+            with open(filename, 'rb') as f:
+                expires = pickle.load(f)
+            if expires == 0 or expires >= time():
+                return expires
+            if remove_expired:
+                os.remove(filename)
+        except (IOError, OSError, EOFError, pickle.PickleError):
+            pass
+        return None
+
+    def _index_expiry(self, key_hash, expires):
+        """
+        Append the entry to the expiry index
+        :param key_hash:    The hash of the key
+        :type  key_hash:    str
+        :param expires:     Expires (0 never expires)
+        :type  expires:     int
+        """
+
+        if expires == 0:
+            bucket = self._fs_never_bucket
+        else:
+            bucket = str(expires // self._expiry_bucket_seconds)
+
+        line = '%010d %s\n' % (expires, key_hash)
+        try:
+            # Appending a single line is atomic between processes
+            with open(os.path.join(self._expiry_path, bucket), 'a') as f:
+                f.write(line)
+        except (IOError, OSError):
+            pass
+
+    def _prune(self):
+        """
+        Remove the entries of expired buckets, and compact the index
+        to evict the first live entries to expire when over the threshold
+        """
+
+        now = time()
+        self._pending_writes += 1
+        # A burst of writes may only fill the room of the last compaction
+        if now < self._next_prune and (self._threshold == 0 or self._pending_writes <= self._threshold - self._low_water):
+            return
+        self._next_prune = now + self._prune_interval
+        self._pending_writes = 0
+
+        try:
+            buckets = [bucket for bucket in os.listdir(self._expiry_path)
+                       if not bucket.endswith(self._fs_transaction_suffix)]
+        except (IOError, OSError):
+            return
+
+        # Buckets in order of expiry, never expiring last
+        expiring_buckets = sorted(int(bucket) for bucket in buckets if bucket.isdigit())
+        ordered_buckets = [str(bucket) for bucket in expiring_buckets]
+        if self._fs_never_bucket in buckets:
+            ordered_buckets.append(self._fs_never_bucket)
+
+        # Remove expired
+        while expiring_buckets and (expiring_buckets[0] + 1) * self._expiry_bucket_seconds <= now:
+            self._prune_bucket(str(expiring_buckets.pop(0)), now)
+            ordered_buckets.pop(0)
+
+        if self._threshold == 0:
+            return
+
+        # Index lines are an upper bound of the entries as overwritten and
+        # deleted entries stay indexed, so only then count the live entries.
+        count = 0
+        for bucket in ordered_buckets:
+            try:
+                count += os.path.getsize(os.path.join(self._expiry_path, bucket)) // self._expiry_line_length
+            except (IOError, OSError):
+                pass
+
+        if count >= self._threshold:
+            self._compact(ordered_buckets, now)
+
+    def _prune_bucket(self, bucket, now):
+        """
+        Remove the expired entries of a bucket
+        :param bucket:  The bucket
+        :type  bucket:  str
+        :param now:     The current time
+        :type  now:     float
+        """
+
+        for expires, key_hash in self._take_bucket(bucket):
+            if expires != 0 and expires < now and self._get_hash_expires(key_hash) == expires:
+                self._remove_hash(key_hash)
+
+    def _compact(self, buckets, now):
+        """
+        Compact the index to the live entries and remove the first
+        entries to expire down to the low-water mark
+        :param buckets: The buckets in order of expiry
+        :type  buckets: list
+        :param now:     The current time
+        :type  now:     float
+        """
+
+        entries = []
+        seen = set()
+        for bucket in buckets:
+            for expires, key_hash in self._take_bucket(bucket):
+                # Overwritten entries are indexed with another expiry
+                if key_hash in seen or self._get_hash_expires(key_hash) != expires:
+                    continue
+                seen.add(key_hash)
+                if expires != 0 and expires < now:
+                    self._remove_hash(key_hash)
+                else:
+                    entries.append((bucket, expires, key_hash))
+
+        # Make room for the entries to be written until the next compaction
+        entries.sort(key=lambda entry: (entry[1] == 0, entry[1]))
+        evicted = 0
+        if len(entries) >= self._threshold:
+            evicted = len(entries) - self._low_water
+        for bucket, expires, key_hash in entries[:evicted]:
+            self._remove_hash(key_hash)
+
+        lines = {}
+        for bucket, expires, key_hash in entries[evicted:]:
+            lines.setdefault(bucket, []).append('%010d %s\n' % (expires, key_hash))
+        for bucket in lines:
+            try:
+                with open(os.path.join(self._expiry_path, bucket), 'a') as f:
+                    f.write(''.join(lines[bucket]))
+            except (IOError, OSError):
+                pass
+
+    def _take_bucket(self, bucket):
+        """
+        Take the entries out of a bucket
+        :param bucket:  The bucket
+        :type  bucket:  str
+        :return:        The expires and hashes of the keys
+        :rtype:         list
+        """
+
+        bucket_filename = os.path.join(self._expiry_path, bucket)
+        # Move the bucket away first so concurrent writers start a new one
+        pruning_filename = bucket_filename + '.%s%s' % (os.getpid(), self._fs_transaction_suffix)
+        try:
+            rename(bucket_filename, pruning_filename)
+            with open(pruning_filename, 'r') as f:
+                lines = f.readlines()
+            os.remove(pruning_filename)
+        except (IOError, OSError):
+            return []
+
+        entries = []
+        for line in lines:
+            try:
+                expires, key_hash = line.split()
+                entries.append((int(expires), key_hash))
+            except ValueError:
+                continue
+        return entries
+
+    def _get_hash_expires(self, key_hash):
+        """
+        Get the time the entry of a hash expires
+        :param key_hash:    The hash of the key
+        :type  key_hash:    str
+        :return:            Expires or None when missing
+        :rtype:             int
+        """
+
+        try:
+            with open(self._get_hash_filename(key_hash), 'rb') as f:
+                return pickle.load(f)
+        except (IOError, OSError, EOFError, pickle.PickleError):
+            return None
+
+    def _remove_hash(self, key_hash):
+        """
+        Remove the entry of a hash
+        :param key_hash:    The hash of the key
+        :type  key_hash:    str
+        """
+
+        try:
+            os.remove(self._get_hash_filename(key_hash))
+        except (IOError, OSError):
+            pass
+
+    def _makedirs(self, directory):
+        """
+        Make directory when it does not exist
+        :param directory:   The directory
+        :type  directory:   str
+        """
+
+        try:
+            os.makedirs(directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
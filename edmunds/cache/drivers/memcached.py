@@ -1,9 +1,216 @@
 
 from werkzeug.contrib.cache import MemcachedCache
+from edmunds.cache.concerns.remember import Remember as ConcernsRemember
+from edmunds.cache.concerns.tags import Tags as ConcernsTags
 
 
-class Memcached(MemcachedCache):
+class Memcached(MemcachedCache, ConcernsRemember, ConcernsTags):
     """
     Memcached Driver
+    Multiple keys are fetched, set and deleted with the multi
+    commands of the client, so in one round trip per server.
     """
-    pass
+
+    def __init__(self, servers=None, default_timeout=300, key_prefix=None, serializer=None):
+        """
+        Initiate the instance
+        :param servers:         The servers or a memcache client
+        :type  servers:         list
+        :param default_timeout: The default timeout in seconds (0 never expires)
+        :type  default_timeout: int
+        :param key_prefix:      The prefix of all keys
+        :type  key_prefix:      str
+        :param serializer:      The serializer (default the one of the client)
+        :type  serializer:      edmunds.cache.serializer.Serializer
+        """
+
+        super(Memcached, self).__init__(servers=servers, default_timeout=default_timeout, key_prefix=key_prefix)
+
+        self.serializer = serializer
+
+    def get(self, key):
+        """
+        Get value
+        :param key:     The key
+        :type  key:     str
+        :return:        The value or None
+        """
+
+        return self._untag_value(self._load(super(Memcached, self).get(key)))
+
+    def get_dict(self, *keys):
+        """
+        Get multiple values with one multi-get
+        :param keys:    The keys
+        :type  keys:    str
+        :return:        The values or None by key
+        :rtype:         dict
+        """
+
+        values = super(Memcached, self).get_dict(*keys)
+        keys = list(values)
+        return dict(zip(keys, self._untag_values([self._load(values[key]) for key in keys])))
+
+    def set(self, key, value, timeout=None, tags=None):
+        """
+        Set value
+        :param key:     The key
+        :type  key:     str
+        :param value:   The value
+        :param timeout: The timeout in seconds (0 never expires)
+        :type  timeout: int
+        :param tags:    The tags to invalidate the value with
+        :type  tags:    list
+        :return:        Whether the value has been stored
+        :rtype:         bool
+        """
+
+        if tags:
+            value = self._tag_value(value, tags)
+        return super(Memcached, self).set(key, self._dump(value), timeout=timeout)
+
+    def add(self, key, value, timeout=None, tags=None):
+        """
+        Add value if the key does not exist yet
+        :param key:     The key
+        :type  key:     str
+        :param value:   The value
+        :param timeout: The timeout in seconds (0 never expires)
+        :type  timeout: int
+        :param tags:    The tags to invalidate the value with
+        :type  tags:    list
+        :return:        Whether the value has been stored
+        :rtype:         bool
+        """
+
+        if tags:
+            value = self._tag_value(value, tags)
+        return super(Memcached, self).add(key, self._dump(value), timeout=timeout)
+
+    def get_many(self, *keys):
+        """
+        Get multiple values with one multi-get
+        :param keys:    The keys
+        :type  keys:    str
+        :return:        The values or None in the same order
+        :rtype:         list
+        """
+
+        if not keys:
+            return []
+        return super(Memcached, self).get_many(*keys)
+
+    def set_many(self, mapping, timeout=None, tags=None):
+        """
+        Set multiple values with one multi-set
+        :param mapping: The keys and values
+        :type  mapping: dict
+        :param timeout: The timeout in seconds (0 never expires)
+        :type  timeout: int
+        :param tags:    The tags to invalidate the values with
+        :type  tags:    list
+        :return:        Whether all values have been stored
+        :rtype:         bool
+        """
+
+        if not mapping:
+            return True
+        if tags:
+            mapping = self._tag_mapping(mapping, tags)
+        if self.serializer is not None:
+            mapping = dict((key, self._dump(mapping[key])) for key in mapping)
+        return super(Memcached, self).set_many(mapping, timeout=timeout)
+
+    def delete_many(self, *keys):
+        """
+        Delete multiple values with one multi-delete
+        :param keys:    The keys
+        :type  keys:    str
+        :return:        Whether all keys have been deleted
+        :rtype:         bool
+        """
+
+        if not keys:
+            return True
+        return bool(super(Memcached, self).delete_many(*keys))
+
+    def inc(self, key, delta=1):
+        """
+        Atomically increment the value, starting from 0
+        :param key:     The key
+        :type  key:     str
+        :param delta:   The delta to add
+        :type  delta:   int
+        :return:        The new value
+        """
+
+        if delta < 0:
+            return self.dec(key, delta=-delta)
+        return self._count(self._client.incr, key, delta, delta)
+
+    def dec(self, key, delta=1):
+        """
+        Atomically decrement the value, starting from 0
+        Memcached does not decrement below 0.
+        :param key:     The key
+        :type  key:     str
+        :param delta:   The delta to subtract
+        :type  delta:   int
+        :return:        The new value
+        """
+
+        if delta < 0:
+            return self.inc(key, delta=-delta)
+        return self._count(self._client.decr, key, delta, 0)
+
+    def _count(self, command, key, delta, initial_value):
+        """
+        Increment or decrement the value and add it when missing
+        :param command:         The incr or decr command of the client
+        :type  command:         callable
+        :param key:             The key
+        :type  key:             str
+        :param delta:           The delta
+        :type  delta:           int
+        :param initial_value:   The value when the key is missing
+        :type  initial_value:   int
+        :return:                The new value
+        """
+
+        key = self._normalize_key(key)
+        value = command(key, delta)
+        if value is not None:
+            return value
+
+        # Memcached does not count missing keys, add them
+        if self._client.add(key, initial_value, self._normalize_timeout(None)):
+            return initial_value
+        # Added by another process in the meantime
+        return command(key, delta)
+
+    def _dump(self, value):
+        """
+        Dump the value with the serializer.
+        Integers are stored as is so they can be incremented.
+        :param value:   The value
+        :return:        The dumped value
+        """
+
+        if self.serializer is None or type(value) is int:
+            return value
+        return self.serializer.dumps(value)
+
+    def _load(self, value):
+        """
+        Load the value dumped with the serializer
+        :param value:   The dumped value
+        :return:        The value
+        """
+
+        if self.serializer is None or not isinstance(value, bytes):
+            return value
+        try:
+            return self.serializer.loads(value)
+        except ValueError:
+            # A corrupt value is a miss
+            return None
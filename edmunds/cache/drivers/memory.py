@@ -0,0 +1,391 @@
+from werkzeug.contrib.cache import BaseCache
+from edmunds.cache.concerns.remember import Remember as ConcernsRemember
+from edmunds.cache.concerns.tags import Tags as ConcernsTags
+from collections import OrderedDict
+from threading import Lock
+from time import time
+try:
+    import cPickle as pickle
+except ImportError:  # pragma: no cover
+    import pickle
+
+
+class Memory(BaseCache, ConcernsRemember, ConcernsTags):
+    """
+    Memory Driver
+    In-process cache bounded by number of entries and bytes.
+    Entries are evicted least recently used ('lru') or least
+    frequently used ('lfu').
+    """
+
+    def __init__(self, threshold=500, max_bytes=None, policy='lru', default_timeout=300):
+        """
+        Initiate the instance
+        :param threshold:       The maximum number of entries
+        :type  threshold:       int
+        :param max_bytes:       The maximum number of bytes of all pickled values
+        :type  max_bytes:       int
+        :param policy:          The eviction policy: 'lru' or 'lfu'
+        :type  policy:          str
+        :param default_timeout: The default timeout in seconds (0 never expires)
+        :type  default_timeout: int
+        """
+
+        super(Memory, self).__init__(default_timeout=default_timeout)
+
+        if policy not in ('lru', 'lfu'):
+            raise RuntimeError('Unknown eviction policy "%s" (use "lru" or "lfu").' % policy)
+
+        self._threshold = threshold
+        self._max_bytes = max_bytes
+        self._policy = policy
+        self._lock = Lock()
+
+        # Entries are (expires, pickled value) in least recently used order
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # Frequency of each key and keys per frequency for lfu
+        self._frequencies = {}
+        self._frequency_keys = {}
+        self._min_frequency = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def _normalize_timeout(self, timeout):
+        """
+        Normalize timeout to the time it expires
+        :param timeout: The timeout
+        :type  timeout: int
+        :return:        Expires (0 never expires)
+        :rtype:         float
+        """
+
+        timeout = super(Memory, self)._normalize_timeout(timeout)
+        if timeout > 0:
+            timeout = time() + timeout
+        return timeout
+
+    def get(self, key):
+        """
+        Get value
+        :param key:     The key
+        :type  key:     str
+        :return:        The value or None
+        """
+
+        with self._lock:
+            entry = self._get_entry(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._touch(key)
+
+        try:
+            value = pickle.loads(entry[1])
+        except pickle.PickleError:
+            return None
+        return self._untag_value(value)
+
+    def set(self, key, value, timeout=None, tags=None):
+        """
+        Set value
+        :param key:     The key
+        :type  key:     str
+        :param value:   The value
+        :param timeout: The timeout in seconds (0 never expires)
+        :type  timeout: int
+        :param tags:    The tags to invalidate the value with
+        :type  tags:    list
+        :return:        Whether the value has been stored
+        :rtype:         bool
+        """
+
+        if tags:
+            value = self._tag_value(value, tags)
+        expires = self._normalize_timeout(timeout)
+        dumped_value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            return self._set(key, expires, dumped_value)
+
+    def add(self, key, value, timeout=None, tags=None):
+        """
+        Add value if the key does not exist yet
+        :param key:     The key
+        :type  key:     str
+        :param value:   The value
+        :param timeout: The timeout in seconds (0 never expires)
+        :type  timeout: int
+        :param tags:    The tags to invalidate the value with
+        :type  tags:    list
+        :return:        Whether the value has been stored
+        :rtype:         bool
+        """
+
+        if tags:
+            value = self._tag_value(value, tags)
+        expires = self._normalize_timeout(timeout)
+        dumped_value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            if self._get_entry(key) is not None:
+                return False
+            return self._set(key, expires, dumped_value)
+
+    def set_many(self, mapping, timeout=None, tags=None):
+        """
+        Set multiple values
+        :param mapping: The keys and values
+        :type  mapping: dict
+        :param timeout: The timeout in seconds (0 never expires)
+        :type  timeout: int
+        :param tags:    The tags to invalidate the values with
+        :type  tags:    list
+        :return:        Whether all values have been stored
+        :rtype:         bool
+        """
+
+        if tags:
+            mapping = self._tag_mapping(mapping, tags)
+        stored = True
+        for key in mapping:
+            if not self.set(key, mapping[key], timeout=timeout):
+                stored = False
+        return stored
+
+    def delete(self, key):
+        """
+        Delete value
+        :param key:     The key
+        :type  key:     str
+        :return:        Whether the key existed
+        :rtype:         bool
+        """
+
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def has(self, key):
+        """
+        Check if key exists
+        :param key:     The key
+        :type  key:     str
+        :return:        Exists
+        :rtype:         bool
+        """
+
+        with self._lock:
+            return self._get_entry(key) is not None
+
+    def clear(self):
+        """
+        Clear the cache
+        :return:    Cleared
+        :rtype:     bool
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._frequencies.clear()
+            self._frequency_keys.clear()
+            self._min_frequency = 0
+        return True
+
+    def inc(self, key, delta=1):
+        """
+        Atomically increment the value
+        :param key:     The key
+        :type  key:     str
+        :param delta:   The delta to add
+        :type  delta:   int
+        :return:        The new value
+        """
+
+        with self._lock:
+            entry = self._get_entry(key)
+            if entry is None:
+                expires = self._normalize_timeout(None)
+                value = delta
+            else:
+                expires = entry[0]
+                value = (pickle.loads(entry[1]) or 0) + delta
+            if self._set(key, expires, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)):
+                return value
+            return None
+
+    def dec(self, key, delta=1):
+        """
+        Atomically decrement the value
+        :param key:     The key
+        :type  key:     str
+        :param delta:   The delta to subtract
+        :type  delta:   int
+        :return:        The new value
+        """
+
+        return self.inc(key, delta=-delta)
+
+    def stats(self):
+        """
+        Get statistics for tuning
+        :return:    Hits, misses, evictions, expirations, entries and bytes
+        :rtype:     dict
+        """
+
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def _get_entry(self, key):
+        """
+        Get entry that has not expired
+        Lock is expected to be acquired.
+        :param key:     The key
+        :type  key:     str
+        :return:        The entry or None
+        :rtype:         tuple
+        """
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires = entry[0]
+        if expires != 0 and expires <= time():
+            self._remove(key)
+            self._expirations += 1
+            return None
+
+        return entry
+
+    def _set(self, key, expires, dumped_value):
+        """
+        Set entry and evict entries when over budget
+        Lock is expected to be acquired.
+        :param key:             The key
+        :type  key:             str
+        :param expires:         Expires (0 never expires)
+        :type  expires:         float
+        :param dumped_value:    Pickled value
+        :type  dumped_value:    bytes
+        :return:                Whether the value has been stored
+        :rtype:                 bool
+        """
+
+        frequency = 1
+        if key in self._entries:
+            if self._policy == 'lfu':
+                frequency = self._frequencies[key]
+            self._remove(key)
+
+        size = len(dumped_value)
+
+        # Does not fit at all
+        if self._max_bytes is not None and size > self._max_bytes:
+            return False
+
+        # Make room before adding so the new entry is not evicted right away
+        while self._entries and (len(self._entries) >= self._threshold
+                                 or (self._max_bytes is not None and self._bytes + size > self._max_bytes)):
+            self._evict()
+
+        self._entries[key] = (expires, dumped_value)
+        self._bytes += size
+        if self._policy == 'lfu':
+            self._add_to_frequency(key, frequency)
+            if frequency < self._min_frequency:
+                self._min_frequency = frequency
+
+        return True
+
+    def _touch(self, key):
+        """
+        Register usage of key
+        Lock is expected to be acquired.
+        :param key:     The key
+        :type  key:     str
+        """
+
+        if self._policy == 'lru':
+            self._entries[key] = self._entries.pop(key)
+            return
+
+        frequency = self._frequencies[key]
+        self._remove_from_frequency(key, frequency)
+        if self._min_frequency == frequency and frequency not in self._frequency_keys:
+            self._min_frequency = frequency + 1
+        self._add_to_frequency(key, frequency + 1)
+
+    def _remove(self, key):
+        """
+        Remove entry
+        Lock is expected to be acquired.
+        :param key:     The key
+        :type  key:     str
+        """
+
+        expires, dumped_value = self._entries.pop(key)
+        self._bytes -= len(dumped_value)
+        if self._policy == 'lfu':
+            self._remove_from_frequency(key, self._frequencies.pop(key))
+
+    def _evict(self):
+        """
+        Evict one entry according to the policy
+        Lock is expected to be acquired.
+        """
+
+        if self._policy == 'lru':
+            key = next(iter(self._entries))
+        else:
+            # Minimum frequency is outdated when its last key was removed
+            if self._min_frequency not in self._frequency_keys:
+                self._min_frequency = min(self._frequency_keys)
+            key = next(iter(self._frequency_keys[self._min_frequency]))
+
+        self._remove(key)
+        self._evictions += 1
+
+    def _add_to_frequency(self, key, frequency):
+        """
+        Add key to the keys of a frequency
+        Lock is expected to be acquired.
+        :param key:         The key
+        :type  key:         str
+        :param frequency:   The frequency
+        :type  frequency:   int
+        """
+
+        self._frequencies[key] = frequency
+        if frequency not in self._frequency_keys:
+            self._frequency_keys[frequency] = OrderedDict()
+        self._frequency_keys[frequency][key] = None
+
+    def _remove_from_frequency(self, key, frequency):
+        """
+        Remove key from the keys of a frequency
+        Lock is expected to be acquired.
+        :param key:         The key
+        :type  key:         str
+        :param frequency:   The frequency
+        :type  frequency:   int
+        """
+
+        keys = self._frequency_keys[frequency]
+        del keys[key]
+        if not keys:
+            del self._frequency_keys[frequency]
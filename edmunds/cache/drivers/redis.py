@@ -1,9 +1,162 @@
 
 from werkzeug.contrib.cache import RedisCache
+from edmunds.cache.concerns.remember import Remember as ConcernsRemember
+from edmunds.cache.concerns.tags import Tags as ConcernsTags
 
 
-class Redis(RedisCache):
+class Redis(RedisCache, ConcernsRemember, ConcernsTags):
     """
     Redis Driver
+    Multiple keys are fetched, set and deleted in one round trip.
+    Additional keyword arguments (like max_connections, socket_timeout
+    and socket_keepalive) configure the connection pool of redis.Redis.
     """
-    pass
+
+    def __init__(self, host='localhost', port=6379, password=None, db=0, default_timeout=300, key_prefix=None,
+                 serializer=None, **kwargs):
+        """
+        Initiate the instance
+        :param host:            The host or a redis client
+        :type  host:            str
+        :param port:            The port
+        :type  port:            int
+        :param password:        The password
+        :type  password:        str
+        :param db:              The db
+        :type  db:              int
+        :param default_timeout: The default timeout in seconds (0 never expires)
+        :type  default_timeout: int
+        :param key_prefix:      The prefix of all keys
+        :type  key_prefix:      str
+        :param serializer:      The serializer (default pickle)
+        :type  serializer:      edmunds.cache.serializer.Serializer
+        :param kwargs:          Options of redis.Redis
+        """
+
+        super(Redis, self).__init__(host=host, port=port, password=password, db=db,
+                                    default_timeout=default_timeout, key_prefix=key_prefix, **kwargs)
+
+        self.serializer = serializer
+
+    def dump_object(self, value):
+        """
+        Dump the value. Integers are stored as is so they can be incremented.
+        :param value:   The value
+        :return:        The dumped value
+        :rtype:         bytes
+        """
+
+        if self.serializer is None or type(value) is int:
+            return super(Redis, self).dump_object(value)
+        return b'!' + self.serializer.dumps(value)
+
+    def load_object(self, value):
+        """
+        Load the dumped value
+        :param value:   The dumped value or None
+        :type  value:   bytes
+        :return:        The value
+        """
+
+        if self.serializer is None or value is None or not value.startswith(b'!'):
+            return super(Redis, self).load_object(value)
+        try:
+            return self.serializer.loads(value[1:])
+        except ValueError:
+            # A corrupt value is a miss
+            return None
+
+    def get(self, key):
+        """
+        Get value
+        :param key:     The key
+        :type  key:     str
+        :return:        The value or None
+        """
+
+        return self._untag_value(super(Redis, self).get(key))
+
+    def get_many(self, *keys):
+        """
+        Get multiple values with one MGET
+        :param keys:    The keys
+        :type  keys:    str
+        :return:        The values or None in the same order
+        :rtype:         list
+        """
+
+        if not keys:
+            return []
+        return self._untag_values(super(Redis, self).get_many(*keys))
+
+    def set(self, key, value, timeout=None, tags=None):
+        """
+        Set value
+        :param key:     The key
+        :type  key:     str
+        :param value:   The value
+        :param timeout: The timeout in seconds (0 never expires)
+        :type  timeout: int
+        :param tags:    The tags to invalidate the value with
+        :type  tags:    list
+        :return:        Whether the value has been stored
+        :rtype:         bool
+        """
+
+        if tags:
+            value = self._tag_value(value, tags)
+        return super(Redis, self).set(key, value, timeout=timeout)
+
+    def add(self, key, value, timeout=None, tags=None):
+        """
+        Atomically add value with one SET NX
+        :param key:     The key
+        :type  key:     str
+        :param value:   The value
+        :param timeout: The timeout in seconds (0 never expires)
+        :type  timeout: int
+        :param tags:    The tags to invalidate the value with
+        :type  tags:    list
+        :return:        Whether the value has been stored
+        :rtype:         bool
+        """
+
+        if tags:
+            value = self._tag_value(value, tags)
+        timeout = self._normalize_timeout(timeout)
+        dump = self.dump_object(value)
+        if timeout == -1:
+            return bool(self._client.set(name=self.key_prefix + key, value=dump, nx=True))
+        return bool(self._client.set(name=self.key_prefix + key, value=dump, ex=timeout, nx=True))
+
+    def set_many(self, mapping, timeout=None, tags=None):
+        """
+        Set multiple values in one pipeline
+        :param mapping: The keys and values
+        :type  mapping: dict
+        :param timeout: The timeout in seconds (0 never expires)
+        :type  timeout: int
+        :param tags:    The tags to invalidate the values with
+        :type  tags:    list
+        :return:        Whether all values have been stored
+        :rtype:         bool
+        """
+
+        if not mapping:
+            return True
+        if tags:
+            mapping = self._tag_mapping(mapping, tags)
+        return all(super(Redis, self).set_many(mapping, timeout=timeout))
+
+    def delete_many(self, *keys):
+        """
+        Delete multiple values with one DEL
+        :param keys:    The keys
+        :type  keys:    str
+        :return:        Whether all keys have been deleted
+        :rtype:         bool
+        """
+
+        if not keys:
+            return True
+        return super(Redis, self).delete_many(*keys) == len(set(keys))
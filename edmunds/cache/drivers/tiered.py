@@ -0,0 +1,293 @@
+from werkzeug.contrib.cache import BaseCache, RedisCache
+from edmunds.cache.concerns.remember import Remember as ConcernsRemember
+from uuid import uuid4
+import json
+
+
+class Tiered(BaseCache, ConcernsRemember):
+    """
+    Tiered Driver
+    Combines a near cache (in-process) with a remote cache.
+    Reads go through the near cache and fill it from the remote
+    cache with a short timeout. Writes go to both caches.
+    Other processes can be notified of writes through a Redis
+    invalidation channel so their near cache does not serve stale data.
+    """
+
+    def __init__(self, near, remote, near_timeout=5, invalidation_channel=None):
+        """
+        Initiate the instance
+        :param near:                    The near cache
+        :type  near:                    BaseCache
+        :param remote:                  The remote cache
+        :type  remote:                  BaseCache
+        :param near_timeout:            The timeout of values in the near cache
+        :type  near_timeout:            int
+        :param invalidation_channel:    Redis channel to broadcast invalidations on
+        :type  invalidation_channel:    str
+        """
+
+        super(Tiered, self).__init__(default_timeout=remote.default_timeout)
+
+        self.near = near
+        self.remote = remote
+        self._near_timeout = near_timeout
+        self._invalidation_channel = invalidation_channel
+        self._invalidation_id = uuid4().hex
+        self._invalidation_thread = None
+
+        if invalidation_channel is not None:
+            if not isinstance(remote, RedisCache):
+                raise RuntimeError('Invalidation channel requires a Redis remote cache.')
+            pubsub = remote._client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{invalidation_channel: self._handle_invalidation})
+            self._invalidation_thread = pubsub.run_in_thread(daemon=True)
+
+    def get(self, key):
+        """
+        Get value
+        :param key:     The key
+        :type  key:     str
+        :return:        The value or None
+        """
+
+        value = self.near.get(key)
+        if value is not None:
+            return value
+
+        value = self.remote.get(key)
+        if value is not None:
+            self.near.set(key, value, timeout=self._near_timeout)
+        return value
+
+    def get_many(self, *keys):
+        """
+        Get multiple values
+        :param keys:    The keys
+        :type  keys:    str
+        :return:        The values or None in the same order
+        :rtype:         list
+        """
+
+        values = self.near.get_many(*keys)
+
+        missing_indexes = [index for index, value in enumerate(values) if value is None]
+        if not missing_indexes:
+            return values
+
+        remote_values = self.remote.get_many(*[keys[index] for index in missing_indexes])
+        near_mapping = {}
+        for index, value in zip(missing_indexes, remote_values):
+            values[index] = value
+            if value is not None:
+                near_mapping[keys[index]] = value
+        if near_mapping:
+            self.near.set_many(near_mapping, timeout=self._near_timeout)
+
+        return values
+
+    def set(self, key, value, timeout=None, tags=None):
+        """
+        Set value
+        :param key:     The key
+        :type  key:     str
+        :param value:   The value
+        :param timeout: The timeout in seconds (0 never expires)
+        :type  timeout: int
+        :param tags:    The tags to invalidate the value with
+        :type  tags:    list
+        :return:        Whether the value has been stored
+        :rtype:         bool
+        """
+
+        stored = self.remote.set(key, value, timeout=timeout, tags=tags)
+        if stored:
+            self.near.set(key, value, timeout=self._get_near_timeout(timeout), tags=tags)
+        else:
+            self.near.delete(key)
+        self._broadcast_invalidation([key])
+        return stored
+
+    def add(self, key, value, timeout=None, tags=None):
+        """
+        Add value if the key does not exist yet
+        :param key:     The key
+        :type  key:     str
+        :param value:   The value
+        :param timeout: The timeout in seconds (0 never expires)
+        :type  timeout: int
+        :param tags:    The tags to invalidate the value with
+        :type  tags:    list
+        :return:        Whether the value has been stored
+        :rtype:         bool
+        """
+
+        if not self.remote.add(key, value, timeout=timeout, tags=tags):
+            return False
+        self.near.set(key, value, timeout=self._get_near_timeout(timeout), tags=tags)
+        self._broadcast_invalidation([key])
+        return True
+
+    def set_many(self, mapping, timeout=None, tags=None):
+        """
+        Set multiple values
+        :param mapping: The keys and values
+        :type  mapping: dict
+        :param timeout: The timeout in seconds (0 never expires)
+        :type  timeout: int
+        :param tags:    The tags to invalidate the values with
+        :type  tags:    list
+        :return:        Whether all values have been stored
+        :rtype:         bool
+        """
+
+        stored = self.remote.set_many(mapping, timeout=timeout, tags=tags)
+        if stored:
+            self.near.set_many(mapping, timeout=self._get_near_timeout(timeout), tags=tags)
+        else:
+            self.near.delete_many(*mapping)
+        self._broadcast_invalidation(list(mapping))
+        return stored
+
+    def delete(self, key):
+        """
+        Delete value
+        :param key:     The key
+        :type  key:     str
+        :return:        Whether the key existed
+        :rtype:         bool
+        """
+
+        self.near.delete(key)
+        deleted = self.remote.delete(key)
+        self._broadcast_invalidation([key])
+        return deleted
+
+    def delete_many(self, *keys):
+        """
+        Delete multiple values
+        :param keys:    The keys
+        :type  keys:    str
+        :return:        Whether all keys have been deleted
+        :rtype:         bool
+        """
+
+        self.near.delete_many(*keys)
+        deleted = self.remote.delete_many(*keys)
+        self._broadcast_invalidation(list(keys))
+        return deleted
+
+    def has(self, key):
+        """
+        Check if key exists
+        :param key:     The key
+        :type  key:     str
+        :return:        Exists
+        :rtype:         bool
+        """
+
+        # Tagged values are only valid when their tags were not invalidated
+        return self.get(key) is not None
+
+    def clear(self):
+        """
+        Clear the cache
+        :return:    Cleared
+        :rtype:     bool
+        """
+
+        self.near.clear()
+        cleared = self.remote.clear()
+        self._broadcast_invalidation(None)
+        return cleared
+
+    def inc(self, key, delta=1):
+        """
+        Increment the value in the remote cache
+        :param key:     The key
+        :type  key:     str
+        :param delta:   The delta to add
+        :type  delta:   int
+        :return:        The new value
+        """
+
+        value = self.remote.inc(key, delta=delta)
+        self.near.delete(key)
+        self._broadcast_invalidation([key])
+        return value
+
+    def dec(self, key, delta=1):
+        """
+        Decrement the value in the remote cache
+        :param key:     The key
+        :type  key:     str
+        :param delta:   The delta to subtract
+        :type  delta:   int
+        :return:        The new value
+        """
+
+        value = self.remote.dec(key, delta=delta)
+        self.near.delete(key)
+        self._broadcast_invalidation([key])
+        return value
+
+    def invalidate_tags(self, tags):
+        """
+        Invalidate all values stored with these tags.
+        Values the near cache filled from the remote cache are
+        not tagged, so the near caches of all processes are cleared.
+        :param tags:    The tags
+        :type  tags:    list
+        """
+
+        self.remote.invalidate_tags(tags)
+        self.near.clear()
+        self._broadcast_invalidation(None)
+
+    def _get_near_timeout(self, timeout):
+        """
+        Get the timeout for the near cache
+        :param timeout: The timeout of the value
+        :type  timeout: int
+        :return:        The near timeout
+        :rtype:         int
+        """
+
+        timeout = self._normalize_timeout(timeout)
+        if timeout > 0:
+            return min(timeout, self._near_timeout)
+        return self._near_timeout
+
+    def _broadcast_invalidation(self, keys):
+        """
+        Broadcast the invalidation of keys to other processes
+        in a single message
+        :param keys:    The keys (None for clearing the cache)
+        :type  keys:    list
+        """
+
+        if self._invalidation_channel is None or keys == []:
+            return
+
+        message = json.dumps({'id': self._invalidation_id, 'keys': keys})
+        self.remote._client.publish(self._invalidation_channel, message)
+
+    def _handle_invalidation(self, message):
+        """
+        Handle an invalidation broadcasted by another process
+        :param message: The pub/sub message
+        :type  message: dict
+        """
+
+        data = message['data']
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+
+        invalidation = json.loads(data)
+        if invalidation['id'] == self._invalidation_id:
+            return
+
+        if invalidation['keys'] is None:
+            self.near.clear()
+        else:
+            self.near.delete_many(*invalidation['keys'])
@@ -0,0 +1,144 @@
+
+from edmunds.http.requestmiddleware import RequestMiddleware
+from edmunds.globals import request, session
+from hashlib import md5
+from time import time
+
+
+class ResponseCacheMiddleware(RequestMiddleware):
+    """
+    Response Cache Middleware
+    Caches the responses of anonymous GET-requests in a cache instance.
+    Responses are keyed on host, path, query and the given vary-headers,
+    and answered with 304 when the ETag or Last-Modified matches.
+    """
+
+    stateless = True
+
+    # Headers that are never cached
+    uncached_headers = ('set-cookie',)
+
+    def before(self, timeout=None, vary=('Accept-Language',), cache=None, tags=None):
+        """
+        Handle before the request
+        :param timeout: The timeout in seconds (None for the default of the cache)
+        :type  timeout: int
+        :param vary:    The headers the response varies on
+        :type  vary:    list
+        :param cache:   The name of the cache instance (None for default)
+        :type  cache:   str
+        :param tags:    The tags to invalidate the responses with
+        :type  tags:    list
+        """
+
+        # Clients asking for a fresh response get one, which is cached again
+        if not self._is_cacheable_request() or request.cache_control.no_cache:
+            return None
+
+        driver = self.app.cache(name=cache)
+        if driver is None:
+            return None
+
+        entry = driver.get(self._get_key(vary))
+        if entry is None:
+            return None
+
+        response = self.app.response_class(entry['body'], status=entry['status'], headers=entry['headers'])
+        response.headers['X-Cache'] = 'HIT'
+        return response.make_conditional(request)
+
+    def after(self, response, timeout=None, vary=('Accept-Language',), cache=None, tags=None):
+        """
+        Handle after the request
+        :param response:    The request response
+        :type  response:    flask.Response
+        :param timeout:     The timeout in seconds (None for the default of the cache)
+        :type  timeout:     int
+        :param vary:        The headers the response varies on
+        :type  vary:        list
+        :param cache:       The name of the cache instance (None for default)
+        :type  cache:       str
+        :param tags:        The tags to invalidate the responses with
+        :type  tags:        list
+        :return:            The request response
+        :rtype:             flask.Response
+        """
+
+        # Head-requests are served from cache but not stored
+        if request.method != 'GET' or not self._is_cacheable_request() or not self._is_cacheable_response(response):
+            return response
+
+        driver = self.app.cache(name=cache)
+        if driver is None:
+            return response
+
+        response.vary.update(vary)
+        if 'ETag' not in response.headers:
+            response.add_etag()
+        if response.last_modified is None:
+            response.last_modified = int(time())
+
+        entry = {
+            'status': response.status_code,
+            'headers': [(key, value) for (key, value) in response.headers
+                        if key.lower() not in self.uncached_headers],
+            'body': response.get_data(),
+        }
+        driver.set(self._get_key(vary), entry, timeout=timeout, tags=tags)
+
+        response.headers['X-Cache'] = 'MISS'
+        return response.make_conditional(request)
+
+    def _is_cacheable_request(self):
+        """
+        Check if the request is an anonymous GET-request
+        :return:    Is cacheable
+        :rtype:     bool
+        """
+
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        if 'Authorization' in request.headers:
+            return False
+        if self.app.session_cookie_name in request.cookies:
+            return False
+        if request.cache_control.no_store:
+            return False
+        return True
+
+    def _is_cacheable_response(self, response):
+        """
+        Check if the response can be cached
+        :param response:    The response
+        :type  response:    flask.Response
+        :return:            Is cacheable
+        :rtype:             bool
+        """
+
+        if response.status_code != 200 or response.is_streamed:
+            return False
+        if 'Set-Cookie' in response.headers:
+            return False
+        # The session is saved after the middleware, adding its cookie
+        if session.modified or getattr(session, 'accessed', False) or len(session):
+            return False
+        cache_control = response.cache_control
+        if cache_control.private or cache_control.no_store or cache_control.no_cache:
+            return False
+        return True
+
+    def _get_key(self, vary):
+        """
+        Get the cache key of the request
+        :param vary:    The headers the response varies on
+        :type  vary:    list
+        :return:        The key
+        :rtype:         str
+        """
+
+        query = '&'.join(sorted(request.query_string.decode('latin-1').split('&')))
+        parts = [request.host, request.path, query]
+        for header in vary:
+            parts.append('%s:%s' % (header.lower(), request.headers.get(header, '')))
+
+        return 'response.%s' % md5('\n'.join(parts).encode('utf-8')).hexdigest()
@@ -0,0 +1,204 @@
+
+from threading import Lock
+import json
+import marshal
+import zlib
+try:
+    import cPickle as pickle
+except ImportError:  # pragma: no cover
+    import pickle
+
+
+class Serializer(object):
+    """
+    Serializer for cache values
+    Values are serialized with pickle, marshal, msgpack or json
+    and compressed with zlib or lz4 when they exceed the threshold.
+    """
+
+    _raw = b'\x00'
+    _zlib = b'\x01'
+    _lz4 = b'\x02'
+
+    def __init__(self, method='pickle', compression=None, compress_threshold=1024, compress_level=6):
+        """
+        Initiate the serializer
+        :param method:              The method: 'pickle', 'marshal', 'msgpack' or 'json'
+        :type  method:              str
+        :param compression:         The compression: None, 'zlib' or 'lz4'
+        :type  compression:         str
+        :param compress_threshold:  The minimum bytes to compress
+        :type  compress_threshold:  int
+        :param compress_level:      The zlib compression level
+        :type  compress_level:      int
+        """
+
+        self.method = method
+        self.compression = compression
+        self._compress_threshold = compress_threshold
+        self._compress_level = compress_level
+
+        if method == 'pickle':
+            self._serialize = self._serialize_pickle
+            self._deserialize = pickle.loads
+        elif method == 'marshal':
+            self._serialize = marshal.dumps
+            self._deserialize = marshal.loads
+        elif method == 'msgpack':
+            try:
+                import msgpack
+            except ImportError:
+                raise RuntimeError('no msgpack module found')
+            self._msgpack = msgpack
+            self._serialize = self._serialize_msgpack
+            self._deserialize = self._deserialize_msgpack
+        elif method == 'json':
+            self._serialize = self._serialize_json
+            self._deserialize = self._deserialize_json
+        else:
+            raise RuntimeError('Unknown serializer "%s" (use "pickle", "marshal", "msgpack" or "json").' % method)
+
+        if compression == 'lz4':
+            try:
+                import lz4.frame
+            except ImportError:
+                raise RuntimeError('no lz4 module found')
+            self._lz4_frame = lz4.frame
+        elif compression not in (None, 'zlib'):
+            raise RuntimeError('Unknown compression "%s" (use "zlib" or "lz4").' % compression)
+
+        self._lock = Lock()
+        self._dumps = 0
+        self._loads = 0
+        self._compressed = 0
+        self._serialized_bytes = 0
+        self._stored_bytes = 0
+
+    def dumps(self, value):
+        """
+        Serialize and compress the value
+        :param value:   The value
+        :return:        The serialized value
+        :rtype:         bytes
+        """
+
+        data = self._serialize(value)
+        serialized_size = len(data)
+
+        compressed = False
+        if self.compression is not None and serialized_size >= self._compress_threshold:
+            if self.compression == 'zlib':
+                compressed_data = self._zlib + zlib.compress(data, self._compress_level)
+            else:
+                compressed_data = self._lz4 + self._lz4_frame.compress(data)
+            # Only keep compressed data when it actually is smaller
+            compressed = len(compressed_data) < serialized_size + 1
+        if compressed:
+            data = compressed_data
+        else:
+            data = self._raw + data
+
+        with self._lock:
+            self._dumps += 1
+            self._serialized_bytes += serialized_size
+            self._stored_bytes += len(data)
+            if compressed:
+                self._compressed += 1
+
+        return data
+
+    def loads(self, data):
+        """
+        Decompress and deserialize the value
+        :param data:    The serialized value
+        :type  data:    bytes
+        :return:        The value
+        :raises ValueError: When the data is corrupt or truncated
+        """
+
+        header = data[0:1]
+        try:
+            if header == self._zlib:
+                value = self._deserialize(zlib.decompress(data[1:]))
+            elif header == self._lz4:
+                value = self._deserialize(self._lz4_frame.decompress(data[1:]))
+            else:
+                value = self._deserialize(data[1:])
+        # lz4 raises RuntimeError and msgpack ValueError on corrupt data
+        except (EOFError, TypeError, ValueError, RuntimeError, zlib.error, pickle.PickleError) as e:
+            raise ValueError('Could not load the serialized value: %s' % e)
+
+        with self._lock:
+            self._loads += 1
+
+        return value
+
+    def stats(self):
+        """
+        Get statistics for measuring the bytes saved
+        :return:    Dumps, loads, compressed values and bytes
+                    before and after compression
+        :rtype:     dict
+        """
+
+        with self._lock:
+            return {
+                'method': self.method,
+                'compression': self.compression,
+                'dumps': self._dumps,
+                'loads': self._loads,
+                'compressed': self._compressed,
+                'serialized_bytes': self._serialized_bytes,
+                'stored_bytes': self._stored_bytes,
+                'saved_bytes': self._serialized_bytes - self._stored_bytes,
+            }
+
+    def _serialize_pickle(self, value):
+        """
+        Serialize with pickle
+        :param value:   The value
+        :return:        The serialized value
+        :rtype:         bytes
+        """
+
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    def _serialize_msgpack(self, value):
+        """
+        Serialize with msgpack
+        :param value:   The value
+        :return:        The serialized value
+        :rtype:         bytes
+        """
+
+        return self._msgpack.packb(value, use_bin_type=True)
+
+    def _deserialize_msgpack(self, data):
+        """
+        Deserialize with msgpack
+        :param data:    The serialized value
+        :type  data:    bytes
+        :return:        The value
+        """
+
+        return self._msgpack.unpackb(data, raw=False)
+
+    def _serialize_json(self, value):
+        """
+        Serialize with json
+        :param value:   The value
+        :return:        The serialized value
+        :rtype:         bytes
+        """
+
+        return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+    def _deserialize_json(self, data):
+        """
+        Deserialize with json
+        :param data:    The serialized value
+        :type  data:    bytes
+        :return:        The value
+        """
+
+        return json.loads(data.decode('utf-8'))
@@ -1,7 +1,13 @@
 
 from flask.config import Config as FlaskConfig
+from edmunds.config.frozendict import FrozenDict
+from edmunds.config.frozenlist import FrozenList
 import os
 import re
+try:
+    from sys import intern
+except ImportError:
+    pass
 
 
 class Config(FlaskConfig):
@@ -9,6 +15,23 @@ class Config(FlaskConfig):
     Config module
     """
 
+    _unindexed = object()
+    _not_found = object()
+
+    def __init__(self, root_path, defaults=None):
+        """
+        Initiate the config
+        :param root_path:   Root path of the application
+        :type  root_path:   str
+        :param defaults:    Default values
+        :type  defaults:    dict
+        """
+
+        self._index = {}
+        self._frozen_index = None
+
+        super(Config, self).__init__(root_path, defaults=defaults)
+
     def __call__(self, key, default=None):
         """
         Get the value
@@ -29,6 +52,66 @@ class Config(FlaskConfig):
         :type default:  mixed
         :return:        Value
         """
+        frozen_index = self._frozen_index
+        if frozen_index is not None:
+            value = frozen_index.get(key, self._unindexed)
+            if value is self._unindexed:
+                value = frozen_index.get(self._get_flat_key(key), self._unindexed)
+                if value is self._unindexed:
+                    path = self._resolve_path(key)
+                    value = self._not_found if path is None else self._get_by_path(path)
+                frozen_index[key] = value
+            if value is self._not_found:
+                return default
+            return value
+
+        index = self._index
+
+        path = index.get(key, self._unindexed)
+        if path is self._unindexed:
+            path = self._resolve_path(key)
+            index[key] = path
+        if path is None:
+            return default
+
+        try:
+            return self._get_by_path(path)
+        except (KeyError, IndexError):
+            # Nested value was removed in place, resolve again
+            path = self._resolve_path(key)
+            index[key] = path
+            if path is None:
+                return default
+            return self._get_by_path(path)
+
+    def _get_by_path(self, path):
+        """
+        Get the value at the resolved path
+        :param path:    The path as returned by _resolve_path
+        :type path:     tuple
+        :return:        Value
+        """
+        value = self[path[0]]
+        for path_part in path[1:]:
+            # The value could have been replaced in place by another type
+            if isinstance(value, list):
+                if not isinstance(path_part, int):
+                    raise KeyError(path_part)
+            elif not isinstance(value, dict):
+                raise KeyError(path_part)
+            value = value[path_part]
+        return value
+
+    def _resolve_path(self, key):
+        """
+        Resolve the path to the value of this key
+        :param key:     The key
+        :type key:      str
+        :return:        Tuple with the top-level key followed by the
+                        nested dict-keys and list-indexes, or None
+                        when the key does not exist
+        :rtype:         tuple|None
+        """
         flat_key = self._get_flat_key(key)
 
         # Always loop sorted and then reversed over keys
@@ -36,7 +119,7 @@ class Config(FlaskConfig):
         for key in reversed(sorted(self.keys())):
             current_flat_key = self._get_flat_key(key)
             if current_flat_key == flat_key:
-                return self[key]
+                return (key,)
 
             flat_key_prefix = '%s_' % current_flat_key
             if flat_key == flat_key_prefix or not flat_key.startswith(flat_key_prefix):
@@ -45,6 +128,7 @@ class Config(FlaskConfig):
 
             found_value = True
             value = self[key]
+            path = [key]
             for key_part in key_parts:
                 # Process dict as value
                 if isinstance(value, dict):
@@ -52,6 +136,7 @@ class Config(FlaskConfig):
                     for dict_key in reversed(sorted(value)):
                         if key_part == self._get_flat_key(dict_key):
                             value = value[dict_key]
+                            path.append(dict_key)
                             found_dict_value = True
                             break
                     if found_dict_value:
@@ -60,15 +145,16 @@ class Config(FlaskConfig):
                 elif isinstance(value, list):
                     if key_part.isdigit() and int(key_part) < len(value):
                         value = value[int(key_part)]
+                        path.append(int(key_part))
                         continue
                 # Did not found
                 found_value = False
                 break
 
             if found_value:
-                return value
+                return tuple(path)
 
-        return default
+        return None
 
     def has(self, key):
         """
@@ -101,6 +187,212 @@ class Config(FlaskConfig):
         flat_key = self._get_flat_key(key)
         return flat_key.split('_')
 
+    def _invalidate_index(self):
+        """
+        Invalidate the index of resolved keys
+        """
+
+        self._index = {}
+
+    def _check_not_frozen(self):
+        """
+        Check the config is not frozen before changing it
+        """
+
+        if self._frozen_index is not None:
+            raise RuntimeError('Config is frozen and can not be changed.')
+
+    def __setitem__(self, key, value):
+        """
+        Set item
+        :param key:     The key
+        :param value:   The value
+        """
+
+        self._check_not_frozen()
+        super(Config, self).__setitem__(key, value)
+        self._invalidate_index()
+
+    def __delitem__(self, key):
+        """
+        Delete item
+        :param key:     The key
+        """
+
+        self._check_not_frozen()
+        super(Config, self).__delitem__(key)
+        self._invalidate_index()
+
+    def update(self, *args, **kwargs):
+        """
+        Update the config
+        """
+
+        self._check_not_frozen()
+        super(Config, self).update(*args, **kwargs)
+        self._invalidate_index()
+
+    def setdefault(self, key, default=None):
+        """
+        Set default value
+        :param key:     The key
+        :param default: The default value
+        :return:        Value
+        """
+
+        if self._frozen_index is not None and key in self:
+            return self[key]
+        self._check_not_frozen()
+        value = super(Config, self).setdefault(key, default)
+        self._invalidate_index()
+        return value
+
+    def pop(self, key, *args):
+        """
+        Pop item
+        :param key:     The key
+        :return:        Value
+        """
+
+        self._check_not_frozen()
+        value = super(Config, self).pop(key, *args)
+        self._invalidate_index()
+        return value
+
+    def popitem(self):
+        """
+        Pop an item
+        :return:        Key and value
+        :rtype:         tuple
+        """
+
+        self._check_not_frozen()
+        item = super(Config, self).popitem()
+        self._invalidate_index()
+        return item
+
+    def clear(self):
+        """
+        Clear the config
+        """
+
+        self._check_not_frozen()
+        super(Config, self).clear()
+        self._invalidate_index()
+
+    @property
+    def frozen(self):
+        """
+        Check if config is frozen
+        :return:    Frozen
+        :rtype:     bool
+        """
+
+        return self._frozen_index is not None
+
+    def freeze(self):
+        """
+        Freeze the config so it can no longer be changed.
+        Nested dicts and lists are made read-only and all keys
+        are resolved up front so lookups only need a dict hit.
+        """
+
+        if self._frozen_index is not None:
+            return
+
+        frozen_items = [(self._intern(key), self._freeze_value(self[key])) for key in self]
+        dict.clear(self)
+        dict.update(self, frozen_items)
+        self._index = {}
+
+        # Resolve all keys with the same priority as _resolve_path
+        frozen_index = {}
+        for key in reversed(sorted(self.keys())):
+            flat_key = self._intern(self._get_flat_key(key))
+            if flat_key not in frozen_index:
+                frozen_index[flat_key] = self[key]
+            self._index_frozen_value(frozen_index, flat_key, self[key], True)
+
+        self._frozen_index = frozen_index
+
+    def _freeze_value(self, value):
+        """
+        Make a read-only version of the value
+        :param value:   The value
+        :return:        Read-only value
+        """
+
+        if isinstance(value, dict):
+            return FrozenDict((self._intern(dict_key), self._freeze_value(value[dict_key])) for dict_key in value)
+        if isinstance(value, list):
+            return FrozenList(self._freeze_value(list_value) for list_value in value)
+        if isinstance(value, tuple):
+            return tuple(self._freeze_value(tuple_value) for tuple_value in value)
+        if isinstance(value, set):
+            return frozenset(value)
+        return value
+
+    def _index_frozen_value(self, frozen_index, flat_key_prefix, value, top_level):
+        """
+        Add the nested values to the frozen index
+        :param frozen_index:    The frozen index
+        :type frozen_index:     dict
+        :param flat_key_prefix: Flat key of the value
+        :type flat_key_prefix:  str
+        :param value:           The value
+        :param top_level:       Value is a top-level value
+        :type top_level:        bool
+        """
+
+        if isinstance(value, dict):
+            try:
+                dict_keys = reversed(sorted(value))
+            except TypeError:
+                return
+            indexed_key_parts = set()
+            for dict_key in dict_keys:
+                if not hasattr(dict_key, 'replace'):
+                    continue
+                key_part = self._get_flat_key(dict_key)
+                # Key parts with underscores or an empty first key part can not be fetched
+                if '_' in key_part or (top_level and not key_part) or key_part in indexed_key_parts:
+                    continue
+                indexed_key_parts.add(key_part)
+                self._index_frozen_item(frozen_index, flat_key_prefix, key_part, value[dict_key])
+
+        elif isinstance(value, list):
+            for list_index, list_value in enumerate(value):
+                self._index_frozen_item(frozen_index, flat_key_prefix, str(list_index), list_value)
+
+    def _index_frozen_item(self, frozen_index, flat_key_prefix, key_part, value):
+        """
+        Add nested item to the frozen index
+        :param frozen_index:    The frozen index
+        :type frozen_index:     dict
+        :param flat_key_prefix: Flat key of the parent value
+        :type flat_key_prefix:  str
+        :param key_part:        Key part of the item
+        :type key_part:         str
+        :param value:           The value
+        """
+
+        flat_key = self._intern('%s_%s' % (flat_key_prefix, key_part))
+        if flat_key not in frozen_index:
+            frozen_index[flat_key] = value
+        self._index_frozen_value(frozen_index, flat_key, value, False)
+
+    def _intern(self, value):
+        """
+        Intern string
+        :param value:   The value
+        :return:        Interned value
+        """
+
+        try:
+            return intern(value)
+        except TypeError:
+            return value
+
     def from_pydir(self, config_dir):
         """
         Load the configuration in directory
@@ -0,0 +1,29 @@
+
+class FrozenDict(dict):
+    """
+    Read-only dictionary used by a frozen config
+    """
+
+    def _raise_frozen(self, *args, **kwargs):
+        """
+        Raise error because dictionary can not be changed
+        """
+
+        raise RuntimeError('Config is frozen and can not be changed.')
+
+    __setitem__ = _raise_frozen
+    __delitem__ = _raise_frozen
+    clear = _raise_frozen
+    pop = _raise_frozen
+    popitem = _raise_frozen
+    setdefault = _raise_frozen
+    update = _raise_frozen
+
+    def __reduce__(self):
+        """
+        Support for pickle and copy
+        :return:    Class and arguments to reconstruct the dictionary
+        :rtype:     tuple
+        """
+
+        return self.__class__, (dict(self),)
@@ -0,0 +1,36 @@
+
+class FrozenList(list):
+    """
+    Read-only list used by a frozen config
+    """
+
+    def _raise_frozen(self, *args, **kwargs):
+        """
+        Raise error because list can not be changed
+        """
+
+        raise RuntimeError('Config is frozen and can not be changed.')
+
+    __setitem__ = _raise_frozen
+    __delitem__ = _raise_frozen
+    __setslice__ = _raise_frozen
+    __delslice__ = _raise_frozen
+    __iadd__ = _raise_frozen
+    __imul__ = _raise_frozen
+    append = _raise_frozen
+    extend = _raise_frozen
+    insert = _raise_frozen
+    pop = _raise_frozen
+    remove = _raise_frozen
+    reverse = _raise_frozen
+    sort = _raise_frozen
+    clear = _raise_frozen
+
+    def __reduce__(self):
+        """
+        Support for pickle and copy
+        :return:    Class and arguments to reconstruct the list
+        :rtype:     tuple
+        """
+
+        return self.__class__, (list(self),)
@@ -1,10 +1,14 @@
 
 from edmunds.foundation.patterns.manager import Manager
-from flask_sqlalchemy import SQLAlchemy
+from edmunds.database.flasksqlalchemy import SQLAlchemy
+from edmunds.database.meteredqueuepool import MeteredQueuePool
 from edmunds.database.drivers.mysql import MySql
 from edmunds.database.drivers.postgresql import PostgreSql
 from edmunds.database.drivers.sqlite import Sqlite
 from edmunds.database.drivers.sqlitememory import SqliteMemory
+from edmunds.database.queryinstrumentation import QueryInstrumentation
+from edmunds.database.replicagroup import ReplicaGroup
+from sqlalchemy import event
 from threading import Lock
 
 
@@ -39,6 +43,17 @@ class DatabaseManager(Manager):
         self._files_path = 'database'
         self._load_lock_sql_alchemy = Lock()
 
+        self.instrumentation = None
+        if app.config('app.database.instrumentation.enabled', False):
+            self.instrumentation = QueryInstrumentation(app, threshold=app.config('app.database.instrumentation.threshold', 10))
+        self._engine_options = {}
+        self._statement_timeouts = {}
+        self._prepared_engines = set()
+
+        self._groups_config = app.config('app.database.groups', [])
+        self._groups = {}
+        self._groups_lock = Lock()
+
     def _load(self):
         """
         Load all the instances
@@ -54,6 +69,102 @@ class DatabaseManager(Manager):
 
             return super(DatabaseManager, self)._load()
 
+    def _resolve(self, name):
+        """
+        Resolve the instance
+        :param name:    The name of the instance
+        :type  name:    str
+        :return:        SQLAlchemy Engine
+        :rtype:         sqlalchemy.engine.base.Engine
+        """
+
+        engine = super(DatabaseManager, self)._resolve(name)
+
+        # Engines are reused when reloading
+        if engine in self._prepared_engines:
+            return engine
+        self._prepared_engines.add(engine)
+
+        if self.instrumentation is not None:
+            self.instrumentation.attach(engine, name)
+
+        if name in self._statement_timeouts:
+            self._attach_statement_timeout(engine, *self._statement_timeouts[name])
+
+        registry = self._app.metrics()
+        if registry is not None and isinstance(engine.pool, MeteredQueuePool):
+            labels = (('instance', name),)
+
+            def on_checkout(duration, timed_out):
+                registry.observe('edmunds_database_pool_checkout_seconds', duration, labels)
+                if timed_out:
+                    registry.inc('edmunds_database_pool_timeouts_total', labels)
+            engine.pool.on_checkout = on_checkout
+
+        return engine
+
+    def get_group(self, name):
+        """
+        Get a replica group
+        :param name:    The name of the group
+        :type  name:    str
+        :return:        The group or None when not declared
+        :rtype:         edmunds.database.replicagroup.ReplicaGroup
+        """
+
+        if name in self._groups:
+            return self._groups[name]
+
+        with self._groups_lock:
+            if name not in self._groups:
+                group = None
+                for group_config in self._groups_config:
+                    if group_config['name'] == name:
+                        group = self._create_group(group_config)
+                        break
+                self._groups[name] = group
+
+        return self._groups[name]
+
+    def _create_group(self, config):
+        """
+        Create a replica group
+        :param config:  The config
+        :type  config:  dict
+        :return:        The group
+        :rtype:         edmunds.database.replicagroup.ReplicaGroup
+        """
+
+        for instances_config_item in self._instances_config:
+            if instances_config_item['name'] == config['name']:
+                raise RuntimeError("Replica group '%s' has the same name as a database instance." % config['name'])
+
+        if 'primary' not in config:
+            raise RuntimeError("Replica group '%s' is missing some configuration ('primary' is required)." % config['name'])
+
+        primary = self.get(config['primary'])
+        replicas = [self.get(replica) for replica in config.get('replicas', [])]
+        strategy = config['strategy'] if 'strategy' in config else ReplicaGroup.ROUND_ROBIN
+        stickiness = config['stickiness'] if 'stickiness' in config else 0
+
+        return ReplicaGroup(config['name'], primary, replicas, strategy=strategy, stickiness=stickiness)
+
+    def get_engine_options(self, bind):
+        """
+        Get the options for creating the engine of an instance
+        :param bind:    The bind of the instance (None for the first instance)
+        :type  bind:    str
+        :return:        The options
+        :rtype:         dict
+        """
+
+        if bind is None:
+            if not self._instances_config:
+                return {}
+            bind = self._instances_config[0]['name']
+
+        return self._engine_options.get(bind, {})
+
     def _init_sql_alchemy(self):
         """
         Init sql alchemy
@@ -104,6 +215,14 @@ class DatabaseManager(Manager):
                     raise RuntimeError("SqliteMemory should not be used in non-debug and non-testing environment!")
                 instance_database_uri = 'sqlite://'
 
+            self._engine_options[instances_config_item['name']] = self._get_engine_options(instances_config_item)
+
+            if 'statement_timeout' in instances_config_item:
+                if instances_config_item['driver'] != MySql \
+                        and instances_config_item['driver'] != PostgreSql:
+                    raise RuntimeError("Database-driver '%s' does not support 'statement_timeout'." % instances_config_item['name'])
+                self._statement_timeouts[instances_config_item['name']] = (instances_config_item['driver'], instances_config_item['statement_timeout'])
+
             if database_uri is None:
                 database_uri = instance_database_uri
             else:
@@ -121,6 +240,64 @@ class DatabaseManager(Manager):
         DatabaseManager.get_sql_alchemy_instance().app = self._app
         DatabaseManager.get_sql_alchemy_instance().init_app(self._app)
 
+    def _get_engine_options(self, config):
+        """
+        Get the pool options of an instance
+        :param config:  The config
+        :type  config:  dict
+        :return:        The options for creating the engine
+        :rtype:         dict
+        """
+
+        options = {}
+
+        if 'pool_size' in config:
+            options['pool_size'] = config['pool_size']
+        if 'max_overflow' in config:
+            options['max_overflow'] = config['max_overflow']
+        if 'pool_timeout' in config:
+            options['pool_timeout'] = config['pool_timeout']
+        if 'pool_recycle' in config:
+            options['pool_recycle'] = config['pool_recycle']
+        if 'pool_pre_ping' in config:
+            options['pool_pre_ping'] = config['pool_pre_ping']
+
+        # Sizing the pool and metering checkouts require a queue pool.
+        # Flask-SQLAlchemy replaces it for SQLite without pool size.
+        if 'pool_size' in options or 'max_overflow' in options or 'pool_timeout' in options \
+                or self._app.config('app.metrics.enabled', False):
+            options['poolclass'] = MeteredQueuePool
+
+        return options
+
+    def _attach_statement_timeout(self, engine, driver, timeout):
+        """
+        Set the statement timeout on every new connection
+        :param engine:  The engine
+        :type  engine:  sqlalchemy.engine.base.Engine
+        :param driver:  The driver of the instance
+        :type  driver:  class
+        :param timeout: The timeout in seconds
+        :type  timeout: float
+        """
+
+        if driver == MySql:
+            statement = 'SET SESSION max_execution_time = %d' % (timeout * 1000)
+        else:
+            statement = 'SET statement_timeout = %d' % (timeout * 1000)
+
+        def connect(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute(statement)
+            finally:
+                cursor.close()
+            # PostgreSQL runs the SET in a transaction, which the
+            # pool would roll back when the connection is returned
+            dbapi_connection.commit()
+
+        event.listen(engine, 'connect', connect)
+
     def _create_my_sql(self, config):
         """
         Create my sql
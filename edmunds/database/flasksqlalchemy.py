@@ -0,0 +1,72 @@
+from flask_sqlalchemy import SQLAlchemy as FlaskSQLAlchemy, _EngineConnector as FlaskEngineConnector
+from threading import local
+
+
+class SQLAlchemy(FlaskSQLAlchemy):
+    """
+    SQLAlchemy
+    Applies the engine options of the database instances
+    when Flask-SQLAlchemy creates their engines.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initiate the instance
+        """
+
+        super(SQLAlchemy, self).__init__(*args, **kwargs)
+
+        # The bind of the engine being created in this thread
+        self._connecting = local()
+
+    def make_connector(self, app=None, bind=None):
+        """
+        Create the connector for a bind
+        :param app:     The application
+        :type  app:     edmunds.application.Application
+        :param bind:    The bind (None for the default)
+        :type  bind:    str
+        :return:        The connector
+        :rtype:         _EngineConnector
+        """
+
+        return _EngineConnector(self, self.get_app(app), bind)
+
+    def apply_driver_hacks(self, app, info, options):
+        """
+        Apply the engine options of the instance before
+        the defaults of Flask-SQLAlchemy.
+        :param app:     The application
+        :type  app:     edmunds.application.Application
+        :param info:    The url of the database
+        :type  info:    sqlalchemy.engine.url.URL
+        :param options: The options for creating the engine
+        :type  options: dict
+        """
+
+        manager = app.extensions.get('edmunds.database')
+        if manager is not None:
+            options.update(manager.get_engine_options(getattr(self._connecting, 'bind', None)))
+
+        super(SQLAlchemy, self).apply_driver_hacks(app, info, options)
+
+
+class _EngineConnector(FlaskEngineConnector):
+    """
+    Engine Connector
+    Exposes its bind while creating the engine, as instances
+    can share an url but have different engine options.
+    """
+
+    def get_engine(self):
+        """
+        Get the engine of the bind
+        :return:    The engine
+        :rtype:     sqlalchemy.engine.base.Engine
+        """
+
+        self._sa._connecting.bind = self._bind
+        try:
+            return super(_EngineConnector, self).get_engine()
+        finally:
+            self._sa._connecting.bind = None
@@ -0,0 +1,61 @@
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+from timeit import default_timer
+
+
+class MeteredQueuePool(QueuePool):
+    """
+    Metered Queue Pool
+    A queue pool that reports how long checking out a
+    connection takes, including waiting for a free connection.
+    """
+
+    on_checkout = None
+
+    def connect(self):
+        """
+        Check out a connection
+        :return:    The connection
+        """
+
+        return self._checkout(super(MeteredQueuePool, self).connect)
+
+    def unique_connection(self):
+        """
+        Check out a connection, used by the engine
+        :return:    The connection
+        """
+
+        return self._checkout(super(MeteredQueuePool, self).unique_connection)
+
+    def _checkout(self, checkout):
+        """
+        Check out a connection and report the duration
+        :param checkout:    The checkout function of the pool
+        :type  checkout:    callable
+        :return:            The connection
+        """
+
+        on_checkout = self.on_checkout
+        if on_checkout is None:
+            return checkout()
+
+        start = default_timer()
+        try:
+            connection = checkout()
+        except TimeoutError:
+            on_checkout(default_timer() - start, True)
+            raise
+        on_checkout(default_timer() - start, False)
+        return connection
+
+    def recreate(self):
+        """
+        Recreate the pool, keeping the checkout callback
+        :return:    The new pool
+        :rtype:     MeteredQueuePool
+        """
+
+        pool = super(MeteredQueuePool, self).recreate()
+        pool.on_checkout = self.on_checkout
+        return pool
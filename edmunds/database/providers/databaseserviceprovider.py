@@ -1,7 +1,10 @@
 
 from edmunds.support.serviceprovider import ServiceProvider
 from edmunds.database.databasemanager import DatabaseManager
-from edmunds.globals import g
+from edmunds.database.querystats import QueryStats
+from edmunds.database.replicagroup import ReplicaGroup
+from edmunds.globals import g, request
+import time
 
 
 class DatabaseServiceProvider(ServiceProvider):
@@ -33,3 +36,49 @@ class DatabaseServiceProvider(ServiceProvider):
                     session = g.edmunds_database_sessions[key]
                     if session is not None:
                         session.remove()
+
+        # Add the query statistics of the request to the response
+        header = self.app.config('app.database.instrumentation.header', None)
+        if manager.instrumentation is not None and header:
+            @self.app.after_request
+            def add_query_stats_header(response):
+                stats = manager.instrumentation.get_stats()
+                if stats is None:
+                    stats = QueryStats()
+                response.headers[header] = str(stats)
+                return response
+
+        # Keep reading from the primary of replica groups after a
+        # write in the requests of the same client
+        sticky_groups = dict((group['name'], group['stickiness']) for group in self.app.config('app.database.groups', []) if group.get('stickiness'))
+        if sticky_groups:
+            @self.app.before_request
+            def load_sticky_groups():
+                now = time.time()
+                sticky_until = {}
+                loaded = {}
+                for name in sticky_groups:
+                    cookie = request.cookies.get(ReplicaGroup.cookie_prefix + name)
+                    if cookie:
+                        try:
+                            until = float(cookie)
+                        except ValueError:
+                            continue
+                        # Skip nan and clamp to the window, the client could
+                        # otherwise pin itself to the primary forever
+                        if not until > 0:
+                            continue
+                        loaded[name] = until
+                        sticky_until[name] = min(until, now + sticky_groups[name])
+                g.edmunds_database_sticky_until = sticky_until
+                g.edmunds_database_sticky_until_loaded = loaded
+
+            @self.app.after_request
+            def save_sticky_groups(response):
+                sticky_until = getattr(g, 'edmunds_database_sticky_until', None) or {}
+                loaded = getattr(g, 'edmunds_database_sticky_until_loaded', None) or {}
+                for name in sticky_until:
+                    if sticky_until[name] != loaded.get(name):
+                        response.set_cookie(ReplicaGroup.cookie_prefix + name, '%f' % sticky_until[name],
+                                            expires=sticky_until[name], httponly=True)
+                return response
@@ -0,0 +1,113 @@
+from edmunds.database.querystats import QueryStats
+from edmunds.globals import g, has_app_context
+from sqlalchemy import event
+from timeit import default_timer
+import re
+
+
+class QueryInstrumentation(object):
+    """
+    Query Instrumentation
+    Hooks into the events of engines to count the queries,
+    measure their time and fingerprint their statements
+    per request. Logs a warning when the same statement is
+    executed more than the threshold within one request,
+    which is usually an N+1 query problem.
+    """
+
+    _literals = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+    # Positional, format, pyformat and named parameters
+    _parameter = r'(?:\?|%s|%\(\w+\)s|:\w+)'
+    _in_lists = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)' % (_parameter, _parameter))
+    _whitespace = re.compile(r'\s+')
+
+    def __init__(self, app, threshold=10):
+        """
+        Initiate the instance
+        :param app:         The application
+        :type  app:         edmunds.application.Application
+        :param threshold:   The number of executions of a statement within
+                            one request that are allowed before logging
+        :type  threshold:   int
+        """
+
+        self._app = app
+        self._threshold = threshold
+
+    def attach(self, engine, name):
+        """
+        Attach to the events of an engine
+        :param engine:  The engine
+        :type  engine:  sqlalchemy.engine.base.Engine
+        :param name:    The name of the database instance
+        :type  name:    str
+        """
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('edmunds_query_start', []).append(default_timer())
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            start = conn.info['edmunds_query_start'].pop()
+            self._add(name, statement, default_timer() - start)
+
+        def handle_error(context):
+            # Failed statements do not reach after_cursor_execute
+            if context.connection is not None:
+                starts = context.connection.info.get('edmunds_query_start')
+                if starts:
+                    starts.pop()
+
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+        event.listen(engine, 'handle_error', handle_error)
+
+    def get_stats(self):
+        """
+        Get the query statistics of the current request
+        :return:    The statistics or None outside of a request
+        :rtype:     QueryStats
+        """
+
+        if not has_app_context():
+            return None
+
+        return getattr(g, 'edmunds_database_query_stats', None)
+
+    def fingerprint(self, statement):
+        """
+        Fingerprint a statement by removing its literals and parameters
+        :param statement:   The statement
+        :type  statement:   str
+        :return:            The fingerprint
+        :rtype:             str
+        """
+
+        fingerprint = self._literals.sub('?', statement)
+        fingerprint = self._in_lists.sub('(?)', fingerprint)
+        return self._whitespace.sub(' ', fingerprint).strip()
+
+    def _add(self, name, statement, duration):
+        """
+        Add an executed query to the statistics of the current request
+        :param name:        The name of the database instance
+        :type  name:        str
+        :param statement:   The statement
+        :type  statement:   str
+        :param duration:    The duration in seconds
+        :type  duration:    float
+        """
+
+        if not has_app_context():
+            return
+
+        stats = getattr(g, 'edmunds_database_query_stats', None)
+        if stats is None:
+            stats = QueryStats()
+            g.edmunds_database_query_stats = stats
+
+        fingerprint = self.fingerprint(statement)
+        count = stats.add(fingerprint, duration)
+
+        # Log once per statement per request
+        if count == self._threshold + 1:
+            self._app.logger.warning('Possible N+1 queries: statement executed more than %d times on database "%s": %s' % (self._threshold, name, fingerprint))
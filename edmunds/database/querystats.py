@@ -0,0 +1,46 @@
+
+class QueryStats(object):
+    """
+    Query Stats
+    The statistics of the queries of one request.
+    """
+
+    def __init__(self):
+        """
+        Initiate the instance
+        """
+
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.fingerprints = {}
+
+    def add(self, fingerprint, duration):
+        """
+        Add an executed query
+        :param fingerprint: The fingerprint of the statement
+        :type  fingerprint: str
+        :param duration:    The duration in seconds
+        :type  duration:    float
+        :return:            The number of times the fingerprint was executed
+        :rtype:             int
+        """
+
+        self.count += 1
+        self.total_time += duration
+        if duration > self.max_time:
+            self.max_time = duration
+
+        fingerprint_count = self.fingerprints.get(fingerprint, 0) + 1
+        self.fingerprints[fingerprint] = fingerprint_count
+
+        return fingerprint_count
+
+    def __str__(self):
+        """
+        Summary of the statistics
+        :return:    The summary
+        :rtype:     str
+        """
+
+        return 'count=%d; total=%.6f; max=%.6f; statements=%d' % (self.count, self.total_time, self.max_time, len(self.fingerprints))
@@ -0,0 +1,149 @@
+from edmunds.globals import g, has_app_context
+from itertools import count
+from random import random, randrange, sample
+from sqlalchemy import event
+from timeit import default_timer
+import time
+
+
+class ReplicaGroup(object):
+    """
+    Replica Group
+    A primary database with its read-replicas. Reads are
+    balanced over the replicas round-robin or by the lowest
+    measured latency of two random replicas, probing a random
+    replica now and then so a slow replica can recover. After
+    a write the current client sticks to the primary for a
+    window, so it reads its own writes while the replicas
+    catch up.
+    """
+
+    ROUND_ROBIN = 'round-robin'
+    LEAST_LATENCY = 'least-latency'
+
+    # The window is kept in a cookie per group between requests
+    cookie_prefix = 'edmunds_database_primary_'
+
+    # Weight of a new measurement in the moving average of the latency
+    _latency_weight = 0.2
+    # Chance of reading from a random replica to measure its latency again
+    _probe_chance = 0.05
+
+    def __init__(self, name, primary, replicas, strategy=ROUND_ROBIN, stickiness=0):
+        """
+        Initiate the instance
+        :param name:        The name of the group
+        :type  name:        str
+        :param primary:     The engine of the primary
+        :type  primary:     sqlalchemy.engine.base.Engine
+        :param replicas:    The engines of the replicas
+        :type  replicas:    list
+        :param strategy:    The strategy for balancing the reads
+        :type  strategy:    str
+        :param stickiness:  The seconds to read from the primary after a write
+        :type  stickiness:  float
+        """
+
+        if strategy != self.ROUND_ROBIN and strategy != self.LEAST_LATENCY:
+            raise RuntimeError("Replica group '%s' has an unknown strategy '%s'." % (name, strategy))
+
+        self.name = name
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.strategy = strategy
+        self.stickiness = stickiness
+
+        self._counter = count()
+        self._latencies = [0.0] * len(self.replicas)
+
+        if strategy == self.LEAST_LATENCY:
+            for index, replica in enumerate(self.replicas):
+                self._measure_latency(index, replica)
+
+    def get_replica(self):
+        """
+        Get the engine to read from
+        :return:    The engine of a replica, or the primary
+                    when there are no replicas or the client
+                    sticks to the primary
+        :rtype:     sqlalchemy.engine.base.Engine
+        """
+
+        if not self.replicas or self.is_sticky():
+            return self.primary
+
+        if self.strategy == self.LEAST_LATENCY:
+            index = self._get_least_latency_index()
+        else:
+            # Incrementing a count is atomic
+            index = next(self._counter) % len(self.replicas)
+
+        return self.replicas[index]
+
+    def _get_least_latency_index(self):
+        """
+        Get the replica with the least latency of two random replicas.
+        Comparing two spreads the reads over the fast replicas instead
+        of herding them on the fastest one.
+        :return:    The index of the replica
+        :rtype:     int
+        """
+
+        if len(self.replicas) == 1:
+            return 0
+
+        # A replica is only measured when it is read from
+        if random() < self._probe_chance:
+            return randrange(len(self.replicas))
+
+        first, second = sample(range(len(self.replicas)), 2)
+        if self._latencies[second] < self._latencies[first]:
+            return second
+        return first
+
+    def stick(self):
+        """
+        Read from the primary for the stickiness window
+        """
+
+        if not self.stickiness or not has_app_context():
+            return
+
+        if getattr(g, 'edmunds_database_sticky_until', None) is None:
+            g.edmunds_database_sticky_until = {}
+        g.edmunds_database_sticky_until[self.name] = time.time() + self.stickiness
+
+    def is_sticky(self):
+        """
+        Check if the current client reads from the primary
+        :return:    Sticky
+        :rtype:     bool
+        """
+
+        if not self.stickiness or not has_app_context():
+            return False
+
+        sticky_until = getattr(g, 'edmunds_database_sticky_until', None)
+        if not sticky_until or self.name not in sticky_until:
+            return False
+
+        return sticky_until[self.name] > time.time()
+
+    def _measure_latency(self, index, engine):
+        """
+        Measure the latency of the statements of a replica
+        :param index:   The index of the replica
+        :type  index:   int
+        :param engine:  The engine of the replica
+        :type  engine:  sqlalchemy.engine.base.Engine
+        """
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('edmunds_replica_start', []).append(default_timer())
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            duration = default_timer() - conn.info['edmunds_replica_start'].pop()
+            self._latencies[index] += (duration - self._latencies[index]) * self._latency_weight
+
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', after_cursor_execute)
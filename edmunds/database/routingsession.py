@@ -0,0 +1,110 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.sql.selectable import SelectBase
+import re
+
+
+class RoutingSession(Session):
+    """
+    Routing Session
+    Sends the reads of a session to the replicas of a replica group
+    and the writes to the primary. Once a transaction has written,
+    it stays on the primary until it ends.
+    Reads before the first write still go to a replica, which can be
+    behind on the primary. A transaction that reads values to write
+    them back (read-modify-write) should call use_primary first or
+    read with with_for_update.
+    """
+
+    _read_text = re.compile(r'^\s*SELECT\b', re.IGNORECASE)
+
+    def __init__(self, group, **kwargs):
+        """
+        Initiate the instance
+        :param group:   The replica group
+        :type  group:   edmunds.database.replicagroup.ReplicaGroup
+        :param kwargs:  The arguments of the session
+        """
+
+        super(RoutingSession, self).__init__(**kwargs)
+
+        self.group = group
+        self._pinned = False
+        self._written = False
+
+    def use_primary(self):
+        """
+        Read from the primary until the transaction ends
+        """
+
+        self._pinned = True
+
+    def get_bind(self, mapper=None, clause=None):
+        """
+        Get the engine to execute on
+        :param mapper:  The mapper
+        :param clause:  The statement
+        :return:        The engine
+        :rtype:         sqlalchemy.engine.base.Engine
+        """
+
+        read = self._is_read(clause)
+        if read and not self._pinned:
+            return self.group.get_replica()
+
+        self._pinned = True
+        if not read:
+            self._written = True
+        return self.group.primary
+
+    def commit(self):
+        """
+        Commit the transaction
+        """
+
+        super(RoutingSession, self).commit()
+
+        written = self._written
+        self._pinned = False
+        self._written = False
+        if written:
+            self.group.stick()
+
+    def rollback(self):
+        """
+        Rollback the transaction
+        """
+
+        super(RoutingSession, self).rollback()
+
+        self._pinned = False
+        self._written = False
+
+    def close(self):
+        """
+        Close the session
+        """
+
+        super(RoutingSession, self).close()
+
+        self._pinned = False
+        self._written = False
+
+    def _is_read(self, clause):
+        """
+        Check if a statement only reads
+        :param clause:  The statement
+        :return:        Reads
+        :rtype:         bool
+        """
+
+        if self._flushing:
+            return False
+
+        if isinstance(clause, SelectBase):
+            return getattr(clause, '_for_update_arg', None) is None
+
+        if isinstance(clause, TextClause):
+            return self._read_text.match(clause.text) is not None
+
+        return False
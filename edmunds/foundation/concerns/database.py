@@ -1,4 +1,5 @@
 
+from edmunds.database.routingsession import RoutingSession
 from sqlalchemy.orm import scoped_session, sessionmaker
 from threading import Lock
 from edmunds.globals import g
@@ -37,7 +38,9 @@ class Database(object):
     def database_session(self, name=None, no_instance_error=False):
         """
         Get a session to work with
-        :param name:                The name of the database instance
+        :param name:                The name of the database instance,
+                                    or of a replica group to route the
+                                    reads to the replicas
         :param no_instance_error:   Error when no instance
         :return:                    Session
         :rtype:                     sqlalchemy.orm.scoping.scoped_session
@@ -67,14 +70,27 @@ class Database(object):
         if store_key not in g.edmunds_database_sessions:
             with self._database_session_lock:
                 if store_key not in g.edmunds_database_sessions:
-                    # Fetch engine
-                    engine = self.database_engine(name=name, no_instance_error=no_instance_error)
-                    if not engine:
-                        # No engine
-                        Session = None
+                    # Fetch replica group
+                    group = None
+                    if name is not None:
+                        group = self.extensions['edmunds.database'].get_group(name)
+
+                    if group is not None:
+                        # Make factory and scoped session routing to the group
+                        Session = scoped_session(sessionmaker(class_=RoutingSession, group=group, autocommit=False, autoflush=False))
                     else:
-                        # Make factory and scoped session
-                        Session = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+                        # Fetch engine
+                        engine = self.database_engine(name=name, no_instance_error=no_instance_error)
+                        if not engine:
+                            # No engine
+                            Session = None
+                        else:
+                            # Make factory and scoped session
+                            Session = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+
+                    metrics = self.metrics()
+                    if Session is not None and metrics is not None:
+                        metrics.inc('edmunds_database_sessions_total', (('instance', store_key),))
 
                     g.edmunds_database_sessions[store_key] = Session
 
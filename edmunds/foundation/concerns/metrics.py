@@ -0,0 +1,18 @@
+
+class Metrics(object):
+    """
+    This class concerns metrics code for Application to extend from
+    """
+
+    def metrics(self):
+        """
+        The metrics registry
+        :return:    The metrics registry
+        :rtype:     edmunds.metrics.registry.Registry
+        """
+
+        # Enabled?
+        if not self.config('app.metrics.enabled', False):
+            return
+
+        return self.extensions['edmunds.metrics']
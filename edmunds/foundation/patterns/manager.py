@@ -22,6 +22,7 @@ class Manager(object):
         self._instances = None
         self._extend = {}
         self._load_lock = Lock()
+        self._loading_instances = None
 
         @self._app.before_first_request
         def load_before_first_request():
@@ -76,16 +77,41 @@ class Manager(object):
                 return
 
             instances = {}
+            self._loading_instances = {}
 
-            for instance_config in self._instances_config:
-                name = instance_config['name']
-                if name in instances:
-                    raise RuntimeError('Re-declaring instance with name "%s"' % name)
+            try:
+                for instance_config in self._instances_config:
+                    name = instance_config['name']
+                    if name in instances:
+                        raise RuntimeError('Re-declaring instance with name "%s"' % name)
 
-                instances[name] = self._resolve(name)
+                    instances[name] = self._resolve_loading_instance(name)
+            finally:
+                self._loading_instances = None
 
             self._instances = instances
 
+    def _resolve_loading_instance(self, name):
+        """
+        Resolve an instance while loading the instances.
+        Drivers can use this to be composed of other
+        instances without resolving them twice.
+        :param name:    The name of the instance
+        :type  name:    str
+        :return:        The driver
+        """
+
+        if self._loading_instances is None:
+            raise RuntimeError('Instances can only be resolved this way while loading.')
+
+        if name not in self._loading_instances:
+            self._loading_instances[name] = None
+            self._loading_instances[name] = self._resolve(name)
+        elif self._loading_instances[name] is None:
+            raise RuntimeError('Circular reference while resolving instance "%s"' % name)
+
+        return self._loading_instances[name]
+
     def _reload(self):
         """
         Reload the instances config
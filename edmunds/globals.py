@@ -4,6 +4,7 @@ from flask import current_app as flask_current_app, \
     request as flask_request, \
     session as flask_session, \
     has_request_context as flask_has_request_context, \
+    has_app_context as flask_has_app_context, \
     make_response as flask_make_response, \
     abort as flask_abort, \
     g as flask_g, \
@@ -23,6 +24,7 @@ current_app = flask_current_app
 request = flask_request
 session = flask_session
 has_request_context = flask_has_request_context
+has_app_context = flask_has_app_context
 make_response = flask_make_response
 abort = flask_abort
 g = flask_g
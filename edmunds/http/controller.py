@@ -2,7 +2,7 @@
 from edmunds.globals import request, visitor
 from edmunds.http.input import Input
 from edmunds.http.responsehelper import ResponseHelper
-from threading import Lock
+from edmunds.support.lazyattribute import LazyAttribute
 
 
 class Controller(object):
@@ -10,6 +10,11 @@ class Controller(object):
     The Controller
     """
 
+    __slots__ = ('app', 'request', 'visitor', '_lazy_input', '_lazy_session', '_lazy_response')
+
+    # Stateless controllers are constructed once and reused for every request
+    stateless = False
+
     def __init__(self, app):
         """
         Initialize the controller
@@ -20,12 +25,6 @@ class Controller(object):
         self.app = app
         self.request = request
         self.visitor = visitor
-        self._input = None
-        self._input_lock = Lock()
-        self._session = None
-        self._session_lock = Lock()
-        self._response = None
-        self._response_lock = Lock()
 
     def initialize(self, **params):
         """
@@ -35,7 +34,7 @@ class Controller(object):
         """
         pass
 
-    @property
+    @LazyAttribute
     def input(self):
         """
         Get input
@@ -43,49 +42,18 @@ class Controller(object):
         :type:      edmunds.http.input.Input
         """
 
-        if self._input is None:
-            with self._input_lock:
-                if self._input is None:
-                    self._input = Input(self.request)
-        return self._input
-
-    @input.setter
-    def input(self, input):
-        """
-        Set input
-        :param input:   Input 
-        :return:        void
-        """
-
-        with self._input_lock:
-            self._input = input
+        return Input(self.request)
 
-    @property
+    @LazyAttribute
     def session(self):
         """
         Get session
         :return:    Session
         """
 
-        if self._session is None:
-            with self._session_lock:
-                if self._session is None:
-                    self._session = self.app.session(no_instance_error=True)
-
-        return self._session
-
-    @session.setter
-    def session(self, session):
-        """
-        Set session
-        :param session:     Session 
-        :return:            void
-        """
-
-        with self._session_lock:
-            self._session = session
+        return self.app.session(no_instance_error=True)
 
-    @property
+    @LazyAttribute
     def response(self):
         """
         Get response
@@ -93,20 +61,4 @@ class Controller(object):
         :rtype:     edmunds.http.responsehelper.ResponseHelper
         """
 
-        if self._response is None:
-            with self._response_lock:
-                if self._response is None:
-                    self._response = ResponseHelper()
-
-        return self._response
-
-    @response.setter
-    def response(self, response):
-        """
-        Set response
-        :param response:    Response Helper
-        :return:            void
-        """
-
-        with self._response_lock:
-            self._response = response
+        return ResponseHelper()
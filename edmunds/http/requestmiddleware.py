@@ -4,6 +4,9 @@ class RequestMiddleware(object):
     The Request Middleware
     """
 
+    # Stateless middleware is constructed once and reused for every request
+    stateless = False
+
     def __init__(self, app):
         """
         Initialize the application
@@ -1,12 +1,14 @@
 
 from werkzeug.datastructures import Headers
 from edmunds.globals import render_template, redirect, send_from_directory, jsonify, make_response
-from threading import Lock
 from edmunds.application import Application
+from edmunds.support.lazyattribute import LazyAttribute
 
 
 class ResponseHelper(object):
 
+    __slots__ = ('_status', 'assigns', 'headers', '_lazy__cookie_response')
+
     def __init__(self):
         """
         Constructor
@@ -14,8 +16,6 @@ class ResponseHelper(object):
         self._status = None
         self.assigns = dict()
         self.headers = Headers()
-        self.__cookie_response = None
-        self.__cookie_response_lock = Lock()
 
     def status(self, status):
         """
@@ -59,19 +59,15 @@ class ResponseHelper(object):
         self.headers.remove(key)
         return self
 
-    @property
+    @LazyAttribute
     def _cookie_response(self):
         """
         Get cookie response
         :return:    Response
         """
-        if self.__cookie_response is None:
-            with self.__cookie_response_lock:
-                if self.__cookie_response is None:
-                    response = make_response()
-                    response.headers.clear()
-                    self.__cookie_response = response
-        return self.__cookie_response
+        response = make_response()
+        response.headers.clear()
+        return response
 
     def cookie(self, key, value='', max_age=None, expires=None, path='/', domain=None, secure=False, httponly=False):
         """Sets a cookie. The parameters are the same as in the cookie `Morsel`
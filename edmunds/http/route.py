@@ -1,4 +1,8 @@
 
+from edmunds.metrics.middleware.meteredrequestmiddleware import MeteredRequestMiddleware
+from timeit import default_timer
+
+
 class Route(object):
     """
     Route object
@@ -11,10 +15,12 @@ class Route(object):
         :type app:      edmunds.application.Application
         """
         self.app = app
+        self.endpoint = None
         self.controller_class = None
         self.method_name = None
         self.decorate_function = None
         self._middleware = []
+        self._pipeline = None
 
     def uses(self, controller_class, method_name):
         """
@@ -27,6 +33,7 @@ class Route(object):
 
         self.controller_class = controller_class
         self.method_name = method_name
+        self._pipeline = None
 
     def decorate(self, func):
         """
@@ -36,6 +43,7 @@ class Route(object):
         """
 
         self.decorate_function = func
+        self._pipeline = None
 
     def middleware(self, middleware_class, *args, **kwargs):
         """
@@ -53,6 +61,7 @@ class Route(object):
         assert hasattr(middleware_class, 'after')
 
         self._middleware.append((middleware_class, args, kwargs))
+        self._pipeline = None
 
         return self
 
@@ -65,38 +74,142 @@ class Route(object):
         :type kwargs:   dict
         :return:        Response
         """
-        middleware_instances = []
 
-        # Handle before middleware
-        for (middleware_class, middleware_args, middleware_kwargs) in self._middleware:
-            middleware_instance = middleware_class(self.app)
-            middleware_instances.append((middleware_instance, middleware_args, middleware_kwargs))
+        pipeline = self._pipeline
+        if pipeline is None:
+            pipeline = self._compile()
+            self._pipeline = pipeline
+
+        return pipeline(*args, **kwargs)
+
+    def _compile(self):
+        """
+        Compile the middleware and the handler into one pipeline
+        Stateless middleware and controllers are constructed once
+        and reused for every request.
+        When metrics are enabled the pipeline is metered.
+        :return:        The pipeline
+        :rtype:         callable
+        """
+
+        app = self.app
+        handler = self._compile_handler()
 
-            before_rv = middleware_instance.before(*middleware_args, **middleware_kwargs)
-            if before_rv is not None:
-                response = self.app.make_response(before_rv)
-                return response
+        registry = app.metrics()
+        if registry is not None:
+            handler = self._meter(handler, registry, 'edmunds_controller_duration_seconds')
 
-        if self.controller_class is not None:
-            # Make instance of controller
-            controller = self.controller_class(self.app)
+        middleware = tuple(
+            (middleware_class,
+             middleware_class(app) if getattr(middleware_class, 'stateless', False) else None,
+             middleware_args,
+             middleware_kwargs)
+            for (middleware_class, middleware_args, middleware_kwargs) in self._middleware)
 
-            # Initialize the controller
-            controller.initialize(*args, **kwargs)
+        if registry is not None:
+            endpoint = self.endpoint
 
-            # Call method of controller
-            method_func = getattr(controller, self.method_name)
-            rv = method_func(*args, **kwargs)
-        else:
-            # Call the decorate function
-            rv = self.decorate_function(*args, **kwargs)
+            def metered_middleware_class(middleware_class):
+                return lambda app: MeteredRequestMiddleware(middleware_class(app), registry, endpoint)
+
+            middleware = tuple(
+                (metered_middleware_class(middleware_class),
+                 MeteredRequestMiddleware(middleware_instance, registry, endpoint) if middleware_instance is not None else None,
+                 middleware_args,
+                 middleware_kwargs)
+                for (middleware_class, middleware_instance, middleware_args, middleware_kwargs) in middleware)
+
+        if not middleware:
+            def pipeline(*args, **kwargs):
+                return app.make_response(handler(*args, **kwargs))
+            if registry is not None:
+                pipeline = self._meter(pipeline, registry, 'edmunds_route_duration_seconds')
+            return pipeline
+
+        reversed_middleware_indexes = tuple(reversed(range(len(middleware))))
+
+        def pipeline(*args, **kwargs):
+            middleware_instances = []
+
+            # Handle before middleware
+            for (middleware_class, middleware_instance, middleware_args, middleware_kwargs) in middleware:
+                if middleware_instance is None:
+                    middleware_instance = middleware_class(app)
+                middleware_instances.append(middleware_instance)
+
+                before_rv = middleware_instance.before(*middleware_args, **middleware_kwargs)
+                if before_rv is not None:
+                    return app.make_response(before_rv)
+
+            # Make it a response
+            response = app.make_response(handler(*args, **kwargs))
 
-        # Make it a response
-        response = self.app.make_response(rv)
+            # Handle after middleware
+            for index in reversed_middleware_indexes:
+                (middleware_class, middleware_instance, middleware_args, middleware_kwargs) = middleware[index]
+                response = middleware_instances[index].after(response, *middleware_args, **middleware_kwargs)
 
-        # Handle after middleware
-        for (middleware_instance, middleware_args, middleware_kwargs) in list(reversed(middleware_instances)):
-            response = middleware_instance.after(response, *middleware_args, **middleware_kwargs)
+            return response
 
-        # Return response
-        return response
+        if registry is not None:
+            pipeline = self._meter(pipeline, registry, 'edmunds_route_duration_seconds')
+        return pipeline
+
+    def _meter(self, func, registry, name):
+        """
+        Meter the duration of a function
+        :param func:        The function
+        :type  func:        callable
+        :param registry:    The metrics registry
+        :type  registry:    edmunds.metrics.registry.Registry
+        :param name:        The name of the histogram
+        :type  name:        str
+        :return:            The metered function
+        :rtype:             callable
+        """
+
+        labels = (('endpoint', self.endpoint),)
+
+        def metered(*args, **kwargs):
+            start = default_timer()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.observe(name, default_timer() - start, labels)
+
+        return metered
+
+    def _compile_handler(self):
+        """
+        Compile the handler of the request
+        :return:        The handler
+        :rtype:         callable
+        """
+
+        if self.controller_class is None:
+            return self.decorate_function
+
+        app = self.app
+        controller_class = self.controller_class
+        method_name = self.method_name
+
+        if getattr(controller_class, 'stateless', False):
+            controller = controller_class(app)
+            method_func = getattr(controller, method_name)
+
+            def handler(*args, **kwargs):
+                # Initialize the controller
+                controller.initialize(*args, **kwargs)
+                # Call method of controller
+                return method_func(*args, **kwargs)
+
+        else:
+            def handler(*args, **kwargs):
+                # Make instance of controller
+                controller = controller_class(app)
+                # Initialize the controller
+                controller.initialize(*args, **kwargs)
+                # Call method of controller
+                return getattr(controller, method_name)(*args, **kwargs)
+
+        return handler
@@ -29,6 +29,11 @@ class Localizator(object):
         self._app = app
         self._translator = translator
 
+        # Config does not change during the lifetime of a localizator
+        self._translations_enabled = app.config('app.localization.translations.enabled', False)
+        self._metrics = app.metrics()
+        self._prefetched = {}
+
         most_accurate_number = Number(most_accurate_locale)
         most_accurate_time = Time(most_accurate_locale, time_zone)
         self._most_accurate_localization = Localization(most_accurate_locale, most_accurate_number, most_accurate_time)
@@ -88,14 +93,121 @@ class Localizator(object):
         :type:              str
         """
 
-        if not self._app.config('app.localization.translations.enabled', False):
+        if self._prefetched:
+            prefetched_key = self._get_prefetched_key(key, parameters)
+            if prefetched_key in self._prefetched:
+                return self._prefetched[prefetched_key]
+
+        results, errors = self._translate_all([(key, parameters)])
+        if errors:
+            raise errors[0]
+        return results[0]
+
+    def translate_many(self, translations):
+        """
+        Get multiple translations in one pass. The translations
+        that fail in the supported locale are fetched in the
+        fallback locale afterwards. Translations that fail in
+        the fallback locale as well are logged and None.
+        :param translations:    The keys and parameters of the translations
+        :type translations:     list
+        :return:                The translations in the same order
+        :rtype:                 list
+        """
+
+        results, errors = self._translate_all(translations)
+
+        for error in errors:
+            self._app.logger.error(error, exc_info=(type(error), error, getattr(error, '__traceback__', None)))
+
+        return results
+
+    def _translate_all(self, translations):
+        """
+        Get the translations in the supported locale and
+        the failed ones in the fallback locale
+        :param translations:    The keys and parameters of the translations
+        :type translations:     list
+        :return:                The translations in the same order (None
+                                when failed) and the errors of the fallback
+        :rtype:                 tuple
+        """
+
+        if not self._translations_enabled:
             raise RuntimeError('Translate can not be used as Translations is not enabled!')
 
+        metrics = self._metrics
+        if metrics is not None:
+            metrics.inc('edmunds_translations_total', (('locale', str(self._supported_localization.locale)),), len(translations))
+
+        results = []
+        failed_indexes = []
+
+        for index, (key, parameters) in enumerate(translations):
+            try:
+                results.append(self._translator.get(self._supported_localization, key, parameters=parameters))
+                continue
+            except TranslationError as e:
+                self._app.logger.error(e, exc_info=sys.exc_info())
+            except SentenceFillerError as e:
+                self._app.logger.error(e, exc_info=sys.exc_info())
+            results.append(None)
+            failed_indexes.append(index)
+
+        if not failed_indexes:
+            return results, []
+
+        if metrics is not None:
+            metrics.inc('edmunds_translation_fallbacks_total', (('locale', str(self._fallback_localization.locale)),), len(failed_indexes))
+
+        errors = []
+        for index in failed_indexes:
+            key, parameters = translations[index]
+            try:
+                results[index] = self._translator.get(self._fallback_localization, key, parameters=parameters)
+            except (TranslationError, SentenceFillerError) as e:
+                errors.append(e)
+
+        return results, errors
+
+    def prefetch(self, translations):
+        """
+        Translate the strings of a page in one pass before rendering.
+        Translating a prefetched key with the same parameters
+        afterwards returns the prefetched translation.
+        :param translations:    The keys and parameters of the translations
+        :type translations:     list
+        """
+
+        results = self.translate_many(translations)
+
+        for (key, parameters), result in zip(translations, results):
+            # Failed translations raise again when translated
+            if result is None:
+                continue
+            prefetched_key = self._get_prefetched_key(key, parameters)
+            if prefetched_key is not None:
+                self._prefetched[prefetched_key] = result
+
+    def _get_prefetched_key(self, key, parameters):
+        """
+        Get the key of a prefetched translation
+        :param key:         Key of translation
+        :type key:          str
+        :param parameters:  Parameters used to complete the translation
+        :type parameters:   dict
+        :return:            The key or None when the parameters can not be hashed
+        :rtype:             tuple
+        """
+
+        if not parameters:
+            return key, None
+
+        # Equal values of another type are formatted differently (1, 1.0 and True)
         try:
-            return self._translator.get(self._supported_localization, key, parameters=parameters)
-        except TranslationError as e:
-            self._app.logger.error(e, exc_info=sys.exc_info())
-        except SentenceFillerError as e:
-            self._app.logger.error(e, exc_info=sys.exc_info())
+            prefetched_key = (key, frozenset((name, type(value), value) for name, value in parameters.items()))
+            hash(prefetched_key)
+        except TypeError:
+            return None
 
-        return self._translator.get(self._fallback_localization, key, parameters=parameters)
+        return prefetched_key
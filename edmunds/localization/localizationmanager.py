@@ -3,18 +3,35 @@ from edmunds.localization.localization.localizator import Localizator
 from babel.core import Locale
 from babel.dates import get_timezone
 from edmunds.globals import request
+from collections import OrderedDict
+from threading import Lock
 import re
 
 
 class LocalizationManager(object):
 
-    def __init__(self, app):
+    _locale_regex = re.compile(r'^[a-zA-Z_\-]+$')
+
+    def __init__(self, app, cache_size=256):
         """
         Constructor
-        :param app: The app 
+        :param app:         The app
+        :param cache_size:  The number of negotiated locales to cache
+        :type cache_size:   int
         """
         self._app = app
 
+        # Few distinct headers are sent, so the negotiated locales
+        # are cached by the raw input (least recently used are evicted)
+        self._cache_size = cache_size
+        self._negotiated_locales = OrderedDict()
+        self._negotiated_locales_lock = Lock()
+
+        # Config does not change, these are determined once when first used
+        self._fallback_locale = None
+        self._fallback_locale_strings = None
+        self._supported_locale_strings = None
+
     def location(self, name=None, no_instance_error=False):
         """
         The location driver
@@ -67,9 +84,7 @@ class LocalizationManager(object):
         :rtype:                                 edmunds.localization.localization.localizator.Localizator
         """
 
-        most_accurate_locale = self._get_locale(False, given_locale_strings=given_locale_strings)
-        supported_locale = self._get_locale(True, given_locale_strings=given_locale_strings)
-        fallback_locale = self._get_locale(False, only_fallback_locales=True)
+        most_accurate_locale, supported_locale, fallback_locale = self._get_negotiated_locales(given_locale_strings)
 
         time_zone = self._get_time_zone(location)
 
@@ -100,6 +115,50 @@ class LocalizationManager(object):
 
         raise RuntimeError("No valid fallback time zone defined! ('app.localization.timezonefallback')")
 
+    def _get_negotiated_locales(self, given_locale_strings=None):
+        """
+        Get the negotiated locales of the current request
+        :param given_locale_strings:    List of given locale strings to determine locale
+        :type given_locale_strings:     list
+        :return:                        The most accurate, supported and fallback locale
+        :rtype:                         tuple
+        """
+
+        key = (request.headers.get('Accept-Language'),
+               request.user_agent.language,
+               tuple(given_locale_strings) if given_locale_strings else None)
+
+        with self._negotiated_locales_lock:
+            locales = self._negotiated_locales.pop(key, None)
+            if locales is not None:
+                self._negotiated_locales[key] = locales
+                return locales
+
+        locales = (
+            self._get_locale(False, given_locale_strings=given_locale_strings),
+            self._get_locale(True, given_locale_strings=given_locale_strings),
+            self._get_fallback_locale(),
+        )
+
+        with self._negotiated_locales_lock:
+            self._negotiated_locales[key] = locales
+            while len(self._negotiated_locales) > self._cache_size:
+                self._negotiated_locales.popitem(last=False)
+
+        return locales
+
+    def _get_fallback_locale(self):
+        """
+        Get the fallback locale
+        :return:    Locale
+        :rtype:     babel.core.Locale
+        """
+
+        if self._fallback_locale is None:
+            self._fallback_locale = self._get_locale(False, only_fallback_locales=True)
+
+        return self._fallback_locale
+
     def _get_locale(self, from_supported_locales, given_locale_strings=None, only_fallback_locales=False):
         """
         Get locale
@@ -195,6 +254,9 @@ class LocalizationManager(object):
         Get fallback locale strings
         :return:    list
         """
+        if self._fallback_locale_strings is not None:
+            return self._fallback_locale_strings
+
         # Config Fallback
         config_fallback_locale = self._app.config('app.localization.locale.fallback', None)
         config_fallback_locale = self._normalize_locale(config_fallback_locale)
@@ -207,6 +269,7 @@ class LocalizationManager(object):
         config_fallback_locales = [config_fallback_locale]
         config_fallback_locales = self._append_backup_languages_to_locale_strings(config_fallback_locales)
 
+        self._fallback_locale_strings = config_fallback_locales
         return config_fallback_locales
 
     def _get_supported_locale_strings(self):
@@ -214,6 +277,9 @@ class LocalizationManager(object):
         Get supported locale string
         :return:    list
         """
+        if self._supported_locale_strings is not None:
+            return self._supported_locale_strings
+
         supported_locales = self._app.config('app.localization.locale.supported', [])
         supported_locales = list(map(self._normalize_locale, supported_locales))
         supported_locales = list(filter(lambda x: x, supported_locales))
@@ -221,6 +287,7 @@ class LocalizationManager(object):
         if not supported_locales:
             raise RuntimeError("No valid supported locales defined! ('app.localization.locale.supported')")
 
+        self._supported_locale_strings = supported_locales
         return supported_locales
 
     def _normalize_locale(self, locale_string):
@@ -233,7 +300,7 @@ class LocalizationManager(object):
             return None
 
         # Check if valid
-        if not re.match(r'^[a-zA-Z_\-]+$', locale_string):
+        if not self._locale_regex.match(locale_string):
             return None
 
         # Change separator and split
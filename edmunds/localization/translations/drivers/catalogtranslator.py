@@ -0,0 +1,130 @@
+from edmunds.localization.translations.drivers.basedriver import BaseDriver
+from edmunds.localization.translations.exceptions.translationerror import TranslationError
+from edmunds.localization.translations.exceptions.sentencefillererror import SentenceFillerError
+
+
+class CatalogTranslator(BaseDriver):
+    """
+    Catalog Translator
+    Compiles the translations in config into a catalog that maps
+    the locale and key to the template of the sentence. Looking up
+    a translation is a single dictionary lookup instead of walking
+    the config. Keys are matched like config keys, so case
+    insensitive and with dots and underscores being the same.
+    Invalid sentences are logged and only fail their own key.
+    """
+
+    def __init__(self, app, sentence_filler):
+        """
+        Constructor
+        :param app:             The application
+        :type app:              edmunds.application.Application
+        :param sentence_filler: The sentence filler
+        :type sentence_filler:  edmunds.localization.translations.sentencefiller.SentenceFiller
+        """
+
+        super(CatalogTranslator, self).__init__(app, sentence_filler)
+
+        self._catalog = self._compile(self.app.config('app.localization.translations.strings', {}))
+
+    def get(self, localization, key, parameters=None):
+        """
+        Get translation
+        :param localization:    Localization to use for translations
+        :type localization:     edmunds.localization.localization.models.localization.Localization
+        :param key:             Key of translation
+        :type key:              str
+        :param parameters:      Parameters used to complete the translation
+        :type parameters:       dict
+        :return:                The translation
+        :type:                  str
+        """
+
+        template = self._catalog.get(self._get_catalog_key(localization.locale, key))
+
+        if template is None:
+            raise TranslationError('Could not find the sentence for locale "%s" and key "%s".' % (localization.locale, key))
+        if isinstance(template, SentenceFillerError):
+            raise template
+
+        try:
+            return self.sentence_filler.render(localization, template, params=parameters)
+        except SentenceFillerError as e:
+            raise SentenceFillerError('%s (locale "%s" and key "%s")' % (e, localization.locale, key))
+
+    def reload(self, strings=None):
+        """
+        Compile the translations again and swap the catalog.
+        Translations that are being looked up keep using the
+        previous catalog.
+        :param strings: The sentences by locale and key,
+                        defaults to the strings in config
+        :type strings:  dict
+        """
+
+        if strings is None:
+            strings = self.app.config('app.localization.translations.strings', {})
+
+        self._catalog = self._compile(strings)
+
+    def _compile(self, strings):
+        """
+        Compile the translations
+        :param strings: The sentences by locale and key
+        :type strings:  dict
+        :return:        The templates by locale and key, or the
+                        error of an invalid sentence
+        :rtype:         dict
+        """
+
+        catalog = {}
+
+        # Same priority as config when keys collide
+        for locale in reversed(sorted(strings)):
+            for key, sentence in self._flatten(strings[locale]):
+                catalog_key = self._get_catalog_key(locale, key)
+                if catalog_key in catalog:
+                    continue
+                try:
+                    catalog[catalog_key] = self.sentence_filler.compile(sentence)
+                except SentenceFillerError as e:
+                    error = SentenceFillerError('%s (locale "%s" and key "%s")' % (e, locale, key))
+                    self.app.logger.error(error)
+                    catalog[catalog_key] = error
+
+        return catalog
+
+    def _get_catalog_key(self, locale, key):
+        """
+        Get the key in the catalog, normalized like a config key
+        :param locale:  The locale
+        :type locale:   str
+        :param key:     The key of the translation
+        :type key:      str
+        :return:        The catalog key
+        :rtype:         str
+        """
+
+        return ('%s.%s' % (locale, key)).replace('.', '_').upper()
+
+    def _flatten(self, sentences, prefix=''):
+        """
+        Flatten nested sentences to dotted keys
+        :param sentences:   The sentences by key
+        :type sentences:    dict
+        :param prefix:      The prefix of the keys
+        :type prefix:       str
+        :return:            The keys and sentences
+        :rtype:             list
+        """
+
+        flattened = []
+
+        for key in reversed(sorted(sentences)):
+            value = sentences[key]
+            if isinstance(value, dict):
+                flattened.extend(self._flatten(value, prefix='%s%s.' % (prefix, key)))
+            else:
+                flattened.append(('%s%s' % (prefix, key), value))
+
+        return flattened
@@ -0,0 +1,93 @@
+from edmunds.localization.translations.drivers.basedriver import BaseDriver
+from edmunds.localization.translations.mocatalog import MoCatalog
+from edmunds.localization.translations.exceptions.translationerror import TranslationError
+from edmunds.localization.translations.exceptions.sentencefillererror import SentenceFillerError
+from threading import Lock
+import os
+
+
+class MoTranslator(BaseDriver):
+    """
+    Mo Translator
+    Fetches translations from compiled gettext catalogs (.mo-files)
+    in storage, laid out as <directory>/<locale>/LC_MESSAGES/<domain>.mo.
+    The catalogs are memory-mapped, so forked workers share their pages.
+    """
+
+    def __init__(self, app, sentence_filler, directory='translations', domain='messages', storage=None, locales=None):
+        """
+        Constructor
+        :param app:             The application
+        :type app:              edmunds.application.Application
+        :param sentence_filler: The sentence filler
+        :type sentence_filler:  edmunds.localization.translations.sentencefiller.SentenceFiller
+        :param directory:       The directory of the catalogs in storage
+        :type directory:        str
+        :param domain:          The domain of the catalogs
+        :type domain:           str
+        :param storage:         The name of the storage instance
+        :type storage:          str
+        :param locales:         The locales to load immediately, so the
+                                catalogs are mapped before workers fork
+        :type locales:          list
+        """
+
+        super(MoTranslator, self).__init__(app, sentence_filler)
+
+        self._directory = directory
+        self._domain = domain
+        self._storage = storage
+
+        self._catalogs = {}
+        self._catalogs_lock = Lock()
+
+        if locales:
+            for locale in locales:
+                self._get_catalog(locale)
+
+    def get(self, localization, key, parameters=None):
+        """
+        Get translation
+        :param localization:    Localization to use for translations
+        :type localization:     edmunds.localization.localization.models.localization.Localization
+        :param key:             Key of translation
+        :type key:              str
+        :param parameters:      Parameters used to complete the translation
+        :type parameters:       dict
+        :return:                The translation
+        :type:                  str
+        """
+
+        catalog = self._get_catalog('%s' % localization.locale)
+        sentence = catalog.get(key) if catalog is not None else None
+
+        if sentence is None:
+            raise TranslationError('Could not find the sentence for locale "%s" and key "%s".' % (localization.locale, key))
+
+        try:
+            return self.sentence_filler.fill_in(localization, sentence, params=parameters)
+        except SentenceFillerError as e:
+            raise SentenceFillerError('%s (locale "%s" and key "%s")' % (e, localization.locale, key))
+
+    def _get_catalog(self, locale):
+        """
+        Get the catalog of a locale
+        :param locale:  The locale
+        :type locale:   str
+        :return:        The catalog or None when there is none
+        :rtype:         edmunds.localization.translations.mocatalog.MoCatalog
+        """
+
+        if locale in self._catalogs:
+            return self._catalogs[locale]
+
+        with self._catalogs_lock:
+            if locale not in self._catalogs:
+                path = os.path.join(self._directory, locale, 'LC_MESSAGES', '%s.mo' % self._domain)
+                fs = self.app.fs(name=self._storage)
+                if fs.exists(path):
+                    self._catalogs[locale] = MoCatalog(fs.path(path))
+                else:
+                    self._catalogs[locale] = None
+
+        return self._catalogs[locale]
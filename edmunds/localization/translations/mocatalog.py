@@ -0,0 +1,202 @@
+from edmunds.localization.translations.exceptions.translationerror import TranslationError
+import mmap
+import struct
+
+
+class MoCatalog(object):
+    """
+    Mo Catalog
+    A compiled gettext catalog (.mo-file) that is memory-mapped
+    instead of loaded, so the pages are shared between processes
+    and only read when used. Messages are looked up with the hash
+    table of the catalog, or with a binary search over the sorted
+    messages when the catalog has no hash table.
+    Messages are expected to be UTF-8 encoded. The tables are
+    validated against the size of the file when opened, the
+    strings when they are read.
+    """
+
+    _little_endian_magic = 0x950412de
+    _big_endian_magic = 0xde120495
+
+    def __init__(self, path):
+        """
+        Initiate the instance
+        :param path:    The path of the .mo-file
+        :type  path:    str
+        """
+
+        self.path = path
+
+        with open(path, 'rb') as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty file
+                raise TranslationError('"%s" is not a valid .mo-file.' % path)
+
+        try:
+            magic = struct.unpack_from('<I', self._mmap, 0)[0]
+            if magic == self._little_endian_magic:
+                byte_order = '<'
+            elif magic == self._big_endian_magic:
+                byte_order = '>'
+            else:
+                raise TranslationError('"%s" is not a valid .mo-file.' % path)
+
+            revision, self._count, self._originals_offset, self._translations_offset, self._hash_size, self._hash_offset \
+                = struct.unpack_from(byte_order + '6I', self._mmap, 4)
+
+            # The tables have to fit in the file
+            size = len(self._mmap)
+            if self._originals_offset + self._count * 8 > size \
+                    or self._translations_offset + self._count * 8 > size \
+                    or (self._hash_size > 2 and self._hash_offset + self._hash_size * 4 > size):
+                raise TranslationError('"%s" is not a valid .mo-file.' % path)
+        except struct.error:
+            self._mmap.close()
+            raise TranslationError('"%s" is not a valid .mo-file.' % path)
+        except TranslationError:
+            self._mmap.close()
+            raise
+
+        self._uint = struct.Struct(byte_order + 'I')
+        self._entry = struct.Struct(byte_order + '2I')
+
+    def get(self, key):
+        """
+        Get the translation of a message
+        :param key:     The message id
+        :type  key:     str
+        :return:        The translation or None
+        :rtype:         str
+        """
+
+        msgid = key.encode('utf-8')
+
+        if self._hash_size > 2:
+            index = self._find_in_hash_table(msgid)
+        else:
+            index = self._find_by_binary_search(msgid)
+
+        if index is None:
+            return None
+
+        translation = self._get_string(self._translations_offset + index * 8)
+        # Plural forms are not used, the sentence filler handles plurals
+        return translation.split(b'\0', 1)[0].decode('utf-8')
+
+    def close(self):
+        """
+        Unmap the catalog
+        """
+
+        self._mmap.close()
+
+    def _find_in_hash_table(self, msgid):
+        """
+        Find a message with the hash table
+        :param msgid:   The message id
+        :type  msgid:   bytes
+        :return:        The index of the message or None
+        :rtype:         int
+        """
+
+        hash_value = self._hash(msgid)
+        index = hash_value % self._hash_size
+        increment = 1 + hash_value % (self._hash_size - 2)
+
+        for _ in range(self._hash_size):
+            entry = self._uint.unpack_from(self._mmap, self._hash_offset + index * 4)[0]
+            if entry == 0:
+                return None
+            if entry > self._count:
+                raise TranslationError('"%s" is not a valid .mo-file.' % self.path)
+            if self._matches(entry - 1, msgid):
+                return entry - 1
+            index = (index + increment) % self._hash_size
+
+        return None
+
+    def _find_by_binary_search(self, msgid):
+        """
+        Find a message in the sorted messages
+        :param msgid:   The message id
+        :type  msgid:   bytes
+        :return:        The index of the message or None
+        :rtype:         int
+        """
+
+        low = 0
+        high = self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._get_original(middle) < msgid:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self._count and self._matches(low, msgid):
+            return low
+        return None
+
+    def _matches(self, index, msgid):
+        """
+        Check if a message has the message id
+        :param index:   The index of the message
+        :type  index:   int
+        :param msgid:   The message id
+        :type  msgid:   bytes
+        :return:        Matches
+        :rtype:         bool
+        """
+
+        original = self._get_original(index)
+        # Plural messages store the plural id after the id
+        return original == msgid or original.startswith(msgid + b'\0')
+
+    def _get_original(self, index):
+        """
+        Get the message id at an index
+        :param index:   The index of the message
+        :type  index:   int
+        :return:        The message id
+        :rtype:         bytes
+        """
+
+        return self._get_string(self._originals_offset + index * 8)
+
+    def _get_string(self, entry_offset):
+        """
+        Get the string of an entry in the originals or translations table
+        :param entry_offset:    The offset of the entry
+        :type entry_offset:     int
+        :return:                The string
+        :rtype:                 bytes
+        """
+
+        length, offset = self._entry.unpack_from(self._mmap, entry_offset)
+        if offset + length > len(self._mmap):
+            raise TranslationError('"%s" is not a valid .mo-file.' % self.path)
+        return self._mmap[offset:offset + length]
+
+    @staticmethod
+    def _hash(msgid):
+        """
+        Hash a message id as gettext does (hashpjw on
+        an unsigned long, truncated to 32 bits)
+        :param msgid:   The message id
+        :type  msgid:   bytes
+        :return:        The hash
+        :rtype:         int
+        """
+
+        hash_value = 0
+        for character in bytearray(msgid):
+            hash_value = ((hash_value << 4) + character) & 0xffffffffffffffff
+            high = hash_value & 0xf0000000
+            if high:
+                hash_value ^= high >> 24
+                hash_value ^= high
+
+        return hash_value & 0xffffffff
@@ -1,14 +1,22 @@
 
 import re
 from edmunds.localization.translations.exceptions.sentencefillererror import SentenceFillerError
+from collections import namedtuple
 from datetime import date, datetime, time
 from babel.messages.plurals import get_plural
 from gettext import c2py
 
 
+Param = namedtuple('Param', ['name'])
+Function = namedtuple('Function', ['name', 'args', 'options', 'option_segments'])
+
+
 class SentenceFiller(object):
     """
     Sentence Filler
+    Sentences are parsed once into a template of literal
+    segments, params and functions. Filling in a sentence
+    renders its cached template.
     """
 
     function_delimiter = '--'
@@ -18,6 +26,23 @@ class SentenceFiller(object):
     parameter_start_delimiter = '{'
     parameter_end_delimiter = '}'
 
+    _function_regex = re.compile('%s((?!%s).+?)%s' % (re.escape(function_delimiter), re.escape(function_delimiter), re.escape(function_delimiter)))
+    _args_options_regex = re.compile('^(?P<name>[a-zA-Z_]+)(?:%s(?P<args>.+?))?%s(?P<options>.+?)$' % (re.escape(function_args_separator), re.escape(function_option_separator)))
+    _param_regex = re.compile('%s([a-zA-Z_]+?)%s' % (re.escape(parameter_start_delimiter), re.escape(parameter_end_delimiter)))
+
+    # Compiling the plural expressions of babel is expensive
+    _plural_functions = {}
+
+    def __init__(self, cache_size=1000):
+        """
+        Initiate the instance
+        :param cache_size:  The maximum number of cached templates
+        :type  cache_size:  int
+        """
+
+        self._cache_size = cache_size
+        self._templates = {}
+
     def fill_in(self, localization, sentence, params=None):
         """
         Fill in the sentence
@@ -31,30 +56,94 @@ class SentenceFiller(object):
         :rtype:                 str
         """
 
-        if params is None:
-            params = {}
+        return self.render(localization, self._get_template(sentence), params=params)
 
-        func_regex = '%s((?!%s).+?)%s' % (self.function_delimiter, self.function_delimiter, self.function_delimiter)
-        sentence = re.sub(func_regex, lambda func: self._fill_in_function(localization, func.group(1), params), sentence)
-
-        sentence = self._fill_in_params(localization, sentence, params, True)
+    def compile(self, sentence):
+        """
+        Compile a sentence into a template to render later
+        :param sentence:        The sentence to compile
+        :type sentence:         str
+        :return:                The template
+        :rtype:                 list
+        """
 
-        return sentence
+        return self._parse(sentence)
 
-    def _fill_in_function(self, localization, func, params):
+    def render(self, localization, template, params=None):
         """
-        Fill in function
+        Render a compiled template
         :param localization:    Localization to use for translations
         :type localization:     edmunds.localization.localization.models.localization.Localization
-        :param func:            Function to fill in
-        :type func:             str
+        :param template:        The template as returned by compile
+        :type template:         list
         :param params:          The params to fill the sentence with
         :type params:           dict
-        :return:                filled in function
+        :return:                Filled in sentence
+        :rtype:                 str
+        """
+
+        if params is None:
+            params = {}
+
+        # Functions are filled in before the params
+        segments = []
+        for node in template:
+            if isinstance(node, Function):
+                segments.extend(self._fill_in_function(localization, node, params))
+            else:
+                segments.append(node)
+
+        return self._fill_in_params(localization, segments, params, True)
+
+    def _get_template(self, sentence):
+        """
+        Get the parsed template of a sentence
+        :param sentence:    The sentence
+        :type sentence:     str
+        :return:            The literal segments, params and functions
+        :rtype:             list
+        """
+
+        template = self._templates.get(sentence)
+        if template is None:
+            template = self._parse(sentence)
+            # Sentences are not expected to be generated, but keep the cache bounded
+            if len(self._templates) >= self._cache_size:
+                self._templates.clear()
+            self._templates[sentence] = template
+
+        return template
+
+    def _parse(self, sentence):
+        """
+        Parse a sentence
+        :param sentence:    The sentence
+        :type sentence:     str
+        :return:            The literal segments, params and functions
+        :rtype:             list
         """
 
-        args_options_regex = '^(?P<name>[a-zA-Z_]+)(?:%s(?P<args>.+?))?%s(?P<options>.+?)$' % (self.function_args_separator, self.function_option_separator)
-        match = re.match(args_options_regex, func)
+        template = []
+        position = 0
+
+        for match in self._function_regex.finditer(sentence):
+            template.extend(self._parse_params(sentence[position:match.start()]))
+            template.append(self._parse_function(match.group(1)))
+            position = match.end()
+        template.extend(self._parse_params(sentence[position:]))
+
+        return template
+
+    def _parse_function(self, func):
+        """
+        Parse a function
+        :param func:    Function to parse
+        :type func:     str
+        :return:        The function
+        :rtype:         Function
+        """
+
+        match = self._args_options_regex.match(func)
         if match is None:
             raise SentenceFillerError('Function "%s" was not valid.' % func)
 
@@ -66,22 +155,68 @@ class SentenceFiller(object):
             args = match_dict['args'].split(self.function_arg_separator)
         else:
             args = []
-        args = list(map(lambda arg: self._fill_in_params(localization, arg, params, False), args))
+        args = [self._parse_params(arg) for arg in args]
 
-        method_name = '_fill_in_%s_function' % name
-        if not hasattr(self, method_name):
+        if not hasattr(self, '_fill_in_%s_function' % name):
             raise SentenceFillerError('Using non-existing function "%s".' % name)
-        func = getattr(self, method_name)(localization, args, options)
 
-        return func
+        option_segments = {}
+        for option in options:
+            if option not in option_segments:
+                option_segments[option] = self._parse_params(option)
+
+        return Function(name, args, options, option_segments)
+
+    def _parse_params(self, value):
+        """
+        Parse the params of a value
+        :param value:   The value to parse
+        :type value:    str
+        :return:        The literal segments and params
+        :rtype:         list
+        """
+
+        segments = []
+        position = 0
+
+        for match in self._param_regex.finditer(value):
+            if match.start() > position:
+                segments.append(value[position:match.start()])
+            segments.append(Param(match.group(1)))
+            position = match.end()
+        if position < len(value):
+            segments.append(value[position:])
 
-    def _fill_in_params(self, localization, value, params, apply_localization):
+        return segments
+
+    def _fill_in_function(self, localization, func, params):
+        """
+        Fill in function
+        :param localization:    Localization to use for translations
+        :type localization:     edmunds.localization.localization.models.localization.Localization
+        :param func:            Function to fill in
+        :type func:             Function
+        :param params:          The params to fill the sentence with
+        :type params:           dict
+        :return:                The segments of the chosen option
+        :rtype:                 list
+        """
+
+        args = [self._fill_in_params(localization, arg, params, False) for arg in func.args]
+
+        option = getattr(self, '_fill_in_%s_function' % func.name)(localization, args, func.options)
+
+        if option in func.option_segments:
+            return func.option_segments[option]
+        return self._parse_params(option)
+
+    def _fill_in_params(self, localization, segments, params, apply_localization):
         """
         Fill in params
         :param localization:        Localization to use for translations
         :type localization:         edmunds.localization.localization.models.localization.Localization
-        :param value:               The value to fill in
-        :type value:                str
+        :param segments:            The literal segments and params to fill in
+        :type segments:             list
         :param params:              The params to fill in with
         :type params:               dict
         :param apply_localization:  The apply_localization to fill in with
@@ -90,32 +225,57 @@ class SentenceFiller(object):
         :rtype:                     str
         """
 
-        param_regex = '%s([a-zA-Z_]+?)%s' % (self.parameter_start_delimiter, self.parameter_end_delimiter)
-
-        def fill_in_param(param):
-            if param in params:
-                param_value = params[param]
-                # Format values to the correct format
-                if apply_localization:
-                    if type(param_value) == int or type(param_value) == float:
-                        return localization.number.number(param_value)
-                    if type(param_value) == date:
-                        return localization.time.date(param_value)
-                    if type(param_value) == datetime:
-                        return localization.time.datetime(param_value)
-                    if type(param_value) == time:
-                        return localization.time.time(param_value)
-
-                if type(param_value) == tuple or type(param_value) == dict:
-                    raise SentenceFillerError('Invalid param type %s found for "%s".' % (type(param_value), param))
-
-                return '%s' % params[param]
+        values = []
+
+        for segment in segments:
+            if not isinstance(segment, Param):
+                values.append(segment)
+                continue
+
+            param = segment.name
+            if param not in params:
+                raise SentenceFillerError('Param "%s" could not be replaced.' % param)
+
+            param_value = params[param]
+            # Format values to the correct format
+            if apply_localization:
+                if type(param_value) == int or type(param_value) == float:
+                    values.append(localization.number.number(param_value))
+                    continue
+                if type(param_value) == date:
+                    values.append(localization.time.date(param_value))
+                    continue
+                if type(param_value) == datetime:
+                    values.append(localization.time.datetime(param_value))
+                    continue
+                if type(param_value) == time:
+                    values.append(localization.time.time(param_value))
+                    continue
+
+            if type(param_value) == tuple or type(param_value) == dict:
+                raise SentenceFillerError('Invalid param type %s found for "%s".' % (type(param_value), param))
+
+            values.append('%s' % param_value)
+
+        return ''.join(values)
+
+    def _get_plural_function(self, locale):
+        """
+        Get the plural function of a locale
+        :param locale:  The locale
+        :type locale:   babel.core.Locale
+        :return:        The number of plurals and the function
+        :rtype:         tuple
+        """
 
-            raise SentenceFillerError('Param "%s" could not be replaced.' % param)
+        key = str(locale)
 
-        value = re.sub(param_regex, lambda param: fill_in_param(param.group(1)), value)
+        plural_function = self._plural_functions.get(key)
+        if plural_function is None:
+            nplurals, expression = get_plural(locale)
+            plural_function = self._plural_functions[key] = (nplurals, c2py(expression))
 
-        return value
+        return plural_function
 
     def _fill_in_plural_function(self, localization, args, options):
         """
@@ -138,11 +298,10 @@ class SentenceFiller(object):
         except ValueError:
             raise SentenceFillerError('Plural-function argument was not an integer.')
 
-        npurals, expression = get_plural(localization.locale)
+        npurals, func = self._get_plural_function(localization.locale)
         if npurals != len(options):
             raise SentenceFillerError('Plural-function requires exactly %i options for locale %s.' % (npurals, localization.locale))
 
-        func = c2py(expression)
         result = func(count)
 
         return options[result]
@@ -1,6 +1,8 @@
 
 from edmunds.foundation.patterns.manager import Manager
+from edmunds.localization.translations.drivers.catalogtranslator import CatalogTranslator
 from edmunds.localization.translations.drivers.configtranslator import ConfigTranslator
+from edmunds.localization.translations.drivers.motranslator import MoTranslator
 from edmunds.localization.translations.sentencefiller import SentenceFiller
 
 
@@ -29,3 +31,38 @@ class TranslationsManager(Manager):
 
         sentence_filler = SentenceFiller()
         return ConfigTranslator(self._app, sentence_filler)
+
+    def _create_catalog_translator(self, config):
+        """
+        Create Catalog Translator
+        :param config:  The config
+        :type  config:  dict
+        :return:        Driver
+        :rtype:         edmunds.localization.translations.drivers.catalogtranslator.CatalogTranslator
+        """
+
+        sentence_filler = SentenceFiller()
+        return CatalogTranslator(self._app, sentence_filler)
+
+    def _create_mo_translator(self, config):
+        """
+        Create Mo Translator
+        :param config:  The config
+        :type  config:  dict
+        :return:        Driver
+        :rtype:         edmunds.localization.translations.drivers.motranslator.MoTranslator
+        """
+
+        options = {}
+
+        if 'directory' in config:
+            options['directory'] = config['directory']
+        if 'domain' in config:
+            options['domain'] = config['domain']
+        if 'storage' in config:
+            options['storage'] = config['storage']
+        if 'locales' in config:
+            options['locales'] = config['locales']
+
+        sentence_filler = SentenceFiller()
+        return MoTranslator(self._app, sentence_filler, **options)
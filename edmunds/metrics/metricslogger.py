@@ -0,0 +1,65 @@
+from threading import Event, Thread
+import sys
+
+
+class MetricsLogger(object):
+    """
+    Metrics Logger
+    Periodically logs the metrics to the application logger
+    in a background thread.
+    """
+
+    def __init__(self, app, registry, interval=60):
+        """
+        Initiate the instance
+        :param app:         The application
+        :type  app:         edmunds.application.Application
+        :param registry:    The metrics registry
+        :type  registry:    edmunds.metrics.registry.Registry
+        :param interval:    The interval in seconds
+        :type  interval:    int
+        """
+
+        self._app = app
+        self._registry = registry
+        self._interval = interval
+        self._stopped = Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Start logging
+        """
+
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stopped.clear()
+        self._thread = Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop logging
+        """
+
+        self._stopped.set()
+
+    def log(self):
+        """
+        Log the metrics
+        """
+
+        self._app.logger.info('Metrics:\n%s' % self._registry.render())
+
+    def _run(self):
+        """
+        Log the metrics every interval until stopped
+        """
+
+        while not self._stopped.wait(self._interval):
+            try:
+                self.log()
+            except Exception as e:
+                self._app.logger.error(e, exc_info=sys.exc_info())
@@ -0,0 +1,53 @@
+from timeit import default_timer
+
+
+class MeteredRequestMiddleware(object):
+    """
+    Metered Request Middleware
+    Wraps request middleware to record the time
+    spent in its before and after.
+    """
+
+    def __init__(self, middleware, registry, endpoint):
+        """
+        Initiate the instance
+        :param middleware:  The request middleware
+        :type  middleware:  edmunds.http.requestmiddleware.RequestMiddleware
+        :param registry:    The metrics registry
+        :type  registry:    edmunds.metrics.registry.Registry
+        :param endpoint:    The endpoint of the route
+        :type  endpoint:    str
+        """
+
+        self._middleware = middleware
+        self._registry = registry
+
+        labels = (('endpoint', endpoint), ('middleware', middleware.__class__.__name__))
+        self._before_labels = labels + (('phase', 'before'),)
+        self._after_labels = labels + (('phase', 'after'),)
+
+    def before(self, *args, **kwargs):
+        """
+        Handle before the request
+        """
+
+        start = default_timer()
+        try:
+            return self._middleware.before(*args, **kwargs)
+        finally:
+            self._registry.observe('edmunds_middleware_duration_seconds', default_timer() - start, self._before_labels)
+
+    def after(self, response, *args, **kwargs):
+        """
+        Handle after the request
+        :param response:    The request response
+        :type  response:    Request
+        :return:            The request response
+        :rtype:             Request
+        """
+
+        start = default_timer()
+        try:
+            return self._middleware.after(response, *args, **kwargs)
+        finally:
+            self._registry.observe('edmunds_middleware_duration_seconds', default_timer() - start, self._after_labels)
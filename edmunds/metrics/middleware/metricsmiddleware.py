@@ -0,0 +1,48 @@
+from edmunds.foundation.applicationmiddleware import ApplicationMiddleware
+from timeit import default_timer
+
+
+class MetricsMiddleware(ApplicationMiddleware):
+    """
+    Metrics Middleware
+    Records the number and duration of requests.
+    The duration is measured until the application returns
+    the response, streaming the body is not included.
+    """
+
+    def __init__(self, app):
+        """
+        Initialize the application
+        :param app:     The application
+        :type  app:     Application
+        """
+
+        super(MetricsMiddleware, self).__init__(app)
+
+        self._registry = self.app.metrics()
+
+    def handle(self, environment, start_response):
+        """
+        Handle the middleware
+        :param environment:     The environment
+        :type  environment:     Environment
+        :param start_response:  The application
+        :type  start_response:  flask.Response
+        :return:                The response
+        :rtype:                 iterable
+        """
+
+        statuses = []
+
+        def metered_start_response(status, headers, exc_info=None):
+            statuses.append(status.split(' ', 1)[0])
+            return start_response(status, headers, exc_info)
+
+        start = default_timer()
+        try:
+            return self.wsgi_app(environment, metered_start_response)
+        finally:
+            method = environment.get('REQUEST_METHOD', '')
+            status = statuses[-1] if statuses else '500'
+            self._registry.observe('edmunds_http_request_duration_seconds', default_timer() - start, (('method', method),))
+            self._registry.inc('edmunds_http_requests_total', (('method', method), ('status', status)))
@@ -0,0 +1,64 @@
+from edmunds.support.serviceprovider import ServiceProvider
+from edmunds.metrics.registry import Registry
+from edmunds.metrics.metricslogger import MetricsLogger
+from edmunds.metrics.middleware.metricsmiddleware import MetricsMiddleware
+from edmunds.globals import abort, request
+
+
+class MetricsServiceProvider(ServiceProvider):
+    """
+    Metrics Service Provider
+    """
+
+    descriptions = {
+        'edmunds_http_requests_total': 'Number of requests by method and status.',
+        'edmunds_http_request_duration_seconds': 'Duration of requests until the response is returned.',
+        'edmunds_route_duration_seconds': 'Duration of handling a route, including middleware.',
+        'edmunds_controller_duration_seconds': 'Duration of the controller of a route.',
+        'edmunds_middleware_duration_seconds': 'Duration of the before and after of request middleware.',
+        'edmunds_cache_hits_total': 'Number of cache lookups that found a value.',
+        'edmunds_cache_misses_total': 'Number of cache lookups that found no value.',
+        'edmunds_database_sessions_total': 'Number of database sessions created.',
+        'edmunds_database_pool_checkout_seconds': 'Time waited for a pooled database connection.',
+        'edmunds_database_pool_timeouts_total': 'Number of pooled connection checkouts that timed out.',
+        'edmunds_translations_total': 'Number of translation lookups.',
+        'edmunds_translation_fallbacks_total': 'Number of translation lookups that used the fallback locale.',
+    }
+
+    def register(self):
+        """
+        Register the service provider
+        """
+
+        # Enabled?
+        if not self.app.config('app.metrics.enabled', False):
+            return
+
+        config = self.app.config('app.metrics', {})
+
+        registry = Registry(buckets=config.get('buckets'))
+        for name in self.descriptions:
+            registry.describe(name, self.descriptions[name])
+
+        # Assign to extensions
+        self.app.extensions['edmunds.metrics'] = registry
+
+        self.app.middleware(MetricsMiddleware)
+
+        # Pull endpoint, only when configured as it exposes internals
+        rule = config.get('endpoint')
+        if rule:
+            allowed_ips = config.get('endpoint_allowed_ips')
+
+            def metrics():
+                if allowed_ips is not None and request.remote_addr not in allowed_ips:
+                    abort(403)
+                return self.app.response_class(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+            self.app.route(rule, endpoint='edmunds.metrics')(metrics)
+
+        # Periodic log
+        log_interval = config.get('log_interval')
+        if log_interval:
+            metrics_logger = MetricsLogger(self.app, registry, interval=log_interval)
+            self.app.extensions['edmunds.metrics.logger'] = metrics_logger
+            self.app.before_first_request(metrics_logger.start)
@@ -0,0 +1,243 @@
+from bisect import bisect_left
+from threading import Lock, current_thread, local
+
+
+class Registry(object):
+    """
+    Metrics Registry
+    Counters and histograms are recorded in a shard per thread,
+    so recording does not take a lock. The shards are merged
+    when the metrics are collected. Shards of finished threads
+    are folded in periodically so short-lived threads do not
+    accumulate when metrics are never collected.
+    """
+
+    # Number of registered shards between folding in finished threads
+    fold_interval = 64
+
+    # Logarithmic buckets with linear sub-buckets from 10us to 100s
+    default_buckets = tuple(float('%de%d' % (mantissa, exponent))
+                            for exponent in range(-5, 2)
+                            for mantissa in range(1, 10)) + (100.0,)
+
+    def __init__(self, buckets=None):
+        """
+        Initiate the instance
+        :param buckets: The upper bounds of the histogram buckets
+        :type  buckets: list
+        """
+
+        self.buckets = tuple(sorted(buckets)) if buckets else self.default_buckets
+
+        self._local = local()
+        self._lock = Lock()
+        self._shards = []
+        self._registered = 0
+        self._merged = ({}, {})
+        self._descriptions = {}
+
+    def describe(self, name, description):
+        """
+        Describe a metric
+        :param name:        The name of the metric
+        :type  name:        str
+        :param description: The description
+        :type  description: str
+        """
+
+        self._descriptions[name] = description
+
+    def inc(self, name, labels=(), value=1):
+        """
+        Increment a counter
+        :param name:    The name of the counter
+        :type  name:    str
+        :param labels:  The labels as (name, value)-pairs
+        :type  labels:  tuple
+        :param value:   The value to add
+        :type  value:   int
+        """
+
+        counters = self._get_shard()[0]
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=()):
+        """
+        Observe a value in a histogram
+        :param name:    The name of the histogram
+        :type  name:    str
+        :param value:   The value
+        :type  value:   float
+        :param labels:  The labels as (name, value)-pairs
+        :type  labels:  tuple
+        """
+
+        histograms = self._get_shard()[1]
+        key = (name, labels)
+        histogram = histograms.get(key)
+        if histogram is None:
+            # A count per bucket, +Inf and the sum
+            histogram = histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        histogram[bisect_left(self.buckets, value)] += 1
+        histogram[-1] += value
+
+    def collect(self):
+        """
+        Collect the metrics of all threads
+        :return:    The counters and the histograms
+        :rtype:     tuple
+        """
+
+        with self._lock:
+            self._fold()
+
+            collected = ({}, {})
+            self._merge(collected, self._merged)
+            for thread, shard in self._shards:
+                self._merge(collected, shard)
+
+        return collected
+
+    def render(self):
+        """
+        Render the metrics in the Prometheus text format
+        :return:    The metrics
+        :rtype:     str
+        """
+
+        counters, histograms = self.collect()
+
+        lines = []
+
+        for name, metrics in self._group(counters):
+            lines.extend(self._render_description(name, 'counter'))
+            for labels, value in metrics:
+                lines.append('%s%s %s' % (name, self._render_labels(labels), value))
+
+        for name, metrics in self._group(histograms):
+            lines.extend(self._render_description(name, 'histogram'))
+            for labels, histogram in metrics:
+                count = 0
+                for index, upper_bound in enumerate(self.buckets):
+                    count += histogram[index]
+                    bucket_labels = labels + (('le', repr(upper_bound)),)
+                    lines.append('%s_bucket%s %d' % (name, self._render_labels(bucket_labels), count))
+                count += histogram[-2]
+                bucket_labels = labels + (('le', '+Inf'),)
+                lines.append('%s_bucket%s %d' % (name, self._render_labels(bucket_labels), count))
+                lines.append('%s_sum%s %r' % (name, self._render_labels(labels), histogram[-1]))
+                lines.append('%s_count%s %d' % (name, self._render_labels(labels), count))
+
+        return '\n'.join(lines) + '\n'
+
+    def _get_shard(self):
+        """
+        Get the shard of the current thread
+        :return:    The counters and histograms of the thread
+        :rtype:     tuple
+        """
+
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = ({}, {})
+            with self._lock:
+                self._shards.append((current_thread(), shard))
+                self._registered += 1
+                if self._registered % self.fold_interval == 0:
+                    self._fold()
+            self._local.shard = shard
+            return shard
+
+    def _fold(self):
+        """
+        Merge the shards of finished threads once.
+        The lock must be held.
+        """
+
+        alive_shards = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive_shards.append((thread, shard))
+            else:
+                self._merge(self._merged, shard)
+        self._shards = alive_shards
+
+    def _merge(self, target, shard):
+        """
+        Merge a shard into the target
+        :param target:  The target counters and histograms
+        :type  target:  tuple
+        :param shard:   The shard
+        :type  shard:   tuple
+        """
+
+        target_counters, target_histograms = target
+        counters, histograms = shard
+
+        # Copying the items is atomic, the thread keeps recording
+        for key, value in list(counters.items()):
+            target_counters[key] = target_counters.get(key, 0) + value
+
+        for key, histogram in list(histograms.items()):
+            histogram = list(histogram)
+            target_histogram = target_histograms.get(key)
+            if target_histogram is None:
+                target_histograms[key] = histogram
+            else:
+                target_histograms[key] = [total + value for total, value in zip(target_histogram, histogram)]
+
+    def _group(self, metrics):
+        """
+        Group the metrics by name
+        :param metrics: The metrics by name and labels
+        :type  metrics: dict
+        :return:        The name and the labels and values per metric
+        :rtype:         list
+        """
+
+        groups = {}
+        for (name, labels), value in metrics.items():
+            groups.setdefault(name, []).append((labels, value))
+
+        return [(name, sorted(groups[name], key=lambda item: item[0])) for name in sorted(groups)]
+
+    def _render_description(self, name, metric_type):
+        """
+        Render the description of a metric
+        :param name:        The name of the metric
+        :type  name:        str
+        :param metric_type: The type of the metric
+        :type  metric_type: str
+        :return:            The lines
+        :rtype:             list
+        """
+
+        lines = []
+
+        description = self._descriptions.get(name)
+        if description is not None:
+            lines.append('# HELP %s %s' % (name, description))
+        lines.append('# TYPE %s %s' % (name, metric_type))
+
+        return lines
+
+    def _render_labels(self, labels):
+        """
+        Render labels
+        :param labels:  The labels as (name, value)-pairs
+        :type  labels:  tuple
+        :return:        The rendered labels
+        :rtype:         str
+        """
+
+        if not labels:
+            return ''
+
+        rendered = []
+        for name, value in labels:
+            value = ('%s' % value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            rendered.append('%s="%s"' % (name, value))
+
+        return '{%s}' % ','.join(rendered)
@@ -0,0 +1,202 @@
+from edmunds.profiler.drivers.basedriver import BaseDriver
+from pyprof2calltree import CalltreeConverter
+from pstats import Stats
+from threading import Lock, Timer
+from werkzeug.exceptions import HTTPException
+import atexit
+import datetime
+import os
+import re
+try:
+    from cStringIO import StringIO
+except ImportError:  # pragma: no cover
+    from io import StringIO
+
+
+class Aggregate(BaseDriver):
+    """
+    Aggregate driver
+    Merges the profiles per endpoint over a window of time.
+    At the end of every window the combined profile (in CallGraph-format)
+    and a report of the top hotspots are written per endpoint.
+    A timer writes the window when no request ends it, and the
+    current window is written when the process exits.
+    """
+
+    _unsafe_characters = re.compile(r'[^A-Za-z0-9_.-]+')
+
+    def __init__(self, app, profile_path, prefix='', suffix='', window=300, top=20, sort_by=('cumulative', 'time')):
+        """
+        Initiate the instance
+        :param app:             The application
+        :type  app:             Application
+        :param profile_path:    The profile path
+        :type  profile_path:    str
+        :param prefix:          The prefix for storing
+        :type  prefix:          str
+        :param suffix:          The suffix for storing
+        :type  suffix:          str
+        :param window:          The window in seconds
+        :type  window:          int
+        :param top:             The number of hotspots in the report
+        :type  top:             int
+        :param sort_by:         Sort the hotspots by
+        :type  sort_by:         tuple
+        """
+
+        super(Aggregate, self).__init__(app)
+
+        self._profile_path = profile_path
+        self._prefix = prefix
+        self._suffix = suffix
+        self._window = window
+        self._top = top
+        self._sort_by = sort_by
+
+        self._lock = Lock()
+        self._window_start = None
+        self._endpoints = {}
+        self._timer = None
+
+        atexit.register(self.flush)
+
+    def process(self, profiler, start, end, environment, suggestive_file_name):
+        """
+        Process the results
+        :param profiler:                The profiler
+        :type  profiler:                cProfile.Profile
+        :param start:                   Start of profiling
+        :type start:                    int
+        :param end:                     End of profiling
+        :type end:                      int
+        :param environment:             The environment
+        :type  environment:             Environment
+        :param suggestive_file_name:    A suggestive file name
+        :type  suggestive_file_name:    str
+        """
+
+        endpoint = self._get_endpoint(environment)
+        # Convert the profile outside the lock
+        stats = Stats(profiler, stream=StringIO())
+
+        with self._lock:
+            if self._window_start is None:
+                self._window_start = start
+                self._start_timer(start)
+
+            if endpoint in self._endpoints:
+                aggregated_stats, requests, duration = self._endpoints[endpoint]
+                aggregated_stats.add(stats)
+                self._endpoints[endpoint] = (aggregated_stats, requests + 1, duration + end - start)
+            else:
+                self._endpoints[endpoint] = (stats, 1, end - start)
+
+            if end - self._window_start < self._window:
+                return
+            window_start, endpoints = self._reset()
+
+        self._write(window_start, endpoints)
+
+    def flush(self):
+        """
+        Write the profiles of the current window
+        """
+
+        with self._lock:
+            window_start, endpoints = self._reset()
+
+        if endpoints:
+            self._write(window_start, endpoints)
+
+    def _start_timer(self, window_start):
+        """
+        Start the timer writing the window. Requires the lock to be acquired.
+        :param window_start:    The start of the window
+        :type  window_start:    float
+        """
+
+        self._timer = Timer(self._window, self._flush_window, [window_start])
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_window(self, window_start):
+        """
+        Write the profiles of the window when it is still current
+        :param window_start:    The start of the window
+        :type  window_start:    float
+        """
+
+        with self._lock:
+            if self._window_start != window_start:
+                return
+            window_start, endpoints = self._reset()
+
+        if endpoints:
+            self._write(window_start, endpoints)
+
+    def _reset(self):
+        """
+        Start a new window. Requires the lock to be acquired.
+        :return:    The start and profiles of the previous window
+        :rtype:     tuple
+        """
+
+        window_start, endpoints = self._window_start, self._endpoints
+        self._window_start = None
+        self._endpoints = {}
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        return window_start, endpoints
+
+    def _write(self, window_start, endpoints):
+        """
+        Write the combined profiles and reports
+        :param window_start:    The start of the window
+        :type  window_start:    float
+        :param endpoints:       The stats, requests and duration per endpoint
+        :type  endpoints:       dict
+        """
+
+        window_name = datetime.datetime.fromtimestamp(window_start).strftime('%Y_%m_%d.%H_%M_%S')
+
+        for endpoint, (stats, requests, duration) in endpoints.items():
+            filename = '%s%s.%s' % (self._prefix, window_name, self._unsafe_characters.sub('_', endpoint))
+            filepath = os.path.join(self._profile_path, filename)
+
+            # Combined profile
+            converter = CalltreeConverter(stats)
+            f = self._app.fs().write_stream(filepath + '.prof' + self._suffix)
+            try:
+                converter.output(f)
+            finally:
+                f.close()
+
+            # Hotspots report
+            f = self._app.fs().write_stream(filepath + '.txt' + self._suffix)
+            try:
+                f.write('ENDPOINT: %s\n' % endpoint)
+                f.write('REQUESTS: %d\n' % requests)
+                f.write('AVERAGE DURATION: %.6f\n' % (duration / requests))
+                stats.stream = f
+                stats.sort_stats(*self._sort_by)
+                stats.print_stats(self._top)
+            finally:
+                f.close()
+
+    def _get_endpoint(self, environment):
+        """
+        Get the endpoint of the request
+        :param environment:     The environment
+        :type  environment:     Environment
+        :return:                The endpoint
+        :rtype:                 str
+        """
+
+        try:
+            endpoint, _ = self._app.url_map.bind_to_environ(environment).match()
+        except HTTPException:
+            endpoint = 'unmatched'
+
+        return endpoint
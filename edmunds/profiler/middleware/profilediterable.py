@@ -0,0 +1,69 @@
+
+class ProfiledIterable(object):
+    """
+    Profiled Iterable
+    Streams the wrapped WSGI-iterable through unchanged while
+    profiling the production of every chunk. Profiling stops
+    when the iterable is closed by the server.
+    """
+
+    def __init__(self, iterable, profiler, on_close):
+        """
+        Initiate the instance
+        :param iterable:    The WSGI-iterable
+        :type  iterable:    iterable
+        :param profiler:    The enabled profiler
+        :type  profiler:    cProfile.Profile
+        :param on_close:    Called when the iterable is closed
+        :type  on_close:    callable
+        """
+
+        self._iterable = iterable
+        self._profiler = profiler
+        self._on_close = on_close
+        self._iterator = None
+        self._closed = False
+
+    def __iter__(self):
+        """
+        Get the iterator
+        :return:    The iterator
+        :rtype:     ProfiledIterable
+        """
+
+        return self
+
+    def __next__(self):
+        """
+        Get the next chunk
+        :return:    The chunk
+        :rtype:     bytes
+        """
+
+        self._profiler.enable()
+        try:
+            if self._iterator is None:
+                self._iterator = iter(self._iterable)
+            return next(self._iterator)
+        finally:
+            self._profiler.disable()
+
+    next = __next__
+
+    def close(self):
+        """
+        Close the wrapped iterable, stop profiling and
+        process the profile.
+        """
+
+        if self._closed:
+            return
+        self._closed = True
+
+        self._profiler.enable()
+        try:
+            if hasattr(self._iterable, 'close'):
+                self._iterable.close()
+        finally:
+            self._profiler.disable()
+            self._on_close()
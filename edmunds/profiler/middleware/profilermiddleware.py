@@ -1,7 +1,14 @@
 
 from edmunds.foundation.applicationmiddleware import ApplicationMiddleware
 from edmunds.profiler.profilermanager import ProfilerManager
+from edmunds.profiler.middleware.profilediterable import ProfiledIterable
+from edmunds.profiler.samplingprofiler import SamplingProfiler
+from edmunds.profiler.profiledata import ProfileData
+from edmunds.profiler.profilerworker import ProfilerWorker
 from cProfile import Profile
+from werkzeug.http import parse_cookie
+import hmac
+import random
 import time
 import datetime
 
@@ -9,6 +16,10 @@ import datetime
 class ProfilerMiddleware(ApplicationMiddleware):
     """
     Profiler Middleware
+    Requests are profiled when they match the path allowlist and
+    are triggered by a header or cookie, or are part of the sample.
+    Profiles of requests faster than the slow threshold are dropped.
+    Profiles are processed during the request or in a background worker.
     """
 
     def __init__(self, app):
@@ -22,59 +33,161 @@ class ProfilerMiddleware(ApplicationMiddleware):
 
         self._manager = ProfilerManager(self.app)
 
+        self._mode = self.app.config('app.profiler.mode', 'cprofile')
+        if self._mode not in ('cprofile', 'sampling'):
+            raise RuntimeError('Unknown profiler mode "%s" (use "cprofile" or "sampling").' % self._mode)
+        self._sampling_interval = self.app.config('app.profiler.samplinginterval', 0.005)
+        self._sample_rate = self.app.config('app.profiler.samplerate', 1.0)
+        self._paths = tuple(self.app.config('app.profiler.paths', ()))
+        self._slow_threshold = self.app.config('app.profiler.slowthreshold', 0)
+
+        trigger_header = self.app.config('app.profiler.trigger.header', None)
+        self._trigger_header = None
+        if trigger_header is not None:
+            self._trigger_header = 'HTTP_%s' % trigger_header.upper().replace('-', '_')
+        self._trigger_cookie = self.app.config('app.profiler.trigger.cookie', None)
+        self._trigger_value = self.app.config('app.profiler.trigger.value', None)
+        # Anyone could profile (and slow down) requests without a secret
+        if (trigger_header is not None or self._trigger_cookie is not None) and not self._trigger_value:
+            raise RuntimeError('Profiler trigger is missing a value (set "app.profiler.trigger.value").')
+
+        self._worker = None
+        if self.app.config('app.profiler.background', False):
+            self._worker = ProfilerWorker(self.app, self._process,
+                                          queue_size=self.app.config('app.profiler.queuesize', 100),
+                                          drop_policy=self.app.config('app.profiler.droppolicy', 'newest'))
+
     def handle(self, environment, start_response):
         """
         Handle the middleware
+        The response is streamed through unchanged. Profiling
+        stops and the profile is processed when the server
+        closes the response.
         :param environment:     The environment
         :type  environment:     Environment
         :param start_response:  The application
         :type  start_response:  flask.Response
+        :return:                The (profiled) response
+        :rtype:                 iterable
         """
 
-        # Get and run app through profiler
-        profiler, start, end, body = self._get_profiler_and_return(environment, start_response)
+        triggered = self._is_triggered(environment)
+        if not triggered and not self._is_sampled(environment):
+            return self.wsgi_app(environment, start_response)
 
-        # Compose suggestive file name
-        suggestive_file_name = '%s.%s.%s.prof' % (
-                                    datetime.datetime.fromtimestamp(start).strftime('%Y_%m_%d.%H_%M_%S'),
-                                    environment['REQUEST_METHOD'],
-                                    environment.get('PATH_INFO').strip(
-                                        '/').replace('/', '.') or 'root'
-                                 )
+        profiler = self._create_profiler()
+        start = time.time()
 
-        # Process profiler with every profiling instance
-        for instance in self._manager.all():
-            instance.process(profiler, start, end, environment, suggestive_file_name)
+        profiler.enable()
+        try:
+            appiter = self.wsgi_app(environment, start_response)
+        finally:
+            profiler.disable()
+
+        def on_close():
+            end = time.time()
+            if not triggered and end - start < self._slow_threshold:
+                return
+            if self._worker is None:
+                self._process(profiler, start, end, environment)
+            else:
+                # Only collecting the raw data happens during the request
+                self._worker.submit(ProfileData(profiler.getstats()), start, end, dict(environment))
+
+        return ProfiledIterable(appiter, profiler, on_close)
+
+    def _is_triggered(self, environment):
+        """
+        Check if profiling is triggered by a header or cookie
+        :param environment:     The environment
+        :type  environment:     Environment
+        :return:                Triggered
+        :rtype:                 bool
+        """
 
-        return [body]
+        if not self._is_allowed_path(environment):
+            return False
 
-    def _get_profiler_and_return(self, environment, start_response):
+        values = []
+        if self._trigger_header is not None:
+            values.append(environment.get(self._trigger_header))
+        if self._trigger_cookie is not None:
+            values.append(parse_cookie(environment).get(self._trigger_cookie))
+
+        for value in values:
+            # Compare in constant time to not leak the secret
+            if value is not None and hmac.compare_digest(self._encode(value), self._encode(self._trigger_value)):
+                return True
+        return False
+
+    def _encode(self, value):
         """
-        Handle the middleware
+        Encode the value for comparison
+        :param value:   The value
+        :type  value:   str
+        :return:        The encoded value
+        :rtype:         bytes
+        """
+
+        if isinstance(value, bytes):
+            return value
+        return value.encode('utf-8')
+
+    def _is_sampled(self, environment):
+        """
+        Check if the request is part of the sample
         :param environment:     The environment
         :type  environment:     Environment
-        :param start_response:  The application
-        :type  start_response:  flask.Response
-        :return:                Profiler, start, end, and body
-        :rtype:                 tuple
+        :return:                Sampled
+        :rtype:                 bool
         """
 
-        response_body = []
+        if self._sample_rate <= 0 or not self._is_allowed_path(environment):
+            return False
+        return self._sample_rate >= 1 or random.random() < self._sample_rate
 
-        def catching_start_response(status, headers, exc_info=None):
-            start_response(status, headers, exc_info)
-            return response_body.append
+    def _is_allowed_path(self, environment):
+        """
+        Check if the path is in the allowlist
+        :param environment:     The environment
+        :type  environment:     Environment
+        :return:                Allowed
+        :rtype:                 bool
+        """
 
-        def runapp():
-            appiter = self.wsgi_app(environment, catching_start_response)
-            response_body.extend(appiter)
-            if hasattr(appiter, 'close'):
-                appiter.close()
+        return not self._paths or environment.get('PATH_INFO', '').startswith(self._paths)
 
-        p = Profile()
-        start = time.time()
-        p.runcall(runapp)
-        body = b''.join(response_body)
-        end = time.time()
+    def _create_profiler(self):
+        """
+        Create a profiler for the configured mode
+        :return:    The profiler
+        :rtype:     cProfile.Profile|SamplingProfiler
+        """
+
+        if self._mode == 'sampling':
+            return SamplingProfiler(interval=self._sampling_interval)
+        return Profile()
 
-        return (p, start, end, body)
+    def _process(self, profiler, start, end, environment):
+        """
+        Process the profile with every profiling instance
+        :param profiler:        The profiler
+        :type  profiler:        cProfile.Profile
+        :param start:           Start of profiling
+        :type  start:           float
+        :param end:             End of profiling
+        :type  end:             float
+        :param environment:     The environment
+        :type  environment:     Environment
+        """
+
+        # Compose suggestive file name
+        suggestive_file_name = '%s.%s.%s.prof' % (
+                                    datetime.datetime.fromtimestamp(start).strftime('%Y_%m_%d.%H_%M_%S'),
+                                    environment['REQUEST_METHOD'],
+                                    environment.get('PATH_INFO').strip(
+                                        '/').replace('/', '.') or 'root'
+                                 )
+
+        for instance in self._manager.all():
+            instance.process(profiler, start, end, environment, suggestive_file_name)
@@ -0,0 +1,30 @@
+from cProfile import Profile
+
+
+class ProfileData(Profile):
+    """
+    Profile Data
+    Holds the raw entries of a stopped profiler so they can be
+    processed later. It has the interface of cProfile.Profile so
+    the entries can be processed by the profiler drivers.
+    """
+
+    def __init__(self, entries):
+        """
+        Initiate the instance
+        :param entries:     The entries as returned by getstats()
+        :type  entries:     list
+        """
+
+        super(ProfileData, self).__init__()
+
+        self._entries = entries
+
+    def getstats(self):
+        """
+        Get the entries
+        :return:    The entries
+        :rtype:     list
+        """
+
+        return self._entries
@@ -1,5 +1,6 @@
 
 from edmunds.foundation.patterns.manager import Manager
+from edmunds.profiler.drivers.aggregate import Aggregate
 from edmunds.profiler.drivers.blackfireio import BlackfireIo
 from edmunds.profiler.drivers.callgraph import CallGraph
 from edmunds.profiler.drivers.stream import Stream
@@ -95,3 +96,36 @@ class ProfilerManager(Manager):
             options['restrictions'] = config['restrictions']
 
         return Stream(self._app, **options)
+
+    def _create_aggregate(self, config):
+        """
+        Create Aggregate instance
+        :param config:  The config
+        :type  config:  dict
+        :return:        Aggregate instance
+        :rtype:         Aggregate
+        """
+
+        profile_path = self._profile_path
+        if 'directory' in config:
+            directory = config['directory']
+            # Check if absolute or relative path
+            if not directory.startswith(os.sep):
+                profile_path = os.path.join(profile_path, directory)
+            else:
+                profile_path = directory
+
+        options = {}
+
+        if 'prefix' in config:
+            options['prefix'] = config['prefix']
+        if 'name' in config:
+            options['suffix'] = '.%s' % config['name']
+        if 'window' in config:
+            options['window'] = config['window']
+        if 'top' in config:
+            options['top'] = config['top']
+        if 'sort_by' in config:
+            options['sort_by'] = config['sort_by']
+
+        return Aggregate(self._app, profile_path, **options)
@@ -0,0 +1,112 @@
+from threading import Lock, Thread
+import sys
+try:
+    from queue import Queue, Full, Empty
+except ImportError:  # pragma: no cover
+    from Queue import Queue, Full, Empty
+
+
+class ProfilerWorker(object):
+    """
+    Profiler Worker
+    Processes profiles in a background thread so the
+    profiler drivers do not run during the request.
+    Profiles are dropped when the queue is full.
+    """
+
+    def __init__(self, app, process, queue_size=100, drop_policy='newest'):
+        """
+        Initiate the instance
+        :param app:         The application
+        :type  app:         Edmunds.Application
+        :param process:     Processes a profile with the submitted arguments
+        :type  process:     callable
+        :param queue_size:  The maximum number of queued profiles
+        :type  queue_size:  int
+        :param drop_policy: Drop the 'newest' or 'oldest' profile when the queue is full
+        :type  drop_policy: str
+        """
+
+        if drop_policy not in ('newest', 'oldest'):
+            raise RuntimeError('Unknown drop policy "%s" (use "newest" or "oldest").' % drop_policy)
+
+        self._app = app
+        self._process = process
+        self._drop_policy = drop_policy
+        self._queue = Queue(maxsize=queue_size)
+        self._lock = Lock()
+        self._thread = None
+        self.dropped = 0
+
+    def submit(self, *args):
+        """
+        Submit a profile for processing
+        :param args:    The arguments to process the profile with
+        :return:        Whether the profile has been queued
+        :rtype:         bool
+        """
+
+        self._start_thread()
+
+        while True:
+            try:
+                self._queue.put_nowait(args)
+                return True
+            except Full:
+                pass
+
+            if self._drop_policy == 'newest':
+                self._drop()
+                return False
+
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self._drop()
+            except Empty:
+                pass
+
+    def join(self):
+        """
+        Wait until all queued profiles are processed
+        """
+
+        self._queue.join()
+
+    def _drop(self):
+        """
+        Count a dropped profile
+        """
+
+        with self._lock:
+            self.dropped += 1
+
+    def _start_thread(self):
+        """
+        Start the worker thread when it is not running
+        """
+
+        # A forked process does not inherit the thread
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run(self):
+        """
+        Process queued profiles until the process exits
+        """
+
+        while True:
+            args = self._queue.get()
+            try:
+                self._process(*args)
+            except Exception as e:
+                self._app.logger.error(e, exc_info=sys.exc_info())
+            finally:
+                self._queue.task_done()
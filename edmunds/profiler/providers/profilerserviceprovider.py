@@ -13,7 +13,10 @@ class ProfilerServiceProvider(ServiceProvider):
         Register the service provider
         """
 
-        if not self.app.debug or not self.app.config('app.profiler.enabled', False):
+        if not self.app.config('app.profiler.enabled', False):
+            return
+        # Profiling outside debug-mode has to be allowed explicitly
+        if not self.app.debug and self.app.config('app.profiler.debugonly', True):
             return
 
         self.app.middleware(ProfilerMiddleware)
@@ -0,0 +1,184 @@
+from collections import namedtuple
+from threading import Condition, Thread, current_thread
+import cProfile
+import sys
+import time
+
+
+ProfilerEntry = namedtuple('ProfilerEntry', ['code', 'callcount', 'reccallcount', 'totaltime', 'inlinetime', 'calls'])
+ProfilerSubentry = namedtuple('ProfilerSubentry', ['code', 'callcount', 'reccallcount', 'totaltime', 'inlinetime'])
+
+
+class SamplingProfiler(object):
+    """
+    Sampling Profiler
+    A statistical profiler that samples the stack of the profiled
+    thread every interval instead of tracing every call. One shared
+    background thread samples all enabled profilers.
+    It has the same interface as cProfile.Profile so the results
+    can be processed by the same drivers. Call counts are the
+    number of samples a function was seen in.
+    """
+
+    _condition = Condition()
+    _enabled_profilers = {}
+    _sampler_thread = None
+
+    def __init__(self, interval=0.005):
+        """
+        Initiate the instance
+        :param interval:    The interval between samples in seconds
+        :type  interval:    float
+        """
+
+        self.interval = interval
+        self.stats = {}
+        self._thread_id = None
+        self._samples = {}
+        self._last_sample = None
+
+    def enable(self):
+        """
+        Start sampling the current thread
+        """
+
+        self._thread_id = current_thread().ident
+
+        with self._condition:
+            self._last_sample = time.time()
+            self._enabled_profilers[self] = self._thread_id
+            self._start_sampler_thread()
+            self._condition.notify()
+
+    def disable(self):
+        """
+        Stop sampling
+        """
+
+        with self._condition:
+            self._enabled_profilers.pop(self, None)
+
+    def runcall(self, func, *args, **kwargs):
+        """
+        Sample a function call
+        :param func:    The function
+        :type  func:    callable
+        :return:        The return value of the function
+        """
+
+        self.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.disable()
+
+    def sample(self, frame, now):
+        """
+        Record a sample of the stack
+        :param frame:   The current frame of the profiled thread
+        :type  frame:   frame
+        :param now:     The time of the sample
+        :type  now:     float
+        """
+
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        stack = tuple(reversed(stack))
+
+        elapsed = now - self._last_sample
+        self._last_sample = now
+
+        weight = self._samples.get(stack)
+        self._samples[stack] = (weight[0] + 1, weight[1] + elapsed) if weight else (1, elapsed)
+
+    def getstats(self):
+        """
+        Get the results as cProfile.Profile.getstats() does
+        :return:    The entries
+        :rtype:     list
+        """
+
+        functions = {}
+        calls = {}
+
+        for stack, (count, elapsed) in self._samples.items():
+            seen = set()
+            for index, code in enumerate(stack):
+                function = functions.setdefault(code, [0, 0.0, 0.0])
+                if code not in seen:
+                    seen.add(code)
+                    function[0] += count
+                    function[1] += elapsed
+                if index == len(stack) - 1:
+                    function[2] += elapsed
+                else:
+                    call = calls.setdefault((code, stack[index + 1]), [0, 0.0, 0.0])
+                    call[0] += count
+                    call[1] += elapsed
+                    if index == len(stack) - 2:
+                        call[2] += elapsed
+
+        callees = {}
+        for (caller, callee), (count, totaltime, inlinetime) in calls.items():
+            callees.setdefault(caller, []).append(ProfilerSubentry(callee, count, 0, totaltime, inlinetime))
+
+        return [ProfilerEntry(code, count, 0, totaltime, inlinetime, callees.get(code, []))
+                for code, (count, totaltime, inlinetime) in functions.items()]
+
+    def create_stats(self):
+        """
+        Create the stats as cProfile.Profile.create_stats() does,
+        so the profiler can be loaded in pstats.Stats
+        """
+
+        self.disable()
+
+        entries = self.getstats()
+
+        self.stats = {}
+        for entry in entries:
+            self.stats[cProfile.label(entry.code)] = (entry.callcount, entry.callcount, entry.inlinetime, entry.totaltime, {})
+        for entry in entries:
+            caller = cProfile.label(entry.code)
+            for subentry in entry.calls:
+                callers = self.stats[cProfile.label(subentry.code)][4]
+                callers[caller] = (subentry.callcount, subentry.callcount, subentry.inlinetime, subentry.totaltime)
+
+    @classmethod
+    def _start_sampler_thread(cls):
+        """
+        Start the shared sampler thread when it is not running.
+        Requires the condition to be acquired.
+        """
+
+        # A forked process does not inherit the thread
+        if cls._sampler_thread is not None and cls._sampler_thread.is_alive():
+            return
+
+        cls._sampler_thread = Thread(target=cls._run_sampler)
+        cls._sampler_thread.daemon = True
+        cls._sampler_thread.start()
+
+    @classmethod
+    def _run_sampler(cls):
+        """
+        Sample the enabled profilers until the process exits
+        """
+
+        while True:
+            with cls._condition:
+                while not cls._enabled_profilers:
+                    cls._condition.wait()
+                interval = min(profiler.interval for profiler in cls._enabled_profilers)
+
+            time.sleep(interval)
+
+            with cls._condition:
+                frames = sys._current_frames()
+                now = time.time()
+                for profiler, thread_id in list(cls._enabled_profilers.items()):
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        profiler.sample(frame, now)
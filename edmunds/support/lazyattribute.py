@@ -0,0 +1,65 @@
+from threading import Lock
+
+
+class LazyAttribute(object):
+    """
+    Lazy Attribute
+    Loads the value on first access and stores it in a slot of the
+    instance. No lock is allocated per instance. Only instances that
+    are shared between threads need locked=True, which uses one lock
+    for all instances. A value of None is loaded again on next access.
+    """
+
+    def __init__(self, load, slot=None, locked=False):
+        """
+        Initiate the lazy attribute
+        :param load:    Function that loads the value for an instance
+        :type  load:    callable
+        :param slot:    Name of the slot the value is stored in, default: '_lazy_<name>'
+        :type  slot:    str
+        :param locked:  Load the value under a lock
+        :type  locked:  bool
+        """
+
+        self._load = load
+        self.slot = slot if slot is not None else '_lazy_%s' % load.__name__
+        self._lock = Lock() if locked else None
+        self.__doc__ = load.__doc__
+
+    def __get__(self, instance, owner):
+        """
+        Get the value
+        :param instance:    The instance
+        :param owner:       The class of the instance
+        :return:            The value
+        """
+
+        if instance is None:
+            return self
+
+        value = getattr(instance, self.slot, None)
+        if value is not None:
+            return value
+
+        if self._lock is None:
+            value = self._load(instance)
+            setattr(instance, self.slot, value)
+            return value
+
+        with self._lock:
+            value = getattr(instance, self.slot, None)
+            if value is not None:
+                return value
+
+            value = self._load(instance)
+            setattr(instance, self.slot, value)
+            return value
+
+    def __set__(self, instance, value):
+        """
+        Set the value
+        :param instance:    The instance
+        :param value:       The value
+        """
+
+        setattr(instance, self.slot, value)
@@ -0,0 +1,173 @@
+
+from tests.testcase import TestCase
+from edmunds.cache.drivers.file import File
+from edmunds.cache.drivers.memcached import Memcached
+from edmunds.cache.drivers.memory import Memory
+from edmunds.cache.drivers.redis import Redis
+from edmunds.cache.drivers.tiered import Tiered
+from edmunds.cache.concerns.remember import Remember
+from threading import Event, Thread
+from time import sleep
+import mock
+
+
+class TestRemember(TestCase):
+    """
+    Test the Remember
+    """
+
+    def test_drivers(self):
+        """
+        Test drivers can remember
+        """
+
+        for driver_class in [File, Memcached, Memory, Redis, Tiered]:
+            self.assert_true(issubclass(driver_class, Remember))
+
+    def test_remember(self):
+        """
+        Test remember
+        """
+
+        driver = Memory()
+        producer = mock.Mock(return_value='value')
+
+        self.assert_equal('value', driver.remember('key', 10, producer, beta=0))
+        self.assert_equal('value', driver.remember('key', 10, producer, beta=0))
+        self.assert_equal(1, producer.call_count)
+
+        # Default timeout and never expiring
+        self.assert_equal('value', driver.remember('default', None, producer, beta=0))
+        self.assert_equal('value', driver.remember('forever', 0, producer))
+        self.assert_equal(0, driver.get('forever')[1])
+        self.assert_equal(3, producer.call_count)
+
+        # None is remembered as well
+        producer = mock.Mock(return_value=None)
+        self.assert_is_none(driver.remember('none', 10, producer, beta=0))
+        self.assert_is_none(driver.remember('none', 10, producer, beta=0))
+        self.assert_equal(1, producer.call_count)
+
+    def test_expired(self):
+        """
+        Test expired value is produced again
+        """
+
+        driver = Memory()
+        producer = mock.Mock(side_effect=['value', 'new value'])
+
+        with mock.patch('edmunds.cache.concerns.remember.time', return_value=1000):
+            self.assert_equal('value', driver.remember('key', 10, producer, stale_timeout=5, beta=0))
+        with mock.patch('edmunds.cache.concerns.remember.time', return_value=1011):
+            self.assert_equal('new value', driver.remember('key', 10, producer, stale_timeout=5, beta=0))
+        self.assert_equal(2, producer.call_count)
+
+    def test_early_refresh(self):
+        """
+        Test probabilistic early refresh
+        """
+
+        driver = Memory()
+        producer = mock.Mock(side_effect=['value', 'new value'])
+
+        with mock.patch('edmunds.cache.concerns.remember.time', side_effect=[1000, 1002]):
+            self.assert_equal('value', driver.remember('key', 10, producer))
+        self.assert_equal(2, driver.get('key')[2])
+
+        # Far from expiry
+        with mock.patch('edmunds.cache.concerns.remember.time', return_value=1003), \
+                mock.patch('edmunds.cache.concerns.remember.random', return_value=0.5):
+            self.assert_equal('value', driver.remember('key', 10, producer))
+
+        # Nearing expiry with unlucky draw
+        with mock.patch('edmunds.cache.concerns.remember.time', return_value=1011), \
+                mock.patch('edmunds.cache.concerns.remember.random', return_value=0.9):
+            self.assert_equal('new value', driver.remember('key', 10, producer))
+        self.assert_equal(2, producer.call_count)
+
+    def test_single_flight(self):
+        """
+        Test only one thread produces the value
+        """
+
+        driver = Memory()
+        producing = Event()
+        release = Event()
+        calls = []
+
+        def producer():
+            calls.append(1)
+            producing.set()
+            release.wait(5)
+            return 'value'
+
+        results = []
+
+        def target():
+            results.append(driver.remember('key', 10, producer, beta=0))
+
+        def release_target():
+            producing.wait(5)
+            sleep(0.1)
+            release.set()
+
+        release_thread = Thread(target=release_target)
+        release_thread.start()
+        self.thread(target, count=20)
+        release_thread.join()
+
+        self.assert_equal(['value'] * 20, results)
+        self.assert_equal(1, len(calls))
+
+    def test_stale_while_revalidate(self):
+        """
+        Test stale value is served while another thread produces
+        """
+
+        driver = Memory()
+
+        with mock.patch('edmunds.cache.concerns.remember.time', return_value=1000):
+            driver.remember('key', 10, lambda: 'value', stale_timeout=30, beta=0)
+
+        results = []
+
+        def producer():
+            with mock.patch('edmunds.cache.concerns.remember.time', return_value=1015):
+                results.append(driver.remember('key', 10, lambda: 'other value', stale_timeout=30, beta=0))
+            return 'new value'
+
+        with mock.patch('edmunds.cache.concerns.remember.time', return_value=1015):
+            self.assert_equal('new value', driver.remember('key', 10, producer, stale_timeout=30, beta=0))
+        self.assert_equal(['value'], results)
+
+    def test_lock(self):
+        """
+        Test lock between processes
+        """
+
+        driver = Memory()
+        driver.remember_lock_interval = 0
+
+        # Stale value while locked by other process
+        with mock.patch('edmunds.cache.concerns.remember.time', return_value=1000):
+            driver.remember('key', 10, lambda: 'value', stale_timeout=30, beta=0)
+        driver.add('key:remember-lock', 1)
+        with mock.patch('edmunds.cache.concerns.remember.time', return_value=1015):
+            self.assert_equal('value', driver.remember('key', 10, lambda: 'new value', stale_timeout=30, lock_timeout=5, beta=0))
+
+        # Wait for value of other process
+        def wait(seconds):
+            driver.set('other', ('other value', 0, 0))
+
+        with mock.patch('edmunds.cache.concerns.remember.sleep', side_effect=wait):
+            driver.add('other:remember-lock', 1)
+            self.assert_equal('other value', driver.remember('other', 10, lambda: 'new value', lock_timeout=5))
+
+        # Produce anyway when lock is not released in time
+        driver.add('third:remember-lock', 1)
+        with mock.patch('edmunds.cache.concerns.remember.time', side_effect=[1000, 1001, 1006, 1006, 1006]):
+            self.assert_equal('new value', driver.remember('third', 10, lambda: 'new value', lock_timeout=5))
+
+        # Lock is released after producing
+        self.assert_equal('value', driver.remember('fourth', 10, lambda: 'value', lock_timeout=5))
+        self.assert_false(driver.has('fourth:remember-lock'))
@@ -0,0 +1,165 @@
+
+from tests.testcase import TestCase
+from edmunds.cache.drivers.file import File
+from edmunds.cache.drivers.memcached import Memcached
+from edmunds.cache.drivers.memory import Memory
+from edmunds.cache.drivers.redis import Redis
+from edmunds.cache.drivers.tiered import Tiered
+from edmunds.cache.concerns.tags import Tags
+from edmunds.cache.serializer import Serializer
+import mock
+
+
+class TestTags(TestCase):
+    """
+    Test the Tags
+    """
+
+    def test_drivers(self):
+        """
+        Test drivers support tags
+        """
+
+        for driver_class in [File, Memcached, Memory, Redis]:
+            self.assert_true(issubclass(driver_class, Tags))
+
+    def test_tags(self):
+        """
+        Test tags
+        """
+
+        serializer = Serializer(method='json')
+        for driver in [Memory(), File(self.temp_dir()), File(self.temp_dir(), serializer=serializer)]:
+            self.assert_true(driver.set('user', 'value', tags=['user.1']))
+            self.assert_true(driver.set('user_locale', 'value', tags=['user.1', 'locale.en']))
+            self.assert_true(driver.add('locale', 'value', tags=['locale.en']))
+            self.assert_true(driver.set_many({'other': 'value', 'other2': 'value'}, tags=['user.2']))
+            self.assert_true(driver.set('untagged', 'value'))
+
+            self.assert_equal('value', driver.get('user'))
+            self.assert_equal(['value', 'value', 'value', 'value', 'value'],
+                              driver.get_many('user', 'user_locale', 'locale', 'other', 'untagged'))
+
+            driver.invalidate_tags(['user.1'])
+
+            self.assert_is_none(driver.get('user'))
+            self.assert_equal([None, None, 'value', 'value', 'value'],
+                              driver.get_many('user', 'user_locale', 'locale', 'other', 'untagged'))
+
+            # Tagged again after invalidation
+            self.assert_true(driver.set('user', 'new value', tags=['user.1']))
+            self.assert_equal('new value', driver.get('user'))
+
+            driver.invalidate_tags(['locale.en', 'user.2'])
+            self.assert_equal(['new value', None, None, None, 'value'],
+                              driver.get_many('user', 'user_locale', 'locale', 'other', 'untagged'))
+
+    def test_evicted_generation(self):
+        """
+        Test values are invalid when the generation of a tag is gone
+        """
+
+        driver = Memory()
+
+        driver.set('key', 'value', tags=['tag'])
+        generation = driver.get('_tag.tag')
+        self.assert_is_not_none(generation)
+
+        driver.delete('_tag.tag')
+        self.assert_is_none(driver.get('key'))
+
+        # Generation starts at a random value, not 0 or 1
+        driver.set('key', 'value', tags=['tag'])
+        with mock.patch('edmunds.cache.concerns.tags.randint', return_value=12345):
+            driver.delete('_tag.tag')
+            driver.set('key', 'value', tags=['tag'])
+        self.assert_equal(12345, driver.get('_tag.tag'))
+        self.assert_equal('value', driver.get('key'))
+
+    def test_remember(self):
+        """
+        Test remember with tags
+        """
+
+        driver = Memory()
+        producer = mock.Mock(side_effect=['value', 'new value'])
+
+        self.assert_equal('value', driver.remember('key', 10, producer, beta=0, tags=['tag']))
+        self.assert_equal('value', driver.remember('key', 10, producer, beta=0, tags=['tag']))
+        driver.invalidate_tags(['tag'])
+        self.assert_equal('new value', driver.remember('key', 10, producer, beta=0, tags=['tag']))
+
+    def test_tiered(self):
+        """
+        Test tags in tiered
+        """
+
+        near = Memory()
+        remote = Memory()
+        driver = Tiered(near, remote)
+
+        driver.set('key', 'value', tags=['tag'])
+        driver.set_many({'key2': 'value'}, tags=['tag'])
+        driver.add('key3', 'value', tags=['tag'])
+        self.assert_equal(['value', 'value', 'value'], driver.get_many('key', 'key2', 'key3'))
+
+        driver.invalidate_tags(['tag'])
+        self.assert_equal([None, None, None], near.get_many('key', 'key2', 'key3'))
+        self.assert_equal([None, None, None], remote.get_many('key', 'key2', 'key3'))
+        self.assert_equal([None, None, None], driver.get_many('key', 'key2', 'key3'))
+
+        # Values filled from the remote cache are not tagged in the near cache
+        driver.set('key', 'value', tags=['tag'])
+        near.clear()
+        self.assert_equal('value', driver.get('key'))
+        self.assert_true(driver.has('key'))
+        driver.invalidate_tags(['tag'])
+        self.assert_is_none(driver.get('key'))
+        self.assert_false(driver.has('key'))
+
+        # Has checks the tags of the remote value
+        driver.set('key', 'value', tags=['tag'])
+        remote.invalidate_tags(['tag'])
+        near.clear()
+        self.assert_false(driver.has('key'))
+
+    def test_redis(self):
+        """
+        Test tags in redis fetch all generations at once
+        """
+
+        client = mock.MagicMock()
+        driver = Redis(host=client)
+
+        tagged_value = {'_tagged_value': 'value', '_tag_generations': {'tag': 5, 'tag2': 7}}
+        stored = {
+            'key': driver.dump_object(tagged_value),
+            'key2': driver.dump_object(tagged_value),
+            'key3': b'1',
+            '_tag.tag': b'5',
+            '_tag.tag2': b'7',
+        }
+        client.mget.side_effect = lambda keys: [stored.get(key) for key in keys]
+        self.assert_equal(['value', 'value', 1], driver.get_many('key', 'key2', 'key3'))
+        self.assert_equal(2, client.mget.call_count)
+        self.assert_equal(sorted(['_tag.tag', '_tag.tag2']), sorted(client.mget.call_args[0][0]))
+
+        # Invalidation increments generation
+        driver.invalidate_tags(['tag'])
+        client.incr.assert_called_once_with(name='_tag.tag', amount=1)
+
+    def test_memcached(self):
+        """
+        Test tags in memcached fetch all generations at once
+        """
+
+        client = mock.MagicMock()
+        driver = Memcached(servers=client)
+
+        tagged_value = {'_tagged_value': 'value', '_tag_generations': {'tag': 5}}
+        client.get_multi.side_effect = [
+            {'key': tagged_value, 'key2': dict(tagged_value, _tag_generations={'tag': 4})},
+            {'_tag.tag': 5},
+        ]
+        self.assert_equal(['value', None, None], driver.get_many('key', 'key2', 'key3'))
+        self.assert_equal(2, client.get_multi.call_count)
@@ -1,8 +1,12 @@
 
 from tests.testcase import TestCase
-from werkzeug.contrib.cache import FileSystemCache
+from werkzeug.contrib.cache import BaseCache
 from edmunds.cache.drivers.file import File
+from edmunds.cache.serializer import Serializer
+import mock
 import os
+import pickle
+from time import time
 
 
 class TestFile(TestCase):
@@ -66,6 +70,10 @@ class TestFile(TestCase):
             "               'threshold': 500,\n",
             "               'default_timeout': 300,\n",
             "               'mode': 0o600,\n",
+            "               'shard_depth': 1,\n",
+            "               'serializer': 'json',\n",
+            "               'compression': 'zlib',\n",
+            "               'compress_threshold': 2048,\n",
             "           }, \n",
             "           { \n",
             "               'name': 'file2',\n",
@@ -82,6 +90,239 @@ class TestFile(TestCase):
 
         driver = app.cache()
         self.assert_is_instance(driver, File)
-        self.assert_is_instance(driver, FileSystemCache)
+        self.assert_is_instance(driver, BaseCache)
+        self.assert_equal(1, driver._shard_depth)
+        self.assert_is_instance(driver.serializer, Serializer)
+        self.assert_equal('json', driver.serializer.method)
+        self.assert_equal('zlib', driver.serializer.compression)
+        self.assert_is_none(app.cache('file2').serializer)
 
         self.clear_paths.append(driver._path)
+
+    def test_get_set_delete(self):
+        """
+        Test get, set, add and delete
+        """
+
+        driver = File(self.temp_dir())
+
+        self.assert_is_none(driver.get('key'))
+        self.assert_false(driver.has('key'))
+        self.assert_true(driver.set('key', 'value'))
+        self.assert_true(driver.has('key'))
+        self.assert_equal('value', driver.get('key'))
+        self.assert_false(driver.add('key', 'other value'))
+        self.assert_equal('value', driver.get('key'))
+        self.assert_true(driver.add('key2', 'value2'))
+        self.assert_equal(['value', 'value2', None], driver.get_many('key', 'key2', 'key3'))
+
+        self.assert_true(driver.delete('key'))
+        self.assert_false(driver.delete('key'))
+        self.assert_is_none(driver.get('key'))
+
+        self.assert_true(driver.clear())
+        self.assert_is_none(driver.get('key2'))
+
+    def test_sharding(self):
+        """
+        Test entries are sharded over subdirectories
+        """
+
+        cache_dir = self.temp_dir()
+        driver = File(cache_dir, shard_depth=2)
+
+        driver.set('key', 'value')
+
+        key_hash = driver._get_hash('key')
+        filename = os.path.join(cache_dir, key_hash[0:2], key_hash[2:4], key_hash)
+        self.assert_equal(filename, driver._get_filename('key'))
+        self.assert_true(os.path.isfile(filename))
+
+        # No temporary files are left behind
+        self.assert_equal([key_hash], os.listdir(os.path.dirname(filename)))
+
+    def test_add(self):
+        """
+        Test add only succeeds for one writer
+        """
+
+        driver = File(self.temp_dir())
+
+        results = []
+
+        def target():
+            results.append(driver.add('key', 'value'))
+
+        self.thread(target, count=20)
+
+        self.assert_equal(1, results.count(True))
+
+        # Expired values can be replaced
+        driver.set('expired', 'value', timeout=10)
+        with mock.patch('edmunds.cache.drivers.file.time', return_value=time() + 20):
+            self.assert_true(driver.add('expired', 'new value'))
+        self.assert_equal('new value', driver.get('expired'))
+
+    def test_timeout(self):
+        """
+        Test timeout
+        """
+
+        driver = File(self.temp_dir(), default_timeout=10)
+
+        with mock.patch('edmunds.cache.drivers.file.time', return_value=1000):
+            driver.set('default', 'value')
+            driver.set('short', 'value', timeout=5)
+            driver.set('forever', 'value', timeout=0)
+
+        with mock.patch('edmunds.cache.drivers.file.time', return_value=1006):
+            self.assert_equal('value', driver.get('default'))
+            self.assert_is_none(driver.get('short'))
+            self.assert_false(driver.has('short'))
+            self.assert_equal('value', driver.get('forever'))
+
+        with mock.patch('edmunds.cache.drivers.file.time', return_value=100000):
+            self.assert_false(driver.has('default'))
+            self.assert_equal('value', driver.get('forever'))
+
+    def test_prune_expired(self):
+        """
+        Test pruning only visits expired buckets
+        """
+
+        cache_dir = self.temp_dir()
+        driver = File(cache_dir, threshold=0)
+
+        with mock.patch('edmunds.cache.drivers.file.time', return_value=1000):
+            driver.set('short', 'value', timeout=10)
+            driver.set('overwritten', 'value', timeout=10)
+            driver.set('overwritten', 'value', timeout=1000)
+            driver.set('long', 'value', timeout=1000)
+            driver.set('forever', 'value', timeout=0)
+
+        self.assert_equal(['16', '33', 'never'], sorted(os.listdir(driver._expiry_path)))
+
+        with mock.patch('edmunds.cache.drivers.file.time', return_value=1200):
+            driver.set('other', 'value', timeout=1000)
+            self.assert_false(os.path.exists(driver._get_filename('short')))
+            self.assert_true(driver.has('overwritten'))
+            self.assert_true(driver.has('long'))
+            self.assert_true(driver.has('forever'))
+
+        self.assert_equal(['33', '36', 'never'], sorted(os.listdir(driver._expiry_path)))
+
+        # Pruning is rate limited
+        with mock.patch('edmunds.cache.drivers.file.time', return_value=1300.5):
+            driver.set('other', 'value', timeout=0)
+        self.assert_equal(1301.5, driver._next_prune)
+        with mock.patch('edmunds.cache.drivers.file.time', return_value=1301), \
+                mock.patch('edmunds.cache.drivers.file.os.listdir') as listdir:
+            driver.set('other', 'value', timeout=0)
+            self.assert_false(listdir.called)
+
+    def test_threshold(self):
+        """
+        Test entries expiring first are evicted when over threshold
+        """
+
+        driver = File(self.temp_dir(), threshold=3)
+        driver._prune_interval = 0
+
+        with mock.patch('edmunds.cache.drivers.file.time', return_value=1000):
+            driver.set('first', 'value', timeout=10)
+            driver.set('second', 'value', timeout=100)
+            driver.set('third', 'value', timeout=0)
+            driver.set('fourth', 'value', timeout=200)
+            driver.set('fifth', 'value', timeout=300)
+
+        with mock.patch('edmunds.cache.drivers.file.time', return_value=1001):
+            self.assert_false(driver.has('first'))
+            self.assert_false(driver.has('second'))
+            self.assert_true(driver.has('third'))
+            self.assert_true(driver.has('fourth'))
+            self.assert_true(driver.has('fifth'))
+
+    def test_threshold_overwrites(self):
+        """
+        Test overwriting an entry does not count towards the threshold
+        """
+
+        driver = File(self.temp_dir(), threshold=50)
+        driver._prune_interval = 0
+
+        driver.set('b', 'value b')
+        for i in range(60):
+            driver.set('a', 'value a %d' % i)
+
+        self.assert_equal('value b', driver.get('b'))
+        self.assert_equal('value a 59', driver.get('a'))
+
+    def test_threshold_low_water(self):
+        """
+        Test compaction evicts down to the low-water mark
+        """
+
+        driver = File(self.temp_dir(), threshold=30)
+        driver._prune_interval = 0
+
+        with mock.patch.object(driver, '_compact', wraps=driver._compact) as compact:
+            for i in range(60):
+                driver.set('key%d' % i, 'value', timeout=i + 1)
+            self.assert_equal(3, compact.call_count)
+
+        self.assert_false(driver.has('key29'))
+        self.assert_true(driver.has('key30'))
+        self.assert_equal(30, len([i for i in range(60) if driver.has('key%d' % i)]))
+
+    def test_threshold_burst(self):
+        """
+        Test a burst of writes within the prune interval is bounded
+        """
+
+        driver = File(self.temp_dir(), threshold=30)
+
+        with mock.patch('edmunds.cache.drivers.file.time', return_value=1000):
+            for i in range(100):
+                driver.set('key%d' % i, 'value', timeout=i + 1)
+
+        with mock.patch('edmunds.cache.drivers.file.time', return_value=1001):
+            self.assert_less_equal(len([i for i in range(100) if driver.has('key%d' % i)]), 30)
+
+    def test_serializer(self):
+        """
+        Test serializer
+        """
+
+        serializer = Serializer(method='json', compression='zlib', compress_threshold=100)
+        driver = File(self.temp_dir(), serializer=serializer)
+
+        value = {'key': 'value' * 100}
+        self.assert_true(driver.set('key', value))
+        self.assert_equal(value, driver.get('key'))
+        self.assert_equal(1, serializer.stats()['compressed'])
+        self.assert_true(serializer.stats()['saved_bytes'] > 0)
+
+    def test_corrupt(self):
+        """
+        Test corrupt entries are a miss and removed
+        """
+
+        serializer = Serializer(method='json', compression='zlib', compress_threshold=100)
+
+        for driver in [File(self.temp_dir()), File(self.temp_dir(), serializer=serializer)]:
+            driver.set('truncated', {'key': 'value' * 100})
+            driver.set('garbage', 'value')
+
+            filename = driver._get_filename('truncated')
+            with open(filename, 'rb') as f:
+                data = f.read()
+            with open(filename, 'wb') as f:
+                f.write(data[:len(data) - 20])
+
+            with open(driver._get_filename('garbage'), 'wb') as f:
+                pickle.dump(0, f, 1)
+                f.write(b'\x01garbage')
+
+            for key in ['truncated', 'garbage']:
+                self.assert_is_none(driver.get(key))
+                self.assert_false(os.path.exists(driver._get_filename(key)))
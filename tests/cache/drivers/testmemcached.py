@@ -2,6 +2,8 @@
 from tests.testcase import TestCase
 from werkzeug.contrib.cache import MemcachedCache
 from edmunds.cache.drivers.memcached import Memcached
+from edmunds.cache.serializer import Serializer
+import mock
 
 
 class TestMemcached(TestCase):
@@ -27,6 +29,8 @@ class TestMemcached(TestCase):
             "               'servers': ['127.0.0.1:11211'], \n",
             "               'default_timeout': 300, \n",
             "               'key_prefix': None, \n",
+            "               'serializer': 'pickle', \n",
+            "               'compression': 'zlib', \n",
             "           }, \n",
             "       ], \n",
             "   }, \n",
@@ -39,3 +43,99 @@ class TestMemcached(TestCase):
         driver = app.cache()
         self.assert_is_instance(driver, Memcached)
         self.assert_is_instance(driver, MemcachedCache)
+        self.assert_is_instance(driver.serializer, Serializer)
+        self.assert_equal('pickle', driver.serializer.method)
+        self.assert_equal('zlib', driver.serializer.compression)
+
+    def test_batched(self):
+        """
+        Test multiple keys are handled in one round trip
+        """
+
+        client = mock.MagicMock()
+        driver = Memcached(servers=client)
+
+        client.get_multi.return_value = {'key': 1}
+        self.assert_equal([1, None], driver.get_many('key', 'key2'))
+        client.get_multi.assert_called_once_with(['key', 'key2'])
+        self.assert_equal([], driver.get_many())
+        self.assert_equal(1, client.get_multi.call_count)
+
+        client.set_multi.return_value = []
+        self.assert_true(driver.set_many({'key': 1, 'key2': 2}))
+        client.set_multi.return_value = ['key2']
+        self.assert_false(driver.set_many({'key': 1, 'key2': 2}))
+        self.assert_true(driver.set_many({}))
+        self.assert_equal(2, client.set_multi.call_count)
+
+        client.delete_multi.return_value = 1
+        self.assert_true(driver.delete_many('key', 'key2'))
+        client.delete_multi.assert_called_once_with(['key', 'key2'])
+        self.assert_true(driver.delete_many())
+        self.assert_equal(1, client.delete_multi.call_count)
+
+    def test_inc_dec(self):
+        """
+        Test inc and dec of missing keys
+        """
+
+        client = mock.MagicMock()
+        driver = Memcached(servers=client)
+
+        client.incr.return_value = 3
+        self.assert_equal(3, driver.inc('key', delta=2))
+        client.incr.assert_called_once_with('key', 2)
+        self.assert_false(client.add.called)
+
+        # Missing key is added
+        client.incr.return_value = None
+        client.add.return_value = True
+        self.assert_equal(2, driver.inc('key', delta=2))
+        self.assert_equal('key', client.add.call_args[0][0])
+        self.assert_equal(2, client.add.call_args[0][1])
+
+        client.decr.return_value = None
+        self.assert_equal(0, driver.dec('key'))
+        self.assert_equal(0, client.add.call_args[0][1])
+
+        # Added by other process
+        client.add.return_value = False
+        client.incr.side_effect = [None, 5]
+        self.assert_equal(5, driver.inc('key'))
+
+        # Negative delta
+        client.decr.return_value = 4
+        self.assert_equal(4, driver.inc('key', delta=-1))
+        client.decr.assert_called_with('key', 1)
+
+    def test_serializer(self):
+        """
+        Test serializer
+        """
+
+        client = mock.MagicMock()
+        serializer = Serializer(method='json')
+        driver = Memcached(servers=client, serializer=serializer)
+
+        driver.set('key', {'key': 'value'})
+        dumped_value = client.set.call_args[0][1]
+        self.assert_equal(serializer.dumps({'key': 'value'}), dumped_value)
+
+        client.get.return_value = dumped_value
+        self.assert_equal({'key': 'value'}, driver.get('key'))
+
+        client.get_multi.return_value = {'key': dumped_value, 'counter': 1}
+        self.assert_equal([{'key': 'value'}, 1, None], driver.get_many('key', 'counter', 'missing'))
+
+        driver.set_many({'key': {'key': 'value'}, 'counter': 1})
+        self.assert_equal({'key': dumped_value, 'counter': 1}, client.set_multi.call_args[0][0])
+
+        # Integers are stored as is
+        driver.add('counter', 1)
+        self.assert_equal(1, client.add.call_args[0][1])
+
+        # Corrupt values are a miss
+        client.get.return_value = b'\x01garbage'
+        self.assert_is_none(driver.get('key'))
+        client.get_multi.return_value = {'key': dumped_value[:len(dumped_value) // 2], 'counter': 1}
+        self.assert_equal([None, 1], driver.get_many('key', 'counter'))
@@ -0,0 +1,213 @@
+from tests.testcase import TestCase
+from werkzeug.contrib.cache import BaseCache
+from edmunds.cache.drivers.memory import Memory
+import mock
+
+
+class TestMemory(TestCase):
+    """
+    Test the Memory
+    """
+
+    def test_memory(self):
+        """
+        Test the memory
+        """
+
+        # Write config
+        self.write_config([
+            "from edmunds.cache.drivers.memory import Memory \n",
+            "APP = { \n",
+            "   'cache': { \n",
+            "       'enabled': True, \n",
+            "       'instances': [ \n",
+            "           { \n",
+            "               'name': 'memory',\n",
+            "               'driver': Memory,\n",
+            "               'threshold': 500,\n",
+            "               'max_bytes': 1024 * 1024,\n",
+            "               'policy': 'lfu',\n",
+            "               'default_timeout': 300,\n",
+            "           }, \n",
+            "       ], \n",
+            "   }, \n",
+            "} \n",
+            ])
+
+        # Create app
+        app = self.create_application()
+
+        driver = app.cache()
+        self.assert_is_instance(driver, Memory)
+        self.assert_is_instance(driver, BaseCache)
+
+        self.assert_true(driver.set('key', {'value': 1}))
+        self.assert_equal({'value': 1}, driver.get('key'))
+
+    def test_invalid_policy(self):
+        """
+        Test invalid policy
+        """
+
+        with self.assert_raises_regexp(RuntimeError, 'Unknown eviction policy'):
+            Memory(policy='fifo')
+
+    def test_get_set_delete(self):
+        """
+        Test get, set, add and delete
+        """
+
+        driver = Memory()
+
+        self.assert_is_none(driver.get('key'))
+        self.assert_false(driver.has('key'))
+        self.assert_true(driver.set('key', 'value'))
+        self.assert_true(driver.has('key'))
+        self.assert_equal('value', driver.get('key'))
+        self.assert_false(driver.add('key', 'other value'))
+        self.assert_true(driver.add('key2', 'value2'))
+        self.assert_equal(['value', 'value2', None], driver.get_many('key', 'key2', 'key3'))
+
+        # Values are copies
+        value = ['value']
+        driver.set('list', value)
+        value.append('other value')
+        self.assert_equal(['value'], driver.get('list'))
+
+        self.assert_true(driver.delete('key'))
+        self.assert_false(driver.delete('key'))
+        self.assert_is_none(driver.get('key'))
+
+        self.assert_true(driver.clear())
+        self.assert_is_none(driver.get('key2'))
+        self.assert_equal(0, driver.stats()['entries'])
+        self.assert_equal(0, driver.stats()['bytes'])
+
+    def test_inc_dec(self):
+        """
+        Test inc and dec
+        """
+
+        driver = Memory()
+
+        self.assert_equal(1, driver.inc('counter'))
+        self.assert_equal(3, driver.inc('counter', delta=2))
+        self.assert_equal(2, driver.dec('counter'))
+        self.assert_equal(2, driver.get('counter'))
+
+        def target():
+            driver.inc('counter')
+
+        self.thread(target, count=50)
+
+        self.assert_equal(52, driver.get('counter'))
+
+    def test_timeout(self):
+        """
+        Test timeout per key
+        """
+
+        driver = Memory(default_timeout=10)
+
+        with mock.patch('edmunds.cache.drivers.memory.time', return_value=1000):
+            driver.set('default', 'value')
+            driver.set('short', 'value', timeout=5)
+            driver.set('forever', 'value', timeout=0)
+
+        with mock.patch('edmunds.cache.drivers.memory.time', return_value=1006):
+            self.assert_equal('value', driver.get('default'))
+            self.assert_is_none(driver.get('short'))
+            self.assert_equal('value', driver.get('forever'))
+
+        with mock.patch('edmunds.cache.drivers.memory.time', return_value=100000):
+            self.assert_false(driver.has('default'))
+            self.assert_equal('value', driver.get('forever'))
+
+        self.assert_equal(2, driver.stats()['expirations'])
+
+    def test_lru(self):
+        """
+        Test least recently used eviction
+        """
+
+        driver = Memory(threshold=3, policy='lru')
+
+        driver.set('a', 1)
+        driver.set('b', 2)
+        driver.set('c', 3)
+        driver.get('a')
+        driver.set('d', 4)
+
+        self.assert_false(driver.has('b'))
+        self.assert_true(driver.has('a'))
+        self.assert_true(driver.has('c'))
+        self.assert_true(driver.has('d'))
+        self.assert_equal(1, driver.stats()['evictions'])
+
+    def test_lfu(self):
+        """
+        Test least frequently used eviction
+        """
+
+        driver = Memory(threshold=3, policy='lfu')
+
+        driver.set('a', 1)
+        driver.set('b', 2)
+        driver.set('c', 3)
+        for _ in range(3):
+            driver.get('a')
+            driver.get('c')
+        driver.get('b')
+        driver.set('c', 'overwritten')
+        driver.set('d', 4)
+
+        self.assert_false(driver.has('b'))
+        self.assert_true(driver.has('d'))
+
+        driver.set('e', 5)
+
+        self.assert_false(driver.has('d'))
+        self.assert_true(driver.has('a'))
+        self.assert_equal('overwritten', driver.get('c'))
+        self.assert_equal(2, driver.stats()['evictions'])
+
+    def test_max_bytes(self):
+        """
+        Test maximum bytes
+        """
+
+        value = 'x' * 100
+        driver = Memory(max_bytes=350)
+
+        driver.set('a', value)
+        driver.set('b', value)
+        driver.set('c', value)
+        self.assert_equal(3, driver.stats()['entries'])
+
+        driver.set('d', value)
+        self.assert_false(driver.has('a'))
+        self.assert_equal(3, driver.stats()['entries'])
+        self.assert_true(driver.stats()['bytes'] <= 350)
+
+        # Too big to store
+        self.assert_false(driver.set('big', 'x' * 400))
+        self.assert_false(driver.has('big'))
+
+    def test_stats(self):
+        """
+        Test stats
+        """
+
+        driver = Memory()
+
+        driver.set('a', 1)
+        driver.get('a')
+        driver.get('a')
+        driver.get('b')
+
+        stats = driver.stats()
+        self.assert_equal(2, stats['hits'])
+        self.assert_equal(1, stats['misses'])
+        self.assert_equal(0, stats['evictions'])
+        self.assert_equal(1, stats['entries'])
+        self.assert_true(stats['bytes'] > 0)
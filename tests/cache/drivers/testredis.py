@@ -2,6 +2,8 @@
 from tests.testcase import TestCase
 from werkzeug.contrib.cache import RedisCache
 from edmunds.cache.drivers.redis import Redis
+from edmunds.cache.serializer import Serializer
+import mock
 
 
 class TestRedis(TestCase):
@@ -30,6 +32,10 @@ class TestRedis(TestCase):
             "               'db': 0,\n",
             "               'default_timeout': 300,\n",
             "               'key_prefix': None,\n",
+            "               'max_connections': 20,\n",
+            "               'socket_timeout': 1.5,\n",
+            "               'socket_keepalive': True,\n",
+            "               'serializer': 'marshal',\n",
             "           }, \n",
             "       ], \n",
             "   }, \n",
@@ -42,3 +48,89 @@ class TestRedis(TestCase):
         driver = app.cache()
         self.assert_is_instance(driver, Redis)
         self.assert_is_instance(driver, RedisCache)
+
+        # Connection pool
+        connection_pool = driver._client.connection_pool
+        self.assert_equal(20, connection_pool.max_connections)
+        self.assert_equal(1.5, connection_pool.connection_kwargs['socket_timeout'])
+        self.assert_true(connection_pool.connection_kwargs['socket_keepalive'])
+
+        self.assert_is_instance(driver.serializer, Serializer)
+        self.assert_equal('marshal', driver.serializer.method)
+        self.assert_is_none(driver.serializer.compression)
+
+    def test_batched(self):
+        """
+        Test multiple keys are handled in one round trip
+        """
+
+        client = mock.MagicMock()
+        driver = Redis(host=client, key_prefix='prefix.')
+
+        client.mget.return_value = [b'1', None]
+        self.assert_equal([1, None], driver.get_many('key', 'key2'))
+        client.mget.assert_called_once_with(['prefix.key', 'prefix.key2'])
+        self.assert_equal([], driver.get_many())
+        self.assert_equal(1, client.mget.call_count)
+
+        pipeline = client.pipeline.return_value
+        pipeline.execute.return_value = [True, True]
+        self.assert_true(driver.set_many({'key': 1, 'key2': 2}))
+        self.assert_equal(2, pipeline.setex.call_count)
+        pipeline.execute.assert_called_once_with()
+        pipeline.execute.return_value = [True, False]
+        self.assert_false(driver.set_many({'key': 1, 'key2': 2}))
+        self.assert_true(driver.set_many({}))
+
+        client.delete.return_value = 2
+        self.assert_true(driver.delete_many('key', 'key2'))
+        client.delete.assert_called_once_with('prefix.key', 'prefix.key2')
+        client.delete.return_value = 1
+        self.assert_false(driver.delete_many('key', 'key2'))
+        self.assert_true(driver.delete_many())
+        self.assert_equal(2, client.delete.call_count)
+
+    def test_add(self):
+        """
+        Test add in one command
+        """
+
+        client = mock.MagicMock()
+        driver = Redis(host=client)
+
+        client.set.return_value = True
+        self.assert_true(driver.add('key', 1, timeout=10))
+        client.set.assert_called_with(name='key', value=b'1', ex=10, nx=True)
+        self.assert_true(driver.add('key', 1, timeout=0))
+        client.set.assert_called_with(name='key', value=b'1', nx=True)
+
+        client.set.return_value = None
+        self.assert_false(driver.add('key', 1))
+        self.assert_false(client.expire.called)
+
+    def test_serializer(self):
+        """
+        Test serializer
+        """
+
+        client = mock.MagicMock()
+        serializer = Serializer(method='json', compression='zlib', compress_threshold=100)
+        driver = Redis(host=client, serializer=serializer)
+
+        value = {'key': 'value' * 100}
+        driver.set('key', value, timeout=0)
+        dumped_value = client.set.call_args[1]['value']
+        self.assert_equal(b'!\x01', dumped_value[0:2])
+
+        client.get.return_value = dumped_value
+        self.assert_equal(value, driver.get('key'))
+
+        # Integers are stored as is
+        self.assert_equal(b'1', driver.dump_object(1))
+        self.assert_equal(1, driver.load_object(b'1'))
+
+        # Corrupt values are a miss
+        client.get.return_value = dumped_value[:len(dumped_value) // 2]
+        self.assert_is_none(driver.get('key'))
+        client.get.return_value = b'!\x00garbage'
+        self.assert_is_none(driver.get('key'))
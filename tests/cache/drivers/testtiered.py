@@ -0,0 +1,255 @@
+
+from tests.testcase import TestCase
+from werkzeug.contrib.cache import BaseCache
+from edmunds.cache.drivers.memory import Memory
+from edmunds.cache.drivers.redis import Redis
+from edmunds.cache.drivers.tiered import Tiered
+import json
+import mock
+
+
+class TestTiered(TestCase):
+    """
+    Test the Tiered
+    """
+
+    def test_tiered(self):
+        """
+        Test the tiered
+        """
+
+        # Write config
+        self.write_config([
+            "from edmunds.cache.drivers.memory import Memory \n",
+            "from edmunds.cache.drivers.tiered import Tiered \n",
+            "APP = { \n",
+            "   'cache': { \n",
+            "       'enabled': True, \n",
+            "       'instances': [ \n",
+            "           { \n",
+            "               'name': 'tiered',\n",
+            "               'driver': Tiered,\n",
+            "               'near': 'near',\n",
+            "               'remote': 'remote',\n",
+            "               'near_timeout': 2,\n",
+            "           }, \n",
+            "           { \n",
+            "               'name': 'near',\n",
+            "               'driver': Memory,\n",
+            "           }, \n",
+            "           { \n",
+            "               'name': 'remote',\n",
+            "               'driver': Memory,\n",
+            "               'default_timeout': 60,\n",
+            "           }, \n",
+            "       ], \n",
+            "   }, \n",
+            "} \n",
+            ])
+
+        # Create app
+        app = self.create_application()
+
+        driver = app.cache()
+        self.assert_is_instance(driver, Tiered)
+        self.assert_is_instance(driver, BaseCache)
+        self.assert_equal(app.cache('near'), driver.near)
+        self.assert_equal(app.cache('remote'), driver.remote)
+        self.assert_equal(60, driver.default_timeout)
+
+        self.assert_true(driver.set('key', 'value'))
+        self.assert_equal('value', app.cache('near').get('key'))
+        self.assert_equal('value', app.cache('remote').get('key'))
+
+    def test_missing_config(self):
+        """
+        Test missing config
+        """
+
+        # Write config
+        self.write_config([
+            "from edmunds.cache.drivers.memory import Memory \n",
+            "from edmunds.cache.drivers.tiered import Tiered \n",
+            "APP = { \n",
+            "   'cache': { \n",
+            "       'enabled': True, \n",
+            "       'instances': [ \n",
+            "           { \n",
+            "               'name': 'tiered',\n",
+            "               'driver': Tiered,\n",
+            "               'near': 'near',\n",
+            "           }, \n",
+            "           { \n",
+            "               'name': 'near',\n",
+            "               'driver': Memory,\n",
+            "           }, \n",
+            "       ], \n",
+            "   }, \n",
+            "} \n",
+            ])
+
+        # Create app
+        app = self.create_application()
+
+        with self.assert_raises_regexp(RuntimeError, 'missing some configuration'):
+            app.cache()
+
+    def test_read_through(self):
+        """
+        Test reading through the near cache
+        """
+
+        near = Memory()
+        remote = Memory()
+        driver = Tiered(near, remote, near_timeout=5)
+
+        self.assert_is_none(driver.get('key'))
+
+        remote.set('key', 'value')
+        remote.set('key2', 'value2')
+
+        with mock.patch('edmunds.cache.drivers.memory.time', return_value=1000):
+            self.assert_equal('value', driver.get('key'))
+            self.assert_equal('value', near.get('key'))
+
+        # Near value is used
+        remote.set('key', 'new value')
+        with mock.patch('edmunds.cache.drivers.memory.time', return_value=1004):
+            self.assert_equal('value', driver.get('key'))
+
+        # Near value expires quickly
+        with mock.patch('edmunds.cache.drivers.memory.time', return_value=1006):
+            self.assert_equal('new value', driver.get('key'))
+
+        with mock.patch('edmunds.cache.drivers.memory.time', return_value=2000):
+            self.assert_equal(['new value', 'value2', None], driver.get_many('key', 'key2', 'key3'))
+            self.assert_equal('value2', near.get('key2'))
+        self.assert_true(driver.has('key2'))
+        self.assert_false(driver.has('key3'))
+
+    def test_write_through(self):
+        """
+        Test writing through to the remote cache
+        """
+
+        near = Memory()
+        remote = Memory()
+        driver = Tiered(near, remote, near_timeout=5)
+
+        self.assert_true(driver.set('key', 'value'))
+        self.assert_equal('value', near.get('key'))
+        self.assert_equal('value', remote.get('key'))
+
+        self.assert_false(driver.add('key', 'other value'))
+        self.assert_true(driver.add('key2', 'value2'))
+        self.assert_equal('value2', near.get('key2'))
+        self.assert_equal('value2', remote.get('key2'))
+
+        self.assert_true(driver.set_many({'key3': 'value3', 'key4': 'value4'}))
+        self.assert_equal(['value3', 'value4'], near.get_many('key3', 'key4'))
+        self.assert_equal(['value3', 'value4'], remote.get_many('key3', 'key4'))
+
+        self.assert_true(driver.delete('key'))
+        self.assert_false(near.has('key'))
+        self.assert_false(remote.has('key'))
+        self.assert_true(driver.delete_many('key3', 'key4'))
+        self.assert_false(near.has('key3'))
+        self.assert_false(remote.has('key4'))
+
+        # Counters live in the remote cache
+        driver.get('key2')
+        self.assert_equal(1, driver.inc('counter'))
+        self.assert_equal(3, driver.inc('counter', delta=2))
+        self.assert_equal(2, driver.dec('counter'))
+        self.assert_false(near.has('counter'))
+        self.assert_equal(2, driver.get('counter'))
+
+        self.assert_true(driver.clear())
+        self.assert_false(near.has('key2'))
+        self.assert_false(remote.has('key2'))
+
+    def test_near_timeout(self):
+        """
+        Test the near timeout does not outlive the value
+        """
+
+        near = Memory()
+        remote = Memory()
+        driver = Tiered(near, remote, near_timeout=5)
+
+        with mock.patch('edmunds.cache.drivers.memory.time', return_value=1000):
+            driver.set('short', 'value', timeout=2)
+            driver.set('long', 'value', timeout=0)
+
+        with mock.patch('edmunds.cache.drivers.memory.time', return_value=1003):
+            self.assert_false(near.has('short'))
+            self.assert_true(near.has('long'))
+
+        with mock.patch('edmunds.cache.drivers.memory.time', return_value=1006):
+            self.assert_false(near.has('long'))
+            self.assert_true(remote.has('long'))
+
+    def test_invalidation(self):
+        """
+        Test invalidation broadcast
+        """
+
+        with self.assert_raises_regexp(RuntimeError, 'requires a Redis remote cache'):
+            Tiered(Memory(), Memory(), invalidation_channel='invalidations')
+
+        client = mock.MagicMock()
+        remote = Redis(host=client)
+        driver = Tiered(Memory(), remote, invalidation_channel='invalidations')
+        other_driver = Tiered(Memory(), remote, invalidation_channel='invalidations')
+
+        client.pubsub.return_value.subscribe.assert_called_with(invalidations=other_driver._handle_invalidation)
+        self.assert_equal(2, client.pubsub.return_value.run_in_thread.call_count)
+
+        # Broadcast on write
+        driver.delete('key')
+        client.publish.assert_called_with('invalidations', json.dumps({'id': driver._invalidation_id, 'keys': ['key']}))
+        message = client.publish.call_args[0][1]
+
+        # Own messages are ignored
+        driver.near.set('key', 'value')
+        driver._handle_invalidation({'data': message.encode('utf-8')})
+        self.assert_true(driver.near.has('key'))
+
+        # Messages of other processes invalidate the near cache
+        other_driver.near.set('key', 'value')
+        other_driver.near.set('key2', 'value2')
+        other_driver._handle_invalidation({'data': message.encode('utf-8')})
+        self.assert_false(other_driver.near.has('key'))
+        self.assert_true(other_driver.near.has('key2'))
+
+        driver.clear()
+        message = client.publish.call_args[0][1]
+        other_driver._handle_invalidation({'data': message.encode('utf-8')})
+        self.assert_false(other_driver.near.has('key2'))
+
+        # Batches are broadcast in a single message
+        client.publish.reset_mock()
+        driver.set_many({'key': 'value', 'key2': 'value2'})
+        self.assert_equal(1, client.publish.call_count)
+        other_driver.near.set('key', 'value')
+        other_driver.near.set('key2', 'value2')
+        other_driver.near.set('key3', 'value3')
+        other_driver._handle_invalidation({'data': client.publish.call_args[0][1].encode('utf-8')})
+        self.assert_false(other_driver.near.has('key'))
+        self.assert_false(other_driver.near.has('key2'))
+        self.assert_true(other_driver.near.has('key3'))
+
+        client.publish.reset_mock()
+        driver.delete_many('key3', 'key4')
+        self.assert_equal(1, client.publish.call_count)
+        self.assert_equal(['key3', 'key4'], json.loads(client.publish.call_args[0][1])['keys'])
+        other_driver._handle_invalidation({'data': client.publish.call_args[0][1].encode('utf-8')})
+        self.assert_false(other_driver.near.has('key3'))
+
+        # Invalidating tags clears the near caches
+        other_driver.near.set('key', 'value')
+        driver.invalidate_tags(['tag'])
+        client.publish.assert_called_with('invalidations', json.dumps({'id': driver._invalidation_id, 'keys': None}))
+        message = client.publish.call_args[0][1]
+        other_driver._handle_invalidation({'data': message.encode('utf-8')})
+        self.assert_false(other_driver.near.has('key'))
@@ -0,0 +1,195 @@
+
+from tests.testcase import TestCase
+from edmunds.cache.middleware.responsecachemiddleware import ResponseCacheMiddleware
+from edmunds.globals import session
+
+
+class TestResponseCacheMiddleware(TestCase):
+    """
+    Test the Response Cache Middleware
+    """
+
+    def set_up(self):
+        """
+        Set up the test case
+        """
+
+        super(TestResponseCacheMiddleware, self).set_up()
+
+        self.write_config([
+            "from edmunds.cache.drivers.memory import Memory \n",
+            "APP = { \n",
+            "   'cache': { \n",
+            "       'enabled': True, \n",
+            "       'instances': [ \n",
+            "           { \n",
+            "               'name': 'memory',\n",
+            "               'driver': Memory,\n",
+            "           }, \n",
+            "       ], \n",
+            "   }, \n",
+            "} \n",
+            ])
+        self.app = self.create_application()
+        self.calls = []
+
+    def add_route(self, *middleware_args):
+        """
+        Add route with response cache middleware
+        :param middleware_args: The middleware arguments
+        :return:                The rule
+        """
+
+        rule = '/' + self.rand_str(20)
+
+        @self.app.route(rule, middleware=[(ResponseCacheMiddleware,) + middleware_args])
+        def handle_route():
+            self.calls.append(1)
+            return 'response %s' % len(self.calls)
+
+        return rule
+
+    def test_stateless(self):
+        """
+        Test middleware is stateless
+        """
+
+        self.assert_true(ResponseCacheMiddleware.stateless)
+
+    def test_cache(self):
+        """
+        Test responses are cached
+        """
+
+        rule = self.add_route()
+
+        with self.app.test_client() as c:
+            rv = c.get(rule)
+            self.assert_equal(200, rv.status_code)
+            self.assert_equal(b'response 1', rv.data)
+            self.assert_equal('MISS', rv.headers['X-Cache'])
+            self.assert_in('Accept-Language', rv.headers['Vary'])
+            self.assert_is_not_none(rv.headers.get('ETag'))
+            self.assert_is_not_none(rv.headers.get('Last-Modified'))
+
+            rv = c.get(rule)
+            self.assert_equal(200, rv.status_code)
+            self.assert_equal(b'response 1', rv.data)
+            self.assert_equal('HIT', rv.headers['X-Cache'])
+            self.assert_equal(1, len(self.calls))
+
+            # Query order does not matter
+            rv = c.get(rule + '?b=2&a=1')
+            self.assert_equal(b'response 2', rv.data)
+            rv = c.get(rule + '?a=1&b=2')
+            self.assert_equal(b'response 2', rv.data)
+
+            # Vary headers
+            rv = c.get(rule, headers={'Accept-Language': 'nl'})
+            self.assert_equal(b'response 3', rv.data)
+            rv = c.get(rule, headers={'Accept-Language': 'nl'})
+            self.assert_equal(b'response 3', rv.data)
+            rv = c.get(rule, headers={'Accept-Language': 'en'})
+            self.assert_equal(b'response 4', rv.data)
+
+    def test_conditional(self):
+        """
+        Test conditional requests
+        """
+
+        rule = self.add_route()
+
+        with self.app.test_client() as c:
+            rv = c.get(rule)
+            etag = rv.headers['ETag']
+            last_modified = rv.headers['Last-Modified']
+
+            rv = c.get(rule, headers={'If-None-Match': etag})
+            self.assert_equal(304, rv.status_code)
+            self.assert_equal(b'', rv.data)
+
+            rv = c.get(rule, headers={'If-Modified-Since': last_modified})
+            self.assert_equal(304, rv.status_code)
+
+            rv = c.get(rule, headers={'If-None-Match': '"other"'})
+            self.assert_equal(200, rv.status_code)
+            self.assert_equal(1, len(self.calls))
+
+    def test_not_cached(self):
+        """
+        Test requests and responses that are not cached
+        """
+
+        rule = self.add_route()
+
+        with self.app.test_client() as c:
+            c.get(rule, headers={'Authorization': 'Basic abc'})
+            c.get(rule, headers={'Cache-Control': 'no-store'})
+            self.assert_equal(2, len(self.calls))
+
+            # No cache gets a fresh response
+            c.get(rule)
+            c.get(rule, headers={'Cache-Control': 'no-cache'})
+            self.assert_equal(4, len(self.calls))
+
+        rule = '/' + self.rand_str(20)
+
+        @self.app.route(rule, middleware=[ResponseCacheMiddleware])
+        def handle_private_route():
+            self.calls.append(1)
+            response = self.app.make_response('private')
+            response.cache_control.private = True
+            return response
+
+        with self.app.test_client() as c:
+            c.get(rule)
+            c.get(rule)
+            self.assert_equal(6, len(self.calls))
+
+        # Responses that write to the session
+        self.app.secret_key = self.rand_str(20)
+        rule = '/' + self.rand_str(20)
+
+        @self.app.route(rule, middleware=[ResponseCacheMiddleware])
+        def handle_session_route():
+            self.calls.append(1)
+            session['csrf_token'] = self.rand_str(20)
+            return 'session'
+
+        with self.app.test_client() as c:
+            response = c.get(rule)
+            self.assert_in('session=', response.headers['Set-Cookie'])
+            self.assert_not_in('X-Cache', response.headers)
+        with self.app.test_client() as c:
+            c.get(rule)
+            self.assert_equal(8, len(self.calls))
+
+        # Head-requests are not stored
+        rule = self.add_route()
+        with self.app.test_client() as c:
+            c.head(rule)
+            c.head(rule)
+            self.assert_equal(10, len(self.calls))
+            c.get(rule)
+            self.assert_equal('HIT', c.head(rule).headers['X-Cache'])
+            self.assert_equal(11, len(self.calls))
+
+    def test_arguments(self):
+        """
+        Test timeout, vary, cache instance and tags
+        """
+
+        rule = self.add_route(60, ['X-Device'], 'memory', ['pages'])
+
+        with self.app.test_client() as c:
+            c.get(rule, headers={'X-Device': 'mobile'})
+            rv = c.get(rule, headers={'X-Device': 'mobile', 'Accept-Language': 'nl'})
+            self.assert_equal('HIT', rv.headers['X-Cache'])
+            self.assert_in('X-Device', rv.headers['Vary'])
+            c.get(rule, headers={'X-Device': 'desktop'})
+            self.assert_equal(2, len(self.calls))
+
+            self.app.cache('memory').invalidate_tags(['pages'])
+            rv = c.get(rule, headers={'X-Device': 'mobile'})
+            self.assert_equal('MISS', rv.headers['X-Cache'])
+            self.assert_equal(3, len(self.calls))
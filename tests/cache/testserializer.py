@@ -0,0 +1,83 @@
+
+from tests.testcase import TestCase
+from edmunds.cache.serializer import Serializer
+
+
+class TestSerializer(TestCase):
+    """
+    Test the Serializer
+    """
+
+    def test_methods(self):
+        """
+        Test the serialization methods
+        """
+
+        value = {'key': [1, 2.5, 'value', None, True]}
+
+        for method in ['pickle', 'marshal', 'json']:
+            serializer = Serializer(method=method)
+            self.assert_equal(value, serializer.loads(serializer.dumps(value)))
+
+        with self.assert_raises_regexp(RuntimeError, 'Unknown serializer'):
+            Serializer(method='yaml')
+        with self.assert_raises_regexp(RuntimeError, 'Unknown compression'):
+            Serializer(compression='bz2')
+
+    def test_compression(self):
+        """
+        Test compression above the threshold
+        """
+
+        serializer = Serializer(method='json', compression='zlib', compress_threshold=100)
+
+        small_value = {'key': 'value'}
+        large_value = {'key': 'value' * 100}
+
+        small_data = serializer.dumps(small_value)
+        large_data = serializer.dumps(large_value)
+
+        self.assert_equal(b'\x00', small_data[0:1])
+        self.assert_equal(b'\x01', large_data[0:1])
+        self.assert_true(len(large_data) < 100)
+        self.assert_equal(small_value, serializer.loads(small_data))
+        self.assert_equal(large_value, serializer.loads(large_data))
+
+        # Values that do not get smaller are stored uncompressed
+        serializer = Serializer(method='marshal', compression='zlib', compress_threshold=0)
+        self.assert_equal(b'\x00', serializer.dumps(1)[0:1])
+
+    def test_corrupt(self):
+        """
+        Test loading corrupt data
+        """
+
+        for method in ['pickle', 'marshal', 'json']:
+            serializer = Serializer(method=method, compression='zlib', compress_threshold=0)
+            data = serializer.dumps({'key': 'value' * 100})
+
+            for corrupt_data in [data[:len(data) // 2], b'\x00garbage', b'\x01garbage', b'']:
+                with self.assert_raises_regexp(ValueError, 'Could not load'):
+                    serializer.loads(corrupt_data)
+
+    def test_stats(self):
+        """
+        Test stats
+        """
+
+        serializer = Serializer(method='json', compression='zlib', compress_threshold=100)
+
+        small_data = serializer.dumps('value')
+        large_data = serializer.dumps('value' * 100)
+        serializer.loads(large_data)
+
+        stats = serializer.stats()
+        self.assert_equal('json', stats['method'])
+        self.assert_equal('zlib', stats['compression'])
+        self.assert_equal(2, stats['dumps'])
+        self.assert_equal(1, stats['loads'])
+        self.assert_equal(1, stats['compressed'])
+        self.assert_equal(len('"value"') + len('"%s"' % ('value' * 100)), stats['serialized_bytes'])
+        self.assert_equal(len(small_data) + len(large_data), stats['stored_bytes'])
+        self.assert_equal(stats['serialized_bytes'] - stats['stored_bytes'], stats['saved_bytes'])
+        self.assert_true(stats['saved_bytes'] > 0)
@@ -3,6 +3,7 @@ from tests.testcase import TestCase
 from flask.config import Config as FlaskConfig
 import os
 import mock
+import copy
 
 
 class TestConfig(TestCase):
@@ -582,3 +583,150 @@ class TestConfig(TestCase):
         # Delete other value
         del app.config['APP']['info']['name']
         self.assert_false(app.config.has('app.info.name'))
+
+    def test_index_invalidation(self):
+        """
+        Test the index of resolved keys is invalidated on changes
+        :return:    void
+        """
+
+        # Write config
+        self.write_config([
+            "APP = { \n",
+            "   'info': { \n",
+            "       'name': 'name', \n",
+            "       'list': ['value1', 'value2'], \n",
+            "   }, \n",
+            "} \n",
+        ])
+
+        # Create app
+        app = self.create_application()
+
+        # Resolve keys so they are indexed
+        self.assert_equal('name', app.config('app.info.name'))
+        self.assert_equal('value2', app.config('app.info.list.1'))
+        self.assert_false(app.config.has('app.info.artist'))
+        self.assert_in('app.info.name', app.config._index)
+        self.assert_in('app.info.artist', app.config._index)
+
+        # Set item
+        app.config['APP_INFO_NAME'] = 'setitem'
+        self.assert_equal('setitem', app.config('app.info.name'))
+
+        # Update
+        app.config.update({'APP_INFO_NAME': 'update'})
+        self.assert_equal('update', app.config('app.info.name'))
+
+        # Set default
+        app.config.setdefault('APP_INFO_ARTIST', 'setdefault')
+        self.assert_equal('setdefault', app.config('app.info.artist'))
+
+        # Pop
+        app.config.pop('APP_INFO_ARTIST')
+        self.assert_false(app.config.has('app.info.artist'))
+        app.config.pop('APP_INFO_NAME')
+        self.assert_equal('name', app.config('app.info.name'))
+
+        # From mapping
+        app.config.from_mapping(APP={'info': {'artist': 'mapping'}})
+        self.assert_equal('mapping', app.config('app.info.artist'))
+        self.assert_equal('name', app.config('app.info.name'))
+
+        # From object
+        class Obj(object):
+            APP_INFO_NAME = 'object'
+        app.config.from_object(Obj)
+        self.assert_equal('object', app.config('app.info.name'))
+
+        # Nested values changed in place
+        app.config['APP']['info']['list'] = ['value3']
+        self.assert_false(app.config.has('app.info.list.1'))
+        self.assert_equal('value3', app.config('app.info.list.0'))
+
+        # Nested values replaced in place by another type
+        self.assert_equal('mapping', app.config('app.info.artist'))
+        app.config['APP']['info'] = ['value4']
+        self.assert_false(app.config.has('app.info.artist'))
+        self.assert_equal('value4', app.config('app.info.0'))
+        app.config['APP']['info'] = {'0': 'value5'}
+        self.assert_equal('value5', app.config('app.info.0'))
+
+        # Clear
+        app.config.clear()
+        self.assert_false(app.config.has('app.info.name'))
+        self.assert_false(app.config.has('app.info.list.0'))
+
+    def test_freeze(self):
+        """
+        Test freezing the config
+        :return:    void
+        """
+
+        # Write config
+        self.write_config([
+            "APP_INFO_NAME = 'name' \n",
+            "APP = { \n",
+            "   'info': { \n",
+            "       'artist': 'artist', \n",
+            "       'list': [ \n",
+            "           'value1', \n",
+            "           {'nested': 'value2'}, \n",
+            "       ], \n",
+            "       'none': None, \n",
+            "       'name': 'othername', \n",
+            "   }, \n",
+            "   'INFO_ADDRESS': 'address' \n",
+            "} \n",
+        ])
+
+        # Create app
+        app = self.create_application()
+
+        keys = [
+            'app.info', 'app.info.name', 'app.info.artist', 'app.info.list', 'app.info.list.0',
+            'app.info.list.1', 'app.info.list.1.nested', 'app.info.list.01', 'app.info.list.2',
+            'app.info.none', 'app.info.address', 'app.name', 'app.env',
+            'APP_INFO', 'APP_INFO_NAME', 'APP_INFO_LIST_1_NESTED', 'APP_NON_EXISTING',
+        ]
+        default_value = self.rand_str(20)
+        expected = dict((key, (app.config.has(key), app.config(key, default_value))) for key in keys)
+
+        # Freeze
+        self.assert_false(app.config.frozen)
+        app.config.freeze()
+        self.assert_true(app.config.frozen)
+        app.config.freeze()
+
+        # Check values are the same and memoized
+        for _ in range(2):
+            for key in keys:
+                self.assert_equal(expected[key][0], app.config.has(key), msg=key)
+                self.assert_equal_deep(expected[key][1], app.config(key, default_value), msg=key)
+
+        # Check config can not be changed
+        with self.assert_raises_regexp(RuntimeError, 'frozen'):
+            app.config['APP_INFO_NAME'] = 'changed'
+        with self.assert_raises_regexp(RuntimeError, 'frozen'):
+            del app.config['APP_INFO_NAME']
+        with self.assert_raises_regexp(RuntimeError, 'frozen'):
+            app.config.update({'APP_INFO_NAME': 'changed'})
+        with self.assert_raises_regexp(RuntimeError, 'frozen'):
+            app.config.from_mapping(APP_INFO_NAME='changed')
+        with self.assert_raises_regexp(RuntimeError, 'frozen'):
+            app.config.setdefault('APP_INFO_ANOTHER', 'changed')
+        with self.assert_raises_regexp(RuntimeError, 'frozen'):
+            app.config('app.info')['name'] = 'changed'
+        with self.assert_raises_regexp(RuntimeError, 'frozen'):
+            app.config('app.info.list').append('changed')
+        self.assert_equal('name', app.config.setdefault('APP_INFO_NAME', 'changed'))
+        self.assert_equal('name', app.config('app.info.name'))
+
+        # Copies are no longer frozen
+        info = app.config('app.info').copy()
+        info['name'] = 'changed'
+        self.assert_equal('othername', app.config('app.info')['name'])
+        info_list = list(app.config('app.info.list'))
+        info_list.append('changed')
+        self.assert_equal(2, len(app.config('app.info.list')))
+        self.assert_equal_deep(app.config('app.info'), copy.deepcopy(app.config('app.info')))
@@ -0,0 +1,59 @@
+from tests.testcase import TestCase
+from edmunds.database.meteredqueuepool import MeteredQueuePool
+from sqlalchemy.exc import TimeoutError
+import sqlite3
+
+
+class TestMeteredQueuePool(TestCase):
+    """
+    Test the Metered Queue Pool
+    """
+
+    def test_not_metered(self):
+        """
+        Test checkout without callback
+        """
+
+        pool = MeteredQueuePool(lambda: sqlite3.connect(':memory:'), pool_size=1, max_overflow=0)
+
+        connection = pool.connect()
+        self.assert_is_not_none(connection)
+        connection.close()
+
+    def test_checkout(self):
+        """
+        Test checkout is reported
+        """
+
+        checkouts = []
+        pool = MeteredQueuePool(lambda: sqlite3.connect(':memory:'), pool_size=1, max_overflow=0, timeout=0.01)
+        pool.on_checkout = lambda duration, timed_out: checkouts.append((duration, timed_out))
+
+        connection = pool.connect()
+        self.assert_equal(1, len(checkouts))
+        self.assert_greater_equal(checkouts[0][0], 0)
+        self.assert_false(checkouts[0][1])
+
+        # Pool is exhausted
+        with self.assert_raises(TimeoutError):
+            pool.connect()
+        self.assert_equal(2, len(checkouts))
+        self.assert_greater_equal(checkouts[1][0], 0.01)
+        self.assert_true(checkouts[1][1])
+
+        connection.close()
+
+    def test_recreate(self):
+        """
+        Test recreate keeps the callback
+        """
+
+        on_checkout = lambda duration, timed_out: None
+        pool = MeteredQueuePool(lambda: sqlite3.connect(':memory:'), pool_size=3)
+        pool.on_checkout = on_checkout
+
+        recreated = pool.recreate()
+
+        self.assert_is_instance(recreated, MeteredQueuePool)
+        self.assert_equal(3, recreated.size())
+        self.assert_equal(on_checkout, recreated.on_checkout)
@@ -0,0 +1,171 @@
+from tests.testcase import TestCase
+from edmunds.database.queryinstrumentation import QueryInstrumentation
+from edmunds.database.querystats import QueryStats
+from edmunds.globals import g
+from sqlalchemy.exc import OperationalError
+import mock
+
+
+class TestQueryInstrumentation(TestCase):
+    """
+    Test the Query Instrumentation
+    """
+
+    def set_up(self):
+        """
+        Set up the test case
+        """
+
+        super(TestQueryInstrumentation, self).set_up()
+
+        # Write config
+        self.write_config([
+            "from edmunds.database.drivers.sqlitememory import SqliteMemory \n",
+            "APP = { \n",
+            "   'database': { \n",
+            "       'enabled': True, \n",
+            "       'instrumentation': { \n",
+            "           'enabled': True, \n",
+            "           'threshold': 2, \n",
+            "           'header': 'X-Database-Queries', \n",
+            "       }, \n",
+            "       'instances': [ \n",
+            "           { \n",
+            "               'name': 'sqlitememory',\n",
+            "               'driver': SqliteMemory,\n",
+            "           }, \n",
+            "       ], \n",
+            "   }, \n",
+            "} \n",
+        ])
+
+        # Create app
+        self.app = self.create_application()
+
+    def test_not_enabled(self):
+        """
+        Test not enabled
+        """
+
+        # Write config
+        self.write_config([
+            "from edmunds.database.drivers.sqlitememory import SqliteMemory \n",
+            "APP = { \n",
+            "   'database': { \n",
+            "       'enabled': True, \n",
+            "       'instances': [ \n",
+            "           { \n",
+            "               'name': 'sqlitememory',\n",
+            "               'driver': SqliteMemory,\n",
+            "           }, \n",
+            "       ], \n",
+            "   }, \n",
+            "} \n",
+        ])
+
+        # Create app
+        app = self.create_application()
+
+        self.assert_is_none(app.extensions['edmunds.database'].instrumentation)
+
+    def test_stats(self):
+        """
+        Test statistics per request
+        """
+
+        instrumentation = self.app.extensions['edmunds.database'].instrumentation
+        self.assert_is_instance(instrumentation, QueryInstrumentation)
+
+        rule = '/' + self.rand_str(20)
+        @self.app.route(rule)
+        def handle_route():
+            engine = self.app.database_engine()
+            engine.execute('SELECT 1')
+            engine.execute('SELECT 2')
+            engine.execute('SELECT   3 ')
+
+            stats = instrumentation.get_stats()
+            self.assert_is_instance(stats, QueryStats)
+            self.assert_equal(3, stats.count)
+            self.assert_equal({'SELECT ?': 3}, stats.fingerprints)
+            self.assert_greater(stats.total_time, 0)
+            self.assert_greater_equal(stats.total_time, stats.max_time)
+            return ''
+
+        rule2 = '/' + self.rand_str(20)
+        @self.app.route(rule2)
+        def handle_route2():
+            return ''
+
+        with mock.patch.object(self.app.logger, 'warning') as warning:
+            with self.app.test_client() as c:
+
+                response = c.get(rule)
+                self.assert_equal(200, response.status_code)
+                self.assert_true(response.headers['X-Database-Queries'].startswith('count=3; '))
+                self.assert_true(response.headers['X-Database-Queries'].endswith('; statements=1'))
+
+                # N+1 is logged once
+                self.assert_equal(1, warning.call_count)
+                self.assert_in('more than 2 times on database "sqlitememory": SELECT ?', warning.call_args[0][0])
+
+                # Statistics are per request
+                response = c.get(rule2)
+                self.assert_equal('count=0; total=0.000000; max=0.000000; statements=0', response.headers['X-Database-Queries'])
+
+    def test_outside_request(self):
+        """
+        Test queries outside of a request are ignored
+        """
+
+        instrumentation = self.app.extensions['edmunds.database'].instrumentation
+
+        engine = self.app.database_engine()
+        engine.execute('SELECT 1')
+        self.assert_is_none(instrumentation.get_stats())
+
+        with self.app.app_context():
+            engine.execute('SELECT 1')
+            self.assert_equal(1, instrumentation.get_stats().count)
+            self.assert_equal(1, g.edmunds_database_query_stats.count)
+
+    def test_error(self):
+        """
+        Test failed statements do not leak their start time
+        """
+
+        engine = self.app.database_engine()
+
+        with self.app.app_context():
+            connection = engine.connect()
+            try:
+                for _ in range(3):
+                    with self.assert_raises(OperationalError):
+                        connection.execute('SELECT * FROM non_existing_table')
+                self.assert_equal([], connection.info['edmunds_query_start'])
+
+                connection.execute('SELECT 1')
+                self.assert_equal([], connection.info['edmunds_query_start'])
+            finally:
+                connection.close()
+
+    def test_fingerprint(self):
+        """
+        Test fingerprint
+        """
+
+        instrumentation = QueryInstrumentation(self.app)
+
+        data = [
+            ('SELECT * FROM user WHERE id = ?', 'SELECT * FROM user WHERE id = ?'),
+            ('SELECT * FROM user WHERE id = 12', 'SELECT * FROM user WHERE id = ?'),
+            ("SELECT * FROM user WHERE name = 'it''s' AND score > 1.5", 'SELECT * FROM user WHERE name = ? AND score > ?'),
+            ('SELECT * FROM user WHERE id IN (?, ?, ?)', 'SELECT * FROM user WHERE id IN (?)'),
+            ('SELECT * FROM user WHERE id IN (%s,%s)', 'SELECT * FROM user WHERE id IN (?)'),
+            ('SELECT * FROM user WHERE id IN (:id_1, :id_2)', 'SELECT * FROM user WHERE id IN (?)'),
+            ('SELECT * FROM user WHERE id IN (%(id_1)s, %(id_2)s)', 'SELECT * FROM user WHERE id IN (?)'),
+            ('SELECT user1.id\n  FROM user1', 'SELECT user1.id FROM user1'),
+        ]
+
+        for statement, fingerprint in data:
+            self.assert_equal(fingerprint, instrumentation.fingerprint(statement))
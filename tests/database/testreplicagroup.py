@@ -0,0 +1,115 @@
+from tests.testcase import TestCase
+from edmunds.database.replicagroup import ReplicaGroup
+from sqlalchemy import create_engine
+import mock
+import time
+
+
+class TestReplicaGroup(TestCase):
+    """
+    Test the Replica Group
+    """
+
+    def test_unknown_strategy(self):
+        """
+        Test unknown strategy
+        """
+
+        with self.assert_raises_regexp(RuntimeError, 'unknown strategy'):
+            ReplicaGroup('group', mock.Mock(), [], strategy='random')
+
+    def test_no_replicas(self):
+        """
+        Test reading without replicas
+        """
+
+        primary = mock.Mock()
+        group = ReplicaGroup('group', primary, [])
+
+        self.assert_equal(primary, group.get_replica())
+
+    def test_round_robin(self):
+        """
+        Test round-robin
+        """
+
+        replicas = [mock.Mock(), mock.Mock(), mock.Mock()]
+        group = ReplicaGroup('group', mock.Mock(), replicas)
+
+        self.assert_equal(replicas + replicas, [group.get_replica() for _ in range(6)])
+
+    def test_least_latency(self):
+        """
+        Test least-latency
+        """
+
+        replicas = [create_engine('sqlite://'), create_engine('sqlite://')]
+        group = ReplicaGroup('group', mock.Mock(), replicas, strategy=ReplicaGroup.LEAST_LATENCY)
+
+        with mock.patch('edmunds.database.replicagroup.random', return_value=1.0):
+            # Nothing measured yet
+            self.assert_in(group.get_replica(), replicas)
+
+            # Measure the first replica
+            replicas[0].execute('SELECT 1')
+            for _ in range(10):
+                self.assert_equal(replicas[1], group.get_replica())
+
+        # Single replica
+        group = ReplicaGroup('group', mock.Mock(), replicas[0:1], strategy=ReplicaGroup.LEAST_LATENCY)
+        self.assert_equal(replicas[0], group.get_replica())
+
+    def test_least_latency_recovery(self):
+        """
+        Test a slow replica recovers by probing
+        """
+
+        replicas = [create_engine('sqlite://'), create_engine('sqlite://')]
+        group = ReplicaGroup('group', mock.Mock(), replicas, strategy=ReplicaGroup.LEAST_LATENCY)
+
+        # The first replica was slow once
+        group._latencies = [1.0, 0.01]
+        with mock.patch('edmunds.database.replicagroup.random', return_value=1.0):
+            self.assert_equal(replicas[1], group.get_replica())
+
+        # Probing measures the first replica again
+        with mock.patch('edmunds.database.replicagroup.random', return_value=0.0), \
+                mock.patch('edmunds.database.replicagroup.randrange', return_value=0):
+            for _ in range(50):
+                group.get_replica().execute('SELECT 1')
+        self.assert_less(group._latencies[0], 0.01)
+
+        with mock.patch('edmunds.database.replicagroup.random', return_value=1.0):
+            for _ in range(10):
+                self.assert_equal(replicas[0], group.get_replica())
+
+    def test_stickiness(self):
+        """
+        Test reading from the primary after a write
+        """
+
+        app = self.create_application()
+        primary = mock.Mock()
+        replica = mock.Mock()
+        group = ReplicaGroup('group', primary, [replica], stickiness=10)
+        not_sticky_group = ReplicaGroup('not_sticky_group', primary, [replica])
+
+        # Outside of app context
+        group.stick()
+        self.assert_false(group.is_sticky())
+
+        with app.app_context():
+            self.assert_false(group.is_sticky())
+            self.assert_equal(replica, group.get_replica())
+
+            group.stick()
+            not_sticky_group.stick()
+
+            self.assert_true(group.is_sticky())
+            self.assert_equal(primary, group.get_replica())
+            self.assert_false(not_sticky_group.is_sticky())
+            self.assert_equal(replica, not_sticky_group.get_replica())
+
+            # Window has passed
+            with mock.patch('time.time', return_value=time.time() + 11):
+                self.assert_false(group.is_sticky())
@@ -0,0 +1,120 @@
+from tests.testcase import TestCase
+from edmunds.database.replicagroup import ReplicaGroup
+from edmunds.database.routingsession import RoutingSession
+from sqlalchemy import column, create_engine, table, text
+
+
+class TestRoutingSession(TestCase):
+    """
+    Test the Routing Session
+    """
+
+    def set_up(self):
+        """
+        Set up the test case
+        """
+
+        super(TestRoutingSession, self).set_up()
+
+        self.primary = create_engine('sqlite://')
+        self.replica = create_engine('sqlite://')
+        for name, engine in (('primary', self.primary), ('replica', self.replica)):
+            engine.execute('CREATE TABLE names (name VARCHAR(10))')
+            engine.execute("INSERT INTO names VALUES ('%s')" % name)
+
+        self.group = ReplicaGroup('group', self.primary, [self.replica], stickiness=10)
+
+    def test_read(self):
+        """
+        Test reads go to the replica
+        """
+
+        session = RoutingSession(self.group)
+
+        self.assert_equal(self.replica, session.get_bind(clause=text('SELECT name FROM names')))
+        self.assert_equal(['replica'], self._names(session))
+
+    def test_write(self):
+        """
+        Test writes go to the primary
+        """
+
+        app = self.create_application()
+
+        with app.app_context():
+            session = RoutingSession(self.group)
+
+            session.execute("INSERT INTO names VALUES ('written')")
+            # Transaction stays on the primary
+            self.assert_equal(['primary', 'written'], self._names(session))
+            session.commit()
+
+            # Client sticks to the primary after commit
+            self.assert_true(self.group.is_sticky())
+            self.assert_equal(['primary', 'written'], self._names(session))
+
+    def test_rollback(self):
+        """
+        Test rollback ends the transaction on the primary
+        """
+
+        session = RoutingSession(self.group)
+
+        session.execute("INSERT INTO names VALUES ('written')")
+        session.rollback()
+
+        self.assert_equal(['replica'], self._names(session))
+        self.assert_equal(['primary'], [row[0] for row in self.primary.execute('SELECT name FROM names')])
+
+    def test_select_for_update(self):
+        """
+        Test locking reads go to the primary
+        """
+
+        session = RoutingSession(self.group)
+        names = self._names_table()
+
+        self.assert_equal(self.replica, session.get_bind(clause=names.select()))
+        self.assert_equal(self.primary, session.get_bind(clause=names.select().with_for_update()))
+
+    def test_use_primary(self):
+        """
+        Test pinning a transaction to the primary
+        """
+
+        app = self.create_application()
+
+        with app.app_context():
+            session = RoutingSession(self.group)
+
+            session.use_primary()
+            self.assert_equal(['primary'], self._names(session))
+            session.commit()
+
+            # Only reads do not stick to the primary
+            self.assert_false(self.group.is_sticky())
+            self.assert_equal(['replica'], self._names(session))
+
+            session.use_primary()
+            session.rollback()
+            self.assert_equal(['replica'], self._names(session))
+
+    def _names(self, session):
+        """
+        Read the names
+        :param session: The session
+        :type  session: RoutingSession
+        :return:        The names
+        :rtype:         list
+        """
+
+        return [row[0] for row in session.execute('SELECT name FROM names ORDER BY name')]
+
+    def _names_table(self):
+        """
+        Get the names table
+        :return:    The table
+        :rtype:     sqlalchemy.sql.expression.TableClause
+        """
+
+        return table('names', column('name'))
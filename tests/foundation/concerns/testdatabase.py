@@ -2,6 +2,10 @@
 from tests.testcase import TestCase
 from sqlalchemy.engine.base import Engine
 from sqlalchemy.orm.scoping import scoped_session
+from sqlalchemy import text
+from edmunds.database.routingsession import RoutingSession
+from edmunds.globals import request
+import time
 
 
 class TestDatabase(TestCase):
@@ -101,3 +105,102 @@ class TestDatabase(TestCase):
 
             self.assert_equal_deep(app.database_session(), app.database_session())
             self.assert_equal_deep(app.database_session(), app.database_session('mysql'))
+
+    def test_replica_group_session(self):
+        """
+        Test session of a replica group
+        :return:    void
+        """
+
+        primary_file = self.rand_str(20)
+        replica_file = self.rand_str(20)
+
+        # Write config
+        self.write_config([
+            "from edmunds.database.drivers.sqlite import Sqlite \n",
+            "from edmunds.storage.drivers.file import File \n",
+            "APP = { \n",
+            "   'database': { \n",
+            "       'enabled': True, \n",
+            "       'instances': [ \n",
+            "           { \n",
+            "               'name': 'primary',\n",
+            "               'driver': Sqlite,\n",
+            "               'file': '%s',\n" % primary_file,
+            "           }, \n",
+            "           { \n",
+            "               'name': 'replica',\n",
+            "               'driver': Sqlite,\n",
+            "               'file': '%s',\n" % replica_file,
+            "           }, \n",
+            "       ], \n",
+            "       'groups': [ \n",
+            "           { \n",
+            "               'name': 'group',\n",
+            "               'primary': 'primary',\n",
+            "               'replicas': ['replica'],\n",
+            "               'stickiness': 10,\n",
+            "           }, \n",
+            "       ], \n",
+            "   }, \n",
+            "   'storage': { \n",
+            "       'instances': [ \n",
+            "           { \n",
+            "               'name': 'file',\n",
+            "               'driver': File,\n",
+            "           }, \n",
+            "       ], \n",
+            "   }, \n",
+            "} \n",
+        ])
+
+        # Create app
+        app = self.create_application()
+        rule = '/' + self.rand_str(20)
+
+        @app.route(rule)
+        def handle():
+            session = app.database_session('group')
+            if request.args.get('write'):
+                session.execute('CREATE TABLE names (name VARCHAR(10))')
+                session.commit()
+            return session.get_bind(clause=text('SELECT name FROM names')).url.database
+
+        with app.test_client() as c:
+            # Reads go to the replica
+            self.assert_equal(app.database_engine('replica').url.database, c.get(rule).get_data(True))
+
+            # Client reads from the primary after a write
+            response = c.get(rule + '?write=1')
+            self.assert_equal(app.database_engine('primary').url.database, response.get_data(True))
+            self.assert_in('edmunds_database_primary_group=', response.headers['Set-Cookie'])
+            self.assert_equal(app.database_engine('primary').url.database, c.get(rule).get_data(True))
+
+        with app.test_client() as c:
+            # Other clients still read from the replica
+            self.assert_equal(app.database_engine('replica').url.database, c.get(rule).get_data(True))
+
+        with app.test_client() as c:
+            # Windows beyond the stickiness are clamped
+            c.set_cookie('localhost', 'edmunds_database_primary_group', '%f' % (time.time() + 1000))
+            before = time.time()
+            response = c.get(rule)
+            self.assert_equal(app.database_engine('primary').url.database, response.get_data(True))
+            cookie = response.headers['Set-Cookie']
+            until = float(cookie[len('edmunds_database_primary_group='):cookie.index(';')])
+            self.assert_greater_equal(until, before + 10)
+            self.assert_less_equal(until, time.time() + 10)
+
+            # Invalid windows are ignored
+            for value in ['nan', 'invalid']:
+                c.set_cookie('localhost', 'edmunds_database_primary_group', value)
+                self.assert_equal(app.database_engine('replica').url.database, c.get(rule).get_data(True))
+
+        with app.app_context():
+            self.assert_is_instance(app.database_session('group'), scoped_session)
+            self.assert_is_instance(app.database_session('group')(), RoutingSession)
+            self.assert_equal(app.database_session('group'), app.database_session('group'))
+
+        for database_file in (primary_file, replica_file):
+            if app.fs().exists(database_file):
+                app.fs().delete(database_file)
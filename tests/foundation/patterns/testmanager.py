@@ -182,6 +182,62 @@ class TestManager(TestCase):
         with self.assert_raises_regexp(RuntimeError, 'Re-declaring instance'):
             manager._load()
 
+    def test_composed_instances(self):
+        """
+        Test instances composed of other instances
+        :return:    void
+        """
+
+        # Make manager
+        manager = MyManager(self.app, [
+            {
+                'name': 'composed',
+                'driver': list,
+                'instances': ['object', 'dict'],
+            },
+            {
+                'name': 'object',
+                'driver': object,
+                'object': 1,
+            },
+            {
+                'name': 'dict',
+                'driver': dict,
+                'dict': 2,
+            },
+        ])
+
+        composed = manager.get('composed')
+        self.assert_equal(2, len(composed))
+        self.assert_is(manager.get('object'), composed[0])
+        self.assert_is(manager.get('dict'), composed[1])
+
+        with self.assert_raises_regexp(RuntimeError, 'only be resolved this way while loading'):
+            manager._resolve_loading_instance('object')
+
+    def test_circular_instances(self):
+        """
+        Test instances composed of each other
+        :return:    void
+        """
+
+        # Make manager
+        manager = MyManager(self.app, [
+            {
+                'name': 'first',
+                'driver': list,
+                'instances': ['second'],
+            },
+            {
+                'name': 'second',
+                'driver': list,
+                'instances': ['first'],
+            },
+        ])
+
+        with self.assert_raises_regexp(RuntimeError, 'Circular reference'):
+            manager._load()
+
 
 class MyManager(Manager):
 
@@ -192,3 +248,7 @@ class MyManager(Manager):
     def _create_dict(self, config):
 
         return config['name'], config['dict']
+
+    def _create_list(self, config):
+
+        return [self._resolve_loading_instance(name) for name in config['instances']]
@@ -351,6 +351,57 @@ class TestRoute(TestCase):
             self.assert_equal(MyRequestMiddleware.__name__ + '.after', TestRoute.cache['timeline'][3])
             self.assert_equal(MySecondRequestMiddleware.__name__ + '.after', TestRoute.cache['timeline'][4])
 
+    def test_stateless_middleware_and_controller(self):
+        """
+        Test stateless middleware and controllers are reused
+        :return:    void
+        """
+
+        rule = '/' + self.rand_str(20)
+        rule2 = '/' + self.rand_str(20)
+        TestRoute.cache['constructed'] = []
+
+        # Add routes
+        self.app.route(rule, middleware=[MyStatelessRequestMiddleware, MyRequestMiddleware], uses=(MyStatelessController, 'get'))
+        self.app.route(rule2, middleware=[MyRequestMiddleware], uses=(MyController, 'get'))
+
+        # Call routes
+        with self.app.test_client() as c:
+            for _ in range(3):
+                c.get(rule)
+                c.get(rule2)
+
+        self.assert_equal(1, TestRoute.cache['constructed'].count(MyStatelessRequestMiddleware.__name__))
+        self.assert_equal(1, TestRoute.cache['constructed'].count(MyStatelessController.__name__))
+        self.assert_equal(6, TestRoute.cache['timeline'].count(MyRequestMiddleware.__name__ + '.before'))
+        self.assert_equal(3, TestRoute.cache['timeline'].count(MyStatelessRequestMiddleware.__name__ + '.after'))
+        self.assert_equal(6, TestRoute.cache['timeline'].count('handle_route'))
+
+    def test_middleware_after_first_request(self):
+        """
+        Test adding middleware after the route handled a request
+        :return:    void
+        """
+
+        rule = '/' + self.rand_str(20)
+
+        # Add route
+        route = self.app.route(rule, uses=(MyController, 'get'))
+
+        # Call route
+        with self.app.test_client() as c:
+            c.get(rule)
+            self.assert_equal(['handle_route'], TestRoute.cache['timeline'])
+
+            # Add middleware
+            route.middleware(MyRequestMiddleware)
+
+            TestRoute.cache['timeline'] = []
+            c.get(rule)
+            self.assert_equal(3, len(TestRoute.cache['timeline']))
+            self.assert_equal(MyRequestMiddleware.__name__ + '.before', TestRoute.cache['timeline'][0])
+            self.assert_equal(MyRequestMiddleware.__name__ + '.after', TestRoute.cache['timeline'][2])
+
 
 class MyController(Controller):
 
@@ -423,3 +474,24 @@ class MyThirdRequestMiddleware(RequestMiddleware):
         TestRoute.cache['timeline'].append(self.__class__.__name__ + '.after')
 
         return super(MyThirdRequestMiddleware, self).after(response)
+
+
+class MyStatelessController(MyController):
+
+    stateless = True
+
+    def __init__(self, app):
+        TestRoute.cache['constructed'].append(self.__class__.__name__)
+        super(MyStatelessController, self).__init__(app)
+
+
+class MyStatelessRequestMiddleware(MyRequestMiddleware):
+    """
+    Stateless Request Middleware class
+    """
+
+    stateless = True
+
+    def __init__(self, app):
+        TestRoute.cache['constructed'].append(self.__class__.__name__)
+        super(MyStatelessRequestMiddleware, self).__init__(app)
@@ -3,6 +3,7 @@ from tests.testcase import TestCase
 from edmunds.localization.translations.drivers.configtranslator import ConfigTranslator
 from edmunds.localization.translations.exceptions.translationerror import TranslationError
 from edmunds.localization.translations.exceptions.sentencefillererror import SentenceFillerError
+import mock
 import os
 
 
@@ -204,6 +205,104 @@ class TestLocalizator(TestCase):
 
                 self.assert_equal(expected, localizator.translate(key, params))
 
+    def test_translate_many(self):
+        """
+        Test translate many
+        :return:    void
+        """
+
+        rule = '/' + self.rand_str(20)
+
+        # Write config and create app
+        self.write_config(self.config)
+        app = self.create_application()
+        translator = app.localization().translator()
+
+        directory = app.fs().path(self.logs_directory)
+        self.clear_paths.append(directory)
+
+        translations = [
+            ('beautiful', {'name': 'Steve'}),
+            ('smashing', None),
+            ('beautiful', {'name': 'Jane'}),
+        ]
+
+        data = [
+            ('en', ['This is a beautiful translation. Is it not, Steve?', 'A smashing sentence!', 'This is a beautiful translation. Is it not, Jane?']),
+            ('nl', ['Dit is een prachtige vertaling. Nietwaar, Steve?', 'A smashing sentence!', 'Dit is een prachtige vertaling. Nietwaar, Jane?']),
+        ]
+
+        for locale_str, expected in data:
+            with app.test_request_context(rule):
+                localizator = app.localization().localizator(None, translator, given_locale_strings=[locale_str])
+
+                self.assert_equal(expected, localizator.translate_many(translations))
+                self.assert_equal([], localizator.translate_many([]))
+
+        # Config is checked once per localizator
+        with app.test_request_context(rule):
+            localizator = app.localization().localizator(None, translator, given_locale_strings=['en'])
+
+            with mock.patch.object(app, 'config', wraps=app.config) as config:
+                localizator.translate_many(translations)
+                self.assert_not_in(mock.call('app.localization.translations.enabled', False), config.call_args_list)
+
+        # Fallback fails as well
+        with app.test_request_context(rule):
+            localizator = app.localization().localizator(None, translator, given_locale_strings=['nl'])
+
+            self.assert_equal(['A smashing sentence!', None, 'A smashing sentence!'],
+                              localizator.translate_many([('smashing', None), ('unknownkey', None), ('smashing', None)]))
+            self.assert_true(self._is_in_log_files(app, directory, 'Could not find the sentence for locale "en" and key "unknownkey".'))
+
+            # A single translation raises
+            with self.assert_raises_regexp(TranslationError, 'Could not find the sentence for locale "en" and key "unknownkey".'):
+                localizator.translate('unknownkey')
+
+    def test_prefetch(self):
+        """
+        Test prefetch
+        :return:    void
+        """
+
+        rule = '/' + self.rand_str(20)
+
+        # Write config and create app
+        self.write_config(self.config)
+        app = self.create_application()
+        translator = app.localization().translator()
+
+        with app.test_request_context(rule):
+            localizator = app.localization().localizator(None, translator, given_locale_strings=['en'])
+            localizator.prefetch([
+                ('beautiful', {'name': 'Steve'}),
+                ('smashing', None),
+                ('beautiful', {'name': ['Steve']}),
+            ])
+
+            with mock.patch.object(translator, 'get', wraps=translator.get) as get:
+                self.assert_equal('This is a beautiful translation. Is it not, Steve?', localizator.translate('beautiful', {'name': 'Steve'}))
+                self.assert_equal('A smashing sentence!', localizator.translate('smashing'))
+                self.assert_equal('A smashing sentence!', localizator.translate('smashing', {}))
+                self.assert_equal(0, get.call_count)
+
+                # Not prefetched
+                self.assert_equal('This is a beautiful translation. Is it not, Jane?', localizator.translate('beautiful', {'name': 'Jane'}))
+                self.assert_equal(1, get.call_count)
+
+            # Equal values of another type are not the same translation
+            localizator.prefetch([('beautiful', {'name': 1})])
+            with mock.patch.object(translator, 'get', wraps=translator.get) as get:
+                self.assert_equal('This is a beautiful translation. Is it not, 1?', localizator.translate('beautiful', {'name': 1}))
+                self.assert_equal(0, get.call_count)
+                self.assert_equal('This is a beautiful translation. Is it not, True?', localizator.translate('beautiful', {'name': True}))
+                self.assert_equal(1, get.call_count)
+
+            # Failed translations are not prefetched
+            localizator.prefetch([('unknownkey', None)])
+            with self.assert_raises(TranslationError):
+                localizator.translate('unknownkey')
+
     def _is_in_log_files(self, app, directory, string, starts_with = None):
         """
         Check if string is in log files
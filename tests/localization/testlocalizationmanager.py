@@ -9,6 +9,7 @@ from edmunds.localization.localization.models.number import Number
 from edmunds.localization.localization.models.time import Time
 from babel.core import Locale
 from edmunds.localization.translations.drivers.configtranslator import ConfigTranslator
+import mock
 
 
 class TestLocalizationManager(TestCase):
@@ -503,6 +504,54 @@ class TestLocalizationManager(TestCase):
                 self.assert_equal(language_sup, locale.language)
                 self.assert_equal(territory_sup, locale.territory)
 
+    def test_negotiated_locales(self):
+        """
+        Test the negotiated locales are cached
+        :return:    void
+        """
+
+        rule = '/' + self.rand_str(20)
+
+        # Write location settings
+        self.write_config(self.valid_config)
+        app = self.create_application()
+        manager = LocalizationManager(app, cache_size=2)
+
+        user_agent = 'Mozilla/5.0 (Linux; U; Android 2.3.4; nl-be; GT-S5670 Build/GINGERBREAD) AppleWebKit/533.1 (KHTML, like Gecko) Version/4.0 Mobile Safari/533.1'
+
+        with mock.patch.object(manager, '_get_locale', wraps=manager._get_locale) as get_locale:
+            with app.test_request_context(rule, environ_base={'HTTP_ACCEPT_LANGUAGE': 'fr-CH, fr;q=0.9', 'HTTP_USER_AGENT': user_agent}):
+                most_accurate_locale, supported_locale, fallback_locale = manager._get_negotiated_locales()
+                self.assert_equal(('fr', 'CH'), (most_accurate_locale.language, most_accurate_locale.territory))
+                self.assert_equal(('fr', None), (supported_locale.language, supported_locale.territory))
+                self.assert_equal(('en', 'US'), (fallback_locale.language, fallback_locale.territory))
+                self.assert_equal(3, get_locale.call_count)
+
+            with app.test_request_context(rule, environ_base={'HTTP_ACCEPT_LANGUAGE': 'fr-CH, fr;q=0.9', 'HTTP_USER_AGENT': user_agent}):
+                self.assert_equal((most_accurate_locale, supported_locale, fallback_locale), manager._get_negotiated_locales())
+                self.assert_equal(3, get_locale.call_count)
+
+                # Given locales are part of the key
+                most_accurate_locale, supported_locale, _ = manager._get_negotiated_locales(given_locale_strings=['nl_be'])
+                self.assert_equal(('nl', 'BE'), (most_accurate_locale.language, most_accurate_locale.territory))
+                self.assert_equal(('nl', 'BE'), (supported_locale.language, supported_locale.territory))
+                # Fallback locale is determined once
+                self.assert_equal(5, get_locale.call_count)
+
+            # Least recently used is evicted
+            with app.test_request_context(rule, environ_base={'HTTP_ACCEPT_LANGUAGE': 'en', 'HTTP_USER_AGENT': user_agent}):
+                manager._get_negotiated_locales()
+                self.assert_equal(7, get_locale.call_count)
+            with app.test_request_context(rule, environ_base={'HTTP_ACCEPT_LANGUAGE': 'fr-CH, fr;q=0.9', 'HTTP_USER_AGENT': user_agent}):
+                manager._get_negotiated_locales()
+                self.assert_equal(9, get_locale.call_count)
+
+        # Supported and fallback locales are read from config once
+        with mock.patch.object(app, 'config', wraps=app.config) as config:
+            manager._get_supported_locale_strings()
+            manager._get_fallback_locale_strings()
+            self.assert_equal(0, config.call_count)
+
     def test_localization(self):
         """
         Localization
@@ -0,0 +1,224 @@
+
+from tests.testcase import TestCase
+from edmunds.localization.translations.drivers.catalogtranslator import CatalogTranslator
+from edmunds.localization.translations.exceptions.translationerror import TranslationError
+from edmunds.localization.translations.exceptions.sentencefillererror import SentenceFillerError
+from edmunds.localization.localization.models.time import Time
+from edmunds.localization.localization.models.number import Number
+from edmunds.localization.localization.models.localization import Localization
+from babel.core import Locale
+from babel.dates import get_timezone
+import mock
+
+
+class TestCatalogTranslator(TestCase):
+    """
+    Test the Catalog Translator
+    """
+
+    def set_up(self):
+        """
+        Set up test
+        :return:    void
+        """
+        super(TestCatalogTranslator, self).set_up()
+
+        self.config = [
+            "from edmunds.localization.translations.drivers.catalogtranslator import CatalogTranslator \n",
+            "APP = { \n",
+            "   'localization': { \n",
+            "       'enabled': True, \n",
+            "       'locale': { \n",
+            "           'fallback': 'en', \n",
+            "           'supported': ['en', 'nl'], \n",
+            "       }, \n",
+            "       'timezonefallback': 'Europe/Brussels', \n",
+            "       'translations': { \n",
+            "           'enabled': True, \n",
+            "           'instances': [ \n",
+            "               { \n",
+            "                   'name': 'catalogtranslator',\n",
+            "                   'driver': CatalogTranslator,\n",
+            "               }, \n",
+            "           ], \n",
+            "           'strings': { \n",
+            "               'en': { \n",
+            "                   'beautiful': 'This is a beautiful translation. Is it not, {name}?', \n",
+            "                   'smashing': 'A smashing sentence!', \n",
+            "                   'errors': { \n",
+            "                       'required': '{field} is required.', \n",
+            "                   }, \n",
+            "               }, \n",
+            "               'nl': { \n",
+            "                   'beautiful': 'Dit is een prachtige vertaling. Nietwaar, {name}?', \n",
+            "               }, \n",
+            "           }, \n",
+            "       }, \n",
+            "   }, \n",
+            "} \n",
+        ]
+
+    def test_get_unknown_key(self):
+        """
+        Test get unknown key
+        :return:    void
+        """
+
+        rule = '/' + self.rand_str(20)
+
+        # Write config and create app
+        self.write_config(self.config)
+        app = self.create_application()
+
+        data = [
+            ('en', 'beautiful', {}),
+            ('nl', 'beautiful', {}),
+        ]
+
+        for locale_str, key, params in data:
+            with app.test_request_context(rule):
+                locale = Locale.parse(locale_str, sep='_')
+                time_zone = get_timezone('Europe/Brussels')
+                time_obj = Time(locale=locale, time_zone=time_zone)
+                number_obj = Number(locale=locale)
+                localization_obj = Localization(locale=locale, number=number_obj, time=time_obj)
+
+                # Fetch driver
+                driver = app.localization().translator()
+                self.assert_is_instance(driver, CatalogTranslator)
+
+                with self.assert_raises_regexp(SentenceFillerError, 'Param "name" could not be replaced. \(locale "%s" and key "%s"\)' % (locale_str, key)):
+                    driver.get(localization_obj, key, params)
+
+    def test_get_errors(self):
+        """
+        Test get errors
+        :return:    void
+        """
+
+        rule = '/' + self.rand_str(20)
+
+        # Write config and create app
+        self.write_config(self.config)
+        app = self.create_application()
+
+        data = [
+            ('en', 'unknownkey1', {}),
+            ('nl', 'unknownkey2', {}),
+            ('nl_BE', 'unknownkey3', {}),
+            ('bo', 'unknownkey1', {}),
+            ('ar', 'unknownkey2', {}),
+            ('nl', 'smashing', {}),
+            ('nl_BE', 'smashing', {}),
+            ('nl_BE', 'beautiful', {'name': 'Steve'}),
+        ]
+
+        for locale_str, key, params in data:
+            with app.test_request_context(rule):
+                locale = Locale.parse(locale_str, sep='_')
+                time_zone = get_timezone('Europe/Brussels')
+                time_obj = Time(locale=locale, time_zone=time_zone)
+                number_obj = Number(locale=locale)
+                localization_obj = Localization(locale=locale, number=number_obj, time=time_obj)
+
+                # Fetch driver
+                driver = app.localization().translator()
+                self.assert_is_instance(driver, CatalogTranslator)
+
+                with self.assert_raises_regexp(TranslationError, 'Could not find the sentence for locale "%s" and key "%s".' % (locale_str, key)):
+                    driver.get(localization_obj, key, params)
+
+    def test_get(self):
+        """
+        Test get
+        :return:    void
+        """
+
+        rule = '/' + self.rand_str(20)
+
+        # Write config and create app
+        self.write_config(self.config)
+        app = self.create_application()
+
+        data = [
+            ('en', 'A smashing sentence!', 'smashing', {}),
+            ('en', 'This is a beautiful translation. Is it not, Steve?', 'beautiful', {'name': 'Steve'}),
+            ('nl', 'Dit is een prachtige vertaling. Nietwaar, Steve?', 'beautiful', {'name': 'Steve'}),
+            ('en', 'Name is required.', 'errors.required', {'field': 'Name'}),
+            # Keys are matched like config keys
+            ('en', 'A smashing sentence!', 'SMASHING', {}),
+            ('en', 'Name is required.', 'Errors_Required', {'field': 'Name'}),
+        ]
+
+        for locale_str, expected, key, params in data:
+            with app.test_request_context(rule):
+                locale = Locale.parse(locale_str, sep='_')
+                time_zone = get_timezone('Europe/Brussels')
+                time_obj = Time(locale=locale, time_zone=time_zone)
+                number_obj = Number(locale=locale)
+                localization_obj = Localization(locale=locale, number=number_obj, time=time_obj)
+
+                # Fetch driver
+                driver = app.localization().translator()
+                self.assert_is_instance(driver, CatalogTranslator)
+
+                self.assert_equal(expected, driver.get(localization_obj, key, params))
+
+    def test_compile_errors(self):
+        """
+        Test invalid sentences are logged and only fail their key
+        :return:    void
+        """
+
+        config = [line.replace("'A smashing sentence!'", "'A --smashing__sentence--!'") for line in self.config]
+
+        # Write config and create app
+        self.write_config(config)
+        app = self.create_application()
+
+        with app.test_request_context('/' + self.rand_str(20)):
+            locale = Locale.parse('en', sep='_')
+            localization_obj = Localization(locale=locale, number=Number(locale=locale), time=Time(locale=locale, time_zone=get_timezone('Europe/Brussels')))
+
+            with mock.patch.object(app.logger, 'error') as error:
+                driver = app.localization().translator()
+            self.assert_equal(1, error.call_count)
+            self.assert_in('Using non-existing function "smashing". (locale "en" and key "smashing")', str(error.call_args[0][0]))
+
+            with self.assert_raises_regexp(SentenceFillerError, 'Using non-existing function "smashing". \(locale "en" and key "smashing"\)'):
+                driver.get(localization_obj, 'smashing')
+            self.assert_equal('This is a beautiful translation. Is it not, Steve?', driver.get(localization_obj, 'beautiful', {'name': 'Steve'}))
+
+    def test_reload(self):
+        """
+        Test reload
+        :return:    void
+        """
+
+        rule = '/' + self.rand_str(20)
+
+        # Write config and create app
+        self.write_config(self.config)
+        app = self.create_application()
+
+        with app.test_request_context(rule):
+            locale = Locale.parse('en', sep='_')
+            localization_obj = Localization(locale=locale, number=Number(locale=locale), time=Time(locale=locale, time_zone=get_timezone('Europe/Brussels')))
+
+            driver = app.localization().translator()
+            self.assert_equal('A smashing sentence!', driver.get(localization_obj, 'smashing'))
+
+            driver.reload({'en': {'smashing': 'A reloaded sentence!'}})
+            self.assert_equal('A reloaded sentence!', driver.get(localization_obj, 'smashing'))
+            with self.assert_raises_regexp(TranslationError, 'Could not find the sentence'):
+                driver.get(localization_obj, 'beautiful', {'name': 'Steve'})
+
+            # Invalid sentences only fail their key
+            driver.reload({'en': {'smashing': '--invalid--', 'reloaded': 'A reloaded sentence!'}})
+            with self.assert_raises(SentenceFillerError):
+                driver.get(localization_obj, 'smashing')
+            self.assert_equal('A reloaded sentence!', driver.get(localization_obj, 'reloaded'))
+
+            # Reload from config
+            driver.reload()
+            self.assert_equal('A smashing sentence!', driver.get(localization_obj, 'smashing'))
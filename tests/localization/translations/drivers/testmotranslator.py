@@ -0,0 +1,164 @@
+from tests.testcase import TestCase
+from edmunds.localization.translations.drivers.motranslator import MoTranslator
+from edmunds.localization.translations.exceptions.translationerror import TranslationError
+from edmunds.localization.translations.exceptions.sentencefillererror import SentenceFillerError
+from edmunds.localization.localization.models.time import Time
+from edmunds.localization.localization.models.number import Number
+from edmunds.localization.localization.models.localization import Localization
+from babel.core import Locale
+from babel.dates import get_timezone
+from babel.messages.catalog import Catalog
+from babel.messages.mofile import write_mo
+import os
+import shutil
+
+
+class TestMoTranslator(TestCase):
+    """
+    Test the Mo Translator
+    """
+
+    def set_up(self):
+        """
+        Set up test
+        :return:    void
+        """
+        super(TestMoTranslator, self).set_up()
+
+        self.directory = self.rand_str(20)
+        self.config = [
+            "from edmunds.localization.translations.drivers.motranslator import MoTranslator \n",
+            "from edmunds.storage.drivers.file import File \n",
+            "APP = { \n",
+            "   'localization': { \n",
+            "       'enabled': True, \n",
+            "       'locale': { \n",
+            "           'fallback': 'en', \n",
+            "           'supported': ['en', 'nl'], \n",
+            "       }, \n",
+            "       'timezonefallback': 'Europe/Brussels', \n",
+            "       'translations': { \n",
+            "           'enabled': True, \n",
+            "           'instances': [ \n",
+            "               { \n",
+            "                   'name': 'motranslator',\n",
+            "                   'driver': MoTranslator,\n",
+            "                   'directory': '%s',\n" % self.directory,
+            "                   'locales': ['en'],\n",
+            "               }, \n",
+            "           ], \n",
+            "       }, \n",
+            "   }, \n",
+            "   'storage': { \n",
+            "       'instances': [ \n",
+            "           { \n",
+            "               'name': 'file',\n",
+            "               'driver': File,\n",
+            "           }, \n",
+            "       ], \n",
+            "   }, \n",
+            "} \n",
+        ]
+
+        self.strings = {
+            'en': {
+                'beautiful': 'This is a beautiful translation. Is it not, {name}?',
+                'smashing': 'A smashing sentence!',
+                'eggs': 'I have got --plural:{eggs}__{eggs} egg__{eggs} eggs--.',
+            },
+            'nl': {
+                'beautiful': 'Dit is een prachtige vertaling. Nietwaar, {name}?',
+            },
+        }
+
+    def tear_down(self):
+        """
+        Tear down test
+        :return:    void
+        """
+
+        if hasattr(self, 'app'):
+            path = self.app.fs().path(self.directory)
+            if os.path.exists(path):
+                shutil.rmtree(path)
+
+        super(TestMoTranslator, self).tear_down()
+
+    def test_get(self):
+        """
+        Test get
+        :return:    void
+        """
+
+        driver = self._create_driver()
+
+        data = [
+            ('en', 'A smashing sentence!', 'smashing', {}),
+            ('en', 'This is a beautiful translation. Is it not, Steve?', 'beautiful', {'name': 'Steve'}),
+            ('en', 'I have got 2 eggs.', 'eggs', {'eggs': 2}),
+            ('nl', 'Dit is een prachtige vertaling. Nietwaar, Steve?', 'beautiful', {'name': 'Steve'}),
+        ]
+
+        for locale_str, expected, key, params in data:
+            self.assert_equal(expected, driver.get(self._localization(locale_str), key, params))
+
+    def test_get_errors(self):
+        """
+        Test get errors
+        :return:    void
+        """
+
+        driver = self._create_driver()
+
+        data = [
+            ('en', 'unknownkey1'),
+            ('nl', 'smashing'),
+            ('nl_BE', 'beautiful'),
+        ]
+
+        for locale_str, key in data:
+            with self.assert_raises_regexp(TranslationError, 'Could not find the sentence for locale "%s" and key "%s".' % (locale_str, key)):
+                driver.get(self._localization(locale_str), key, {'name': 'Steve'})
+
+        with self.assert_raises_regexp(SentenceFillerError, 'Param "name" could not be replaced. \(locale "en" and key "beautiful"\)'):
+            driver.get(self._localization('en'), 'beautiful', {})
+
+    def _create_driver(self):
+        """
+        Write the catalogs and create the driver
+        :return:    The driver
+        :rtype:     MoTranslator
+        """
+
+        self.write_config(self.config)
+        self.app = self.create_application()
+
+        for locale_str in self.strings:
+            catalog = Catalog(locale=locale_str)
+            for key in self.strings[locale_str]:
+                catalog.add(key, self.strings[locale_str][key])
+            path = self.app.fs().path(os.path.join(self.directory, locale_str, 'LC_MESSAGES', 'messages.mo'))
+            os.makedirs(os.path.dirname(path))
+            with open(path, 'wb') as f:
+                write_mo(f, catalog)
+
+        driver = self.app.localization().translator()
+        self.assert_is_instance(driver, MoTranslator)
+        # Preloaded
+        self.assert_in('en', driver._catalogs)
+        self.assert_not_in('nl', driver._catalogs)
+
+        return driver
+
+    def _localization(self, locale_str):
+        """
+        Create a localization
+        :param locale_str:  The locale
+        :type  locale_str:  str
+        :return:            The localization
+        :rtype:             Localization
+        """
+
+        locale = Locale.parse(locale_str, sep='_')
+        time_zone = get_timezone('Europe/Brussels')
+        return Localization(locale=locale, number=Number(locale=locale), time=Time(locale=locale, time_zone=time_zone))
@@ -0,0 +1,222 @@
+from tests.testcase import TestCase
+from edmunds.localization.translations.mocatalog import MoCatalog
+from edmunds.localization.translations.exceptions.translationerror import TranslationError
+from babel.messages.catalog import Catalog
+from babel.messages.mofile import write_mo
+import os
+import struct
+import tempfile
+
+
+class TestMoCatalog(TestCase):
+    """
+    Test the Mo Catalog
+    """
+
+    def set_up(self):
+        """
+        Set up the test case
+        """
+
+        super(TestMoCatalog, self).set_up()
+
+        self.messages = {
+            'beautiful': 'This is a beautiful translation. Is it not, {name}?',
+            'smashing': 'A smashing sentence!',
+            'unicode': u'Een pr\xe4chtige zin!',
+        }
+        for index in range(50):
+            self.messages['key%d' % index] = 'Sentence %d' % index
+
+        self.paths = []
+
+    def tear_down(self):
+        """
+        Tear down the test case
+        """
+
+        for path in self.paths:
+            os.remove(path)
+
+        super(TestMoCatalog, self).tear_down()
+
+    def test_binary_search(self):
+        """
+        Test catalog without hash table
+        """
+
+        catalog = Catalog(locale='en')
+        for key in self.messages:
+            catalog.add(key, self.messages[key])
+        catalog.add(('apple', 'apples'), ('{count} apple', '{count} apples'))
+
+        path = self._temp_path()
+        with open(path, 'wb') as f:
+            write_mo(f, catalog)
+
+        mo_catalog = MoCatalog(path)
+        self.assert_equal(0, mo_catalog._hash_size)
+        self._assert_messages(mo_catalog)
+        self.assert_equal('{count} apple', mo_catalog.get('apple'))
+        mo_catalog.close()
+
+    def test_hash_table(self):
+        """
+        Test catalog with hash table
+        """
+
+        path = self._temp_path()
+        self._write_hashed_mo(path, self.messages, 101)
+
+        mo_catalog = MoCatalog(path)
+        self.assert_equal(101, mo_catalog._hash_size)
+        self._assert_messages(mo_catalog)
+        mo_catalog.close()
+
+    def test_invalid(self):
+        """
+        Test invalid files
+        """
+
+        for content in (b'', b'not a catalog', b'\xde\x12\x04\x95'):
+            path = self._temp_path()
+            with open(path, 'wb') as f:
+                f.write(content)
+
+            with self.assert_raises_regexp(TranslationError, 'is not a valid .mo-file'):
+                MoCatalog(path)
+
+    def test_invalid_tables(self):
+        """
+        Test files with tables outside of the file
+        """
+
+        header = struct.pack('<7I', 0x950412de, 0, 1, 28, 36, 0, 0)
+        entries = struct.pack('<4I', 1, 44, 1, 46)
+        strings = b'a\0b\0'
+
+        invalid_files = [
+            # Too many messages
+            struct.pack('<7I', 0x950412de, 0, 1000, 28, 36, 0, 0) + entries + strings,
+            # Hash table outside of the file
+            struct.pack('<7I', 0x950412de, 0, 1, 28, 36, 101, 44) + entries + strings,
+        ]
+        for content in invalid_files:
+            path = self._temp_path()
+            with open(path, 'wb') as f:
+                f.write(content)
+
+            with self.assert_raises_regexp(TranslationError, 'is not a valid .mo-file'):
+                MoCatalog(path)
+
+        # Valid file
+        path = self._temp_path()
+        with open(path, 'wb') as f:
+            f.write(header + entries + strings)
+        mo_catalog = MoCatalog(path)
+        self.assert_equal('b', mo_catalog.get('a'))
+        mo_catalog.close()
+
+        # String outside of the file
+        path = self._temp_path()
+        with open(path, 'wb') as f:
+            f.write(header + struct.pack('<4I', 1, 44, 100, 46) + strings)
+        mo_catalog = MoCatalog(path)
+        with self.assert_raises_regexp(TranslationError, 'is not a valid .mo-file'):
+            mo_catalog.get('a')
+        mo_catalog.close()
+
+        # Hash table entry outside of the messages
+        path = self._temp_path()
+        with open(path, 'wb') as f:
+            f.write(struct.pack('<7I', 0x950412de, 0, 1, 28, 36, 3, 44) + entries + struct.pack('<3I', 5, 5, 5) + strings)
+        mo_catalog = MoCatalog(path)
+        with self.assert_raises_regexp(TranslationError, 'is not a valid .mo-file'):
+            mo_catalog.get('a')
+        mo_catalog.close()
+
+    def test_hash(self):
+        """
+        Test the hash matches hash_string of GNU gettext
+        """
+
+        data = [
+            (b'', 0),
+            (b'a', 97),
+            (b'hello', 7258927),
+            (b'smashing', 59369959),
+            (b'Hello, world!', 153469889),
+            (b'A much longer message id to wrap the hash', 19707928),
+            (u'pr\xe4chtige'.encode('utf-8'), 177787141),
+        ]
+
+        for msgid, hash_value in data:
+            self.assert_equal(hash_value, MoCatalog._hash(msgid), msg=msgid)
+
+    def _assert_messages(self, mo_catalog):
+        """
+        Assert the messages can be found
+        :param mo_catalog:  The catalog
+        :type  mo_catalog:  MoCatalog
+        """
+
+        for key in self.messages:
+            self.assert_equal(self.messages[key], mo_catalog.get(key))
+        self.assert_is_none(mo_catalog.get('unknown'))
+        self.assert_is_none(mo_catalog.get('key'))
+        self.assert_is_none(mo_catalog.get('zzz'))
+
+    def _temp_path(self):
+        """
+        Get a temporary path that is removed afterwards
+        :return:    The path
+        :rtype:     str
+        """
+
+        file_descriptor, path = tempfile.mkstemp(suffix='.mo')
+        os.close(file_descriptor)
+        self.paths.append(path)
+        return path
+
+    def _write_hashed_mo(self, path, messages, hash_size):
+        """
+        Write a .mo-file with a hash table as GNU msgfmt does
+        :param path:        The path
+        :type  path:        str
+        :param messages:    The messages
+        :type  messages:    dict
+        :param hash_size:   The size of the hash table
+        :type  hash_size:   int
+        """
+
+        keys = sorted(key.encode('utf-8') for key in messages)
+        values = [messages[key.decode('utf-8')].encode('utf-8') for key in keys]
+
+        hash_table = [0] * hash_size
+        for index, key in enumerate(keys):
+            hash_value = MoCatalog._hash(key)
+            position = hash_value % hash_size
+            increment = 1 + hash_value % (hash_size - 2)
+            while hash_table[position] != 0:
+                position = (position + increment) % hash_size
+            hash_table[position] = index + 1
+
+        originals_offset = 28
+        translations_offset = originals_offset + len(keys) * 8
+        hash_offset = translations_offset + len(keys) * 8
+        strings_offset = hash_offset + hash_size * 4
+
+        strings = b''
+        originals = []
+        translations = []
+        for table, items in ((originals, keys), (translations, values)):
+            for item in items:
+                table.append((len(item), strings_offset + len(strings)))
+                strings += item + b'\0'
+
+        with open(path, 'wb') as f:
+            f.write(struct.pack('<7I', 0x950412de, 0, len(keys), originals_offset, translations_offset, hash_size, hash_offset))
+            for length, offset in originals + translations:
+                f.write(struct.pack('<2I', length, offset))
+            f.write(struct.pack('<%dI' % hash_size, *hash_table))
+            f.write(strings)
@@ -8,6 +8,7 @@ from babel.core import Locale
 from babel.dates import get_timezone
 from datetime import date, datetime, time
 from edmunds.localization.translations.exceptions.sentencefillererror import SentenceFillerError
+import mock
 
 
 class TestSentenceFiller(TestCase):
@@ -316,3 +317,39 @@ class TestSentenceFiller(TestCase):
             localization = Localization(locale, number, time_instance)
             with self.assert_raises_regexp(SentenceFillerError, 'Using unknown gender "[\w\d\s]+".'):
                 sentence_filler.fill_in(localization, given, params=params)
+
+    def test_template_cache(self):
+        """
+        Test sentences are parsed once
+        :return:    void
+        """
+
+        sentence_filler = SentenceFiller(cache_size=2)
+        locale = Locale.parse('en', sep='_')
+        localization = Localization(locale, Number(locale), Time(locale, get_timezone('Europe/Brussels')))
+        sentence = 'I have got --plural:{eggs}__{eggs} egg__{eggs} eggs-- in my {hand}.'
+
+        with mock.patch.object(sentence_filler, '_parse', wraps=sentence_filler._parse) as parse:
+            self.assert_equal('I have got 1 egg in my left hand.', sentence_filler.fill_in(localization, sentence, params={'eggs': 1, 'hand': 'left hand'}))
+            self.assert_equal('I have got 2 eggs in my right hand.', sentence_filler.fill_in(localization, sentence, params={'eggs': 2, 'hand': 'right hand'}))
+            self.assert_equal(1, parse.call_count)
+
+            # Cache is bounded
+            sentence_filler.fill_in(localization, 'Second sentence.')
+            sentence_filler.fill_in(localization, 'Third sentence.')
+            sentence_filler.fill_in(localization, sentence, params={'eggs': 1, 'hand': 'hand'})
+            self.assert_equal(4, parse.call_count)
+
+    def test_plural_function_memo(self):
+        """
+        Test the plural function is compiled once per locale
+        :return:    void
+        """
+
+        sentence_filler = SentenceFiller()
+        locale = Locale.parse('ar', sep='_')
+        localization = Localization(locale, Number(locale), Time(locale, get_timezone('Europe/Brussels')))
+
+        self.assert_equal(sentence_filler._get_plural_function(locale), sentence_filler._get_plural_function(Locale.parse('ar', sep='_')))
+        self.assert_equal(6, sentence_filler._get_plural_function(locale)[0])
+        self.assert_equal('eggl', sentence_filler.fill_in(localization, '--plural:{eggs}__egg__eggs__eggz__eggk__eggl__eggo--', params={'eggs': 101}))
@@ -0,0 +1,210 @@
+from tests.testcase import TestCase
+from edmunds.http.requestmiddleware import RequestMiddleware
+from edmunds.metrics.registry import Registry
+from edmunds.metrics.metricslogger import MetricsLogger
+from edmunds.metrics.middleware.metricsmiddleware import MetricsMiddleware
+
+
+class TestMetricsServiceProvider(TestCase):
+    """
+    Test the Metrics Service Provider
+    """
+
+    def test_not_enabled(self):
+        """
+        Test not enabled
+        """
+
+        # Write config
+        self.write_config([
+            "APP = { \n",
+            "   'metrics': { \n",
+            "       'enabled': False, \n",
+            "   }, \n",
+            "} \n",
+            ])
+
+        # Create app
+        app = self.create_application()
+
+        # Test extension
+        self.assert_not_in('edmunds.metrics', app.extensions)
+        self.assert_is_none(app.metrics())
+        self.assert_not_is_instance(app.wsgi_app, MetricsMiddleware)
+
+    def test_register(self):
+        """
+        Test register
+        """
+
+        # Write config
+        self.write_config([
+            "APP = { \n",
+            "   'metrics': { \n",
+            "       'enabled': True, \n",
+            "       'buckets': [0.5, 1], \n",
+            "   }, \n",
+            "} \n",
+            ])
+
+        # Create app
+        app = self.create_application()
+
+        # Test extension
+        self.assert_in('edmunds.metrics', app.extensions)
+        self.assert_is_instance(app.metrics(), Registry)
+        self.assert_equal((0.5, 1), app.metrics().buckets)
+        self.assert_is_instance(app.wsgi_app, MetricsMiddleware)
+        self.assert_not_in('edmunds.metrics.logger', app.extensions)
+
+        # The endpoint is opt-in
+        self.assert_not_in('edmunds.metrics', app.view_functions)
+        with app.test_client() as c:
+            self.assert_equal(404, c.get('/metrics').status_code)
+
+    def test_endpoint(self):
+        """
+        Test the pull endpoint with request, route, controller and middleware metrics
+        """
+
+        # Write config
+        self.write_config([
+            "APP = { \n",
+            "   'metrics': { \n",
+            "       'enabled': True, \n",
+            "       'endpoint': '/custom-metrics', \n",
+            "   }, \n",
+            "} \n",
+            ])
+
+        # Create app
+        app = self.create_application()
+
+        rule = '/' + self.rand_str(20)
+        @app.route(rule, middleware=[MyRequestMiddleware])
+        def handle_route():
+            return 'response'
+
+        with app.test_client() as c:
+
+            self.assert_equal(404, c.get('/metrics').status_code)
+
+            self.assert_equal('response', c.get(rule).get_data(True))
+
+            response = c.get('/custom-metrics')
+            self.assert_equal(200, response.status_code)
+            self.assert_equal('text/plain; version=0.0.4; charset=utf-8', response.headers['Content-Type'])
+            metrics = response.get_data(True)
+
+        self.assert_in('# HELP edmunds_http_requests_total ', metrics)
+        self.assert_in('edmunds_http_requests_total{method="GET",status="200"} 1\n', metrics)
+        self.assert_in('edmunds_http_requests_total{method="GET",status="404"} 1\n', metrics)
+        self.assert_in('edmunds_http_request_duration_seconds_count{method="GET"} 2\n', metrics)
+        self.assert_in('edmunds_route_duration_seconds_count{endpoint="edmunds.route.%s"} 1\n' % rule, metrics)
+        self.assert_in('edmunds_controller_duration_seconds_count{endpoint="edmunds.route.%s"} 1\n' % rule, metrics)
+        self.assert_in('edmunds_middleware_duration_seconds_count{endpoint="edmunds.route.%s",middleware="MyRequestMiddleware",phase="before"} 1\n' % rule, metrics)
+        self.assert_in('edmunds_middleware_duration_seconds_count{endpoint="edmunds.route.%s",middleware="MyRequestMiddleware",phase="after"} 1\n' % rule, metrics)
+
+    def test_endpoint_allowed_ips(self):
+        """
+        Test the pull endpoint only allows the configured ips
+        """
+
+        # Write config
+        self.write_config([
+            "APP = { \n",
+            "   'metrics': { \n",
+            "       'enabled': True, \n",
+            "       'endpoint': '/metrics', \n",
+            "       'endpoint_allowed_ips': ['10.0.0.1'], \n",
+            "   }, \n",
+            "} \n",
+            ])
+
+        # Create app
+        app = self.create_application()
+
+        with app.test_client() as c:
+            self.assert_equal(403, c.get('/metrics').status_code)
+            self.assert_equal(403, c.get('/metrics', environ_base={'REMOTE_ADDR': '10.0.0.2'}).status_code)
+            self.assert_equal(200, c.get('/metrics', environ_base={'REMOTE_ADDR': '10.0.0.1'}).status_code)
+
+    def test_cache(self):
+        """
+        Test cache hits and misses
+        """
+
+        # Write config
+        self.write_config([
+            "from edmunds.cache.drivers.memory import Memory \n",
+            "APP = { \n",
+            "   'metrics': { \n",
+            "       'enabled': True, \n",
+            "   }, \n",
+            "   'cache': { \n",
+            "       'enabled': True, \n",
+            "       'instances': [ \n",
+            "           { \n",
+            "               'name': 'memory',\n",
+            "               'driver': Memory,\n",
+            "           }, \n",
+            "       ], \n",
+            "   }, \n",
+            "} \n",
+            ])
+
+        # Create app
+        app = self.create_application()
+
+        cache = app.cache()
+        cache.set('key', 'value')
+        cache.get('key')
+        cache.get('key2')
+        cache.get_many('key', 'key2', 'key3')
+
+        counters, histograms = app.metrics().collect()
+        self.assert_equal(2, counters[('edmunds_cache_hits_total', (('instance', 'memory'),))])
+        self.assert_equal(3, counters[('edmunds_cache_misses_total', (('instance', 'memory'),))])
+
+        # Lookups of tags and remember are not counted
+        cache.set('tagged', 'value', tags=['tag'])
+        cache.get('tagged')
+        self.assert_equal('value', cache.remember('remembered', 10, lambda: cache.get('key')))
+        self.assert_equal('value', cache.remember('remembered', 10, lambda: cache.get('key'), beta=0))
+
+        counters, histograms = app.metrics().collect()
+        # Tagged value, the lookup of the producer and the remembered value
+        self.assert_equal(5, counters[('edmunds_cache_hits_total', (('instance', 'memory'),))])
+        # Producing the remembered value
+        self.assert_equal(4, counters[('edmunds_cache_misses_total', (('instance', 'memory'),))])
+
+    def test_log(self):
+        """
+        Test periodic log
+        """
+
+        # Write config
+        self.write_config([
+            "APP = { \n",
+            "   'metrics': { \n",
+            "       'enabled': True, \n",
+            "       'log_interval': 60, \n",
+            "   }, \n",
+            "} \n",
+            ])
+
+        # Create app
+        app = self.create_application()
+
+        metrics_logger = app.extensions['edmunds.metrics.logger']
+        self.assert_is_instance(metrics_logger, MetricsLogger)
+        self.assert_equal(60, metrics_logger._interval)
+        self.assert_in(metrics_logger.start, app.before_first_request_funcs)
+
+
+class MyRequestMiddleware(RequestMiddleware):
+    """
+    Request Middleware class
+    """
+
+    pass
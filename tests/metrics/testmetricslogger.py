@@ -0,0 +1,30 @@
+
+from tests.testcase import TestCase
+from edmunds.metrics.metricslogger import MetricsLogger
+from edmunds.metrics.registry import Registry
+import mock
+import time
+
+
+class TestMetricsLogger(TestCase):
+    """
+    Test the Metrics Logger
+    """
+
+    def test_log(self):
+        """
+        Test logging periodically
+        """
+
+        app = mock.MagicMock()
+        registry = Registry()
+        registry.inc('requests_total')
+
+        metrics_logger = MetricsLogger(app, registry, interval=0.01)
+        metrics_logger.start()
+        time.sleep(0.1)
+        metrics_logger.stop()
+        metrics_logger._thread.join(1)
+
+        self.assert_greater(app.logger.info.call_count, 1)
+        self.assert_in('requests_total 1', app.logger.info.call_args[0][0])
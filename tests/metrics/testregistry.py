@@ -0,0 +1,120 @@
+
+from tests.testcase import TestCase
+from edmunds.metrics.registry import Registry
+
+
+class TestRegistry(TestCase):
+    """
+    Test the Registry
+    """
+
+    def test_default_buckets(self):
+        """
+        Test default buckets
+        """
+
+        registry = Registry()
+
+        self.assert_equal(1e-05, registry.buckets[0])
+        self.assert_equal(2e-05, registry.buckets[1])
+        self.assert_equal(100.0, registry.buckets[-1])
+        self.assert_equal(sorted(registry.buckets), list(registry.buckets))
+
+    def test_counter(self):
+        """
+        Test counter
+        """
+
+        registry = Registry()
+        registry.inc('requests', (('status', '200'),))
+        registry.inc('requests', (('status', '200'),), 2)
+        registry.inc('requests', (('status', '404'),))
+
+        counters, histograms = registry.collect()
+        self.assert_equal({
+            ('requests', (('status', '200'),)): 3,
+            ('requests', (('status', '404'),)): 1,
+        }, counters)
+        self.assert_equal({}, histograms)
+
+    def test_histogram(self):
+        """
+        Test histogram
+        """
+
+        registry = Registry(buckets=[1, 0.5])
+        self.assert_equal((0.5, 1), registry.buckets)
+
+        registry.observe('duration', 0.25)
+        registry.observe('duration', 0.5)
+        registry.observe('duration', 0.75)
+        registry.observe('duration', 2)
+
+        counters, histograms = registry.collect()
+        self.assert_equal({('duration', ()): [2, 1, 1, 3.5]}, histograms)
+
+    def test_threads(self):
+        """
+        Test recording in multiple threads
+        """
+
+        registry = Registry()
+
+        def record():
+            for _ in range(100):
+                registry.inc('requests')
+                registry.observe('duration', 0.01)
+
+        self.thread(record, 10)
+        record()
+
+        counters, histograms = registry.collect()
+        self.assert_equal(1100, counters[('requests', ())])
+        self.assert_equal(1100, sum(histograms[('duration', ())][0:-1]))
+
+        # Shards of finished threads are merged
+        self.assert_equal(1, len(registry._shards))
+        counters, histograms = registry.collect()
+        self.assert_equal(1100, counters[('requests', ())])
+
+    def test_fold_threads(self):
+        """
+        Test shards of finished threads are folded without collecting
+        """
+
+        registry = Registry()
+        registry.fold_interval = 4
+
+        def record():
+            registry.inc('requests')
+
+        for _ in range(8):
+            self.thread(record, 1)
+
+        # Folded when registering the 4th and 8th shard
+        self.assert_equal(1, len(registry._shards))
+        counters, histograms = registry.collect()
+        self.assert_equal(8, counters[('requests', ())])
+
+    def test_render(self):
+        """
+        Test render in the Prometheus text format
+        """
+
+        registry = Registry(buckets=[0.1, 1])
+        registry.describe('requests_total', 'Number of requests.')
+        registry.inc('requests_total', (('method', 'GET'), ('path', '"/a"')))
+        registry.observe('duration_seconds', 0.5, (('method', 'GET'),))
+        registry.observe('duration_seconds', 5, (('method', 'GET'),))
+
+        self.assert_equal('\n'.join([
+            '# HELP requests_total Number of requests.',
+            '# TYPE requests_total counter',
+            'requests_total{method="GET",path="\\"/a\\""} 1',
+            '# TYPE duration_seconds histogram',
+            'duration_seconds_bucket{method="GET",le="0.1"} 0',
+            'duration_seconds_bucket{method="GET",le="1"} 1',
+            'duration_seconds_bucket{method="GET",le="+Inf"} 2',
+            'duration_seconds_sum{method="GET"} 5.5',
+            'duration_seconds_count{method="GET"} 2',
+        ]) + '\n', registry.render())
@@ -0,0 +1,182 @@
+
+from tests.testcase import TestCase
+from edmunds.profiler.drivers.aggregate import Aggregate
+from cProfile import Profile
+from werkzeug.test import EnvironBuilder
+import os
+
+
+class TestAggregate(TestCase):
+    """
+    Test the Aggregate
+    """
+
+    def set_up(self):
+        """
+        Set up the test case
+        """
+
+        super(TestAggregate, self).set_up()
+
+        self.prefix = self.rand_str(20) + '.'
+        self.storage_directory = os.sep + 'storage' + os.sep
+        self.profs_directory = os.sep + 'profs' + os.sep
+        self.clear_paths = []
+
+    def tear_down(self):
+        """
+        Tear down the test case
+        """
+
+        super(TestAggregate, self).tear_down()
+
+        # Remove all profiler files
+        for directory in self.clear_paths:
+            for root, subdirs, files in os.walk(directory):
+                for file in files:
+                    if file.startswith(self.prefix):
+                        os.remove(os.path.join(root, file))
+
+    def test_aggregate(self):
+        """
+        Test the aggregate
+        """
+
+        # Write config
+        self.write_config([
+            "from edmunds.storage.drivers.file import File as StorageFile \n",
+            "from edmunds.profiler.drivers.aggregate import Aggregate \n",
+            "APP = { \n",
+            "   'debug': True, \n",
+            "   'storage': { \n",
+            "       'instances': [ \n",
+            "           { \n",
+            "               'name': 'file',\n",
+            "               'driver': StorageFile,\n",
+            "               'directory': '%s',\n" % self.storage_directory,
+            "               'prefix': '%s',\n" % self.prefix,
+            "           }, \n",
+            "       ], \n",
+            "   }, \n",
+            "   'profiler': { \n",
+            "       'enabled': True, \n",
+            "       'instances': [ \n",
+            "           { \n",
+            "               'name': 'aggregate',\n",
+            "               'driver': Aggregate,\n",
+            "               'directory': '%s',\n" % self.profs_directory,
+            "               'prefix': '%s',\n" % self.prefix,
+            "               'window': 60,\n",
+            "               'top': 5,\n",
+            "           }, \n",
+            "       ], \n",
+            "   }, \n",
+            "} \n",
+        ])
+
+        # Create app and fetch driver
+        app = self.create_application()
+        directory = app.fs().path(self.profs_directory)
+        self.clear_paths.append(directory)
+
+        driver = app.wsgi_app._manager.get('aggregate')
+        self.assert_is_instance(driver, Aggregate)
+        self.assert_equal(60, driver._window)
+        self.assert_equal(5, driver._top)
+
+        # Add routes
+        rule = '/' + self.rand_str(20)
+        @app.route(rule)
+        def handle_route():
+            return ''
+        rule2 = '/' + self.rand_str(20) + '/<name>'
+        @app.route(rule2)
+        def handle_route2(name):
+            return ''
+
+        # Profiles within the window are merged
+        driver.process(self._profile(), 1000, 1001, self._environment(rule), None)
+        driver.process(self._profile(), 1010, 1013, self._environment(rule), None)
+        driver.process(self._profile(), 1020, 1021, self._environment(rule2.replace('<name>', 'a')), None)
+        driver.process(self._profile(), 1030, 1031, self._environment(rule2.replace('<name>', 'b')), None)
+        self.assert_equal(0, len(self._get_files(directory)))
+        self.assert_equal(2, driver._endpoints['edmunds.route.%s' % rule][1])
+        self.assert_equal(2, driver._endpoints['edmunds.route.%s' % rule2][1])
+
+        # Window is written when it has passed
+        driver.process(self._profile(), 1050, 1060, self._environment('/unknown'), None)
+        files = self._get_files(directory)
+        self.assert_equal(6, len(files))
+        self.assert_equal({}, driver._endpoints)
+
+        report_file = [file for file in files if file.endswith('%s.txt.aggregate' % rule.strip('/'))][0]
+        with open(report_file) as f:
+            report = f.read()
+        self.assert_in('ENDPOINT: edmunds.route.%s' % rule, report)
+        self.assert_in('REQUESTS: 2', report)
+        self.assert_in('AVERAGE DURATION: 2.000000', report)
+        self.assert_in('_profiled', report)
+
+        profile_file = [file for file in files if file.endswith('%s.prof.aggregate' % rule.strip('/'))][0]
+        with open(profile_file) as f:
+            self.assert_in('_profiled', f.read())
+
+        # Flush
+        driver.process(self._profile(), 2000, 2001, self._environment(rule), None)
+        self.assert_is_not_none(driver._timer)
+        driver.flush()
+        self.assert_is_none(driver._timer)
+        self.assert_equal(8, len(self._get_files(directory)))
+        driver.flush()
+        self.assert_equal(8, len(self._get_files(directory)))
+
+        # Timer writes the window without a request ending it
+        driver._window = 0.05
+        driver.process(self._profile(), 3000, 3000.01, self._environment(rule), None)
+        timer = driver._timer
+        timer.join()
+        self.assert_is_none(driver._timer)
+        self.assert_equal(10, len(self._get_files(directory)))
+
+    def _profile(self):
+        """
+        Profile a function
+        :return:    The profiler
+        :rtype:     cProfile.Profile
+        """
+
+        def _profiled():
+            return sorted(range(100))
+
+        profiler = Profile()
+        profiler.runcall(_profiled)
+
+        return profiler
+
+    def _environment(self, path):
+        """
+        Get the environment of a request
+        :param path:    The path
+        :type  path:    str
+        :return:        The environment
+        :rtype:         dict
+        """
+
+        return EnvironBuilder(path=path).get_environ()
+
+    def _get_files(self, directory):
+        """
+        Get the profiler files
+        :param directory:   The directory
+        :type  directory:   str
+        :return:            The files
+        :rtype:             list
+        """
+
+        prof_files = []
+        for root, subdirs, files in os.walk(directory):
+            for file in files:
+                if file.startswith(self.prefix):
+                    prof_files.append(os.path.join(root, file))
+
+        return prof_files
@@ -94,7 +94,7 @@ class TestCallGraph(TestCase):
             self.assert_equal(0, len(prof_files))
 
             # Call route
-            c.get(rule)
+            c.get(rule, buffered=True)
 
             # Count profiler files
             prof_files = []
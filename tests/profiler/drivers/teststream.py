@@ -52,7 +52,7 @@ class TestStream(TestCase):
             self.assert_equal('', stream.getvalue())
 
             # Call route
-            c.get(rule)
+            c.get(rule, buffered=True)
 
             # Check stream
             self.assert_not_equal('', stream.getvalue())
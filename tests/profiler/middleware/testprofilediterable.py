@@ -0,0 +1,46 @@
+
+from tests.testcase import TestCase
+from edmunds.profiler.middleware.profilediterable import ProfiledIterable
+from cProfile import Profile
+import mock
+
+
+class TestProfiledIterable(TestCase):
+    """
+    Test the Profiled Iterable
+    """
+
+    def test_iterable(self):
+        """
+        Test the iterable
+        """
+
+        iterable = mock.MagicMock()
+        iterable.__iter__.return_value = iter([b'first', b'second'])
+        on_close = mock.MagicMock()
+
+        profiled = ProfiledIterable(iterable, Profile(), on_close)
+
+        self.assert_equal([b'first', b'second'], list(profiled))
+        self.assert_false(on_close.called)
+
+        # Closing is done once
+        profiled.close()
+        profiled.close()
+        iterable.close.assert_called_once_with()
+        on_close.assert_called_once_with()
+
+    def test_close_error(self):
+        """
+        Test profile is processed when closing fails
+        """
+
+        iterable = mock.MagicMock()
+        iterable.close.side_effect = RuntimeError('close')
+        on_close = mock.MagicMock()
+
+        profiled = ProfiledIterable(iterable, Profile(), on_close)
+
+        with self.assert_raises(RuntimeError):
+            profiled.close()
+        on_close.assert_called_once_with()
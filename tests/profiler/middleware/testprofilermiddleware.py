@@ -1,5 +1,10 @@
 
 from tests.testcase import TestCase
+from edmunds.profiler.middleware.profilermiddleware import ProfilerMiddleware
+from edmunds.profiler.profiledata import ProfileData
+from edmunds.profiler.profilerworker import ProfilerWorker
+import mock
+import time
 
 
 class TestProfilerMiddleware(TestCase):
@@ -50,7 +55,7 @@ class TestProfilerMiddleware(TestCase):
             self.assert_equal('', stream.getvalue())
 
             # Call route
-            c.get(rule)
+            c.get(rule, buffered=True)
 
             # Check stream
             self.assert_equal('', stream.getvalue())
@@ -98,7 +103,7 @@ class TestProfilerMiddleware(TestCase):
             self.assert_equal('', stream.getvalue())
 
             # Call route
-            c.get(rule)
+            c.get(rule, buffered=True)
 
             # Check stream
             self.assert_equal('', stream.getvalue())
@@ -146,7 +151,7 @@ class TestProfilerMiddleware(TestCase):
             self.assert_equal('', stream.getvalue())
 
             # Call route
-            c.get(rule)
+            c.get(rule, buffered=True)
 
             # Check stream
             self.assert_equal('', stream.getvalue())
@@ -194,7 +199,7 @@ class TestProfilerMiddleware(TestCase):
             self.assert_equal('', stream.getvalue())
 
             # Call route
-            c.get(rule)
+            c.get(rule, buffered=True)
 
             # Check stream
             self.assert_not_equal('', stream.getvalue())
@@ -250,9 +255,286 @@ class TestProfilerMiddleware(TestCase):
             self.assert_equal(stream.getvalue(), stream2.getvalue())
 
             # Call route
-            c.get(rule)
+            c.get(rule, buffered=True)
 
             # Check stream
             self.assert_not_equal('', stream.getvalue())
             self.assert_not_equal('', stream2.getvalue())
             self.assert_equal(stream.getvalue(), stream2.getvalue())
+
+    def test_streaming(self):
+        """
+        Test response is streamed and profile is processed on close
+        """
+
+        # Write config
+        self.write_config([
+            "from edmunds.profiler.drivers.stream import Stream \n",
+            "try: \n",
+            "   from cStringIO import StringIO \n",
+            "except ImportError: \n",
+            "   from io import StringIO \n",
+            "APP = { \n",
+            "   'debug': True, \n",
+            "   'profiler': { \n",
+            "       'enabled': True, \n",
+            "       'instances': [ \n",
+            "           { \n",
+            "               'name': 'stream',\n",
+            "               'driver': Stream,\n",
+            "               'stream': StringIO(),\n",
+            "           }, \n",
+            "       ], \n",
+            "   }, \n",
+            "} \n",
+        ])
+
+        # Create app and fetch stream
+        app = self.create_application()
+        stream = app.config('app.profiler.instances')[0]['stream']
+
+        # Add route
+        produced = []
+        rule = '/' + self.rand_str(20)
+        @app.route(rule)
+        def handle_route():
+            def generate():
+                for chunk in (b'first', b'second'):
+                    produced.append(chunk)
+                    yield chunk
+            return app.response_class(generate())
+
+        with app.test_client() as c:
+
+            response = c.get(rule, buffered=False)
+
+            # Nothing is produced or processed up front
+            self.assert_equal([], produced)
+            self.assert_equal('', stream.getvalue())
+
+            # Chunks are streamed one by one
+            iterator = iter(response.response)
+            self.assert_equal(b'first', next(iterator))
+            self.assert_equal([b'first'], produced)
+            self.assert_equal(b'second', next(iterator))
+            self.assert_equal('', stream.getvalue())
+
+            # Profile is processed on close
+            response.close()
+            self.assert_not_equal('', stream.getvalue())
+            self.assert_in('generate', stream.getvalue())
+
+    def test_production(self):
+        """
+        Test profiling outside debug-mode when allowed
+        """
+
+        app, stream = self._create_profiled_application(debug=False, debugonly=False)
+        rule = self._add_route(app)
+
+        with app.test_client() as c:
+            c.get(rule, buffered=True)
+            self.assert_not_equal('', stream.getvalue())
+
+    def test_sample_rate(self):
+        """
+        Test sample rate
+        """
+
+        app, stream = self._create_profiled_application(samplerate=0.5)
+        rule = self._add_route(app)
+
+        with app.test_client() as c:
+
+            with mock.patch('random.random', return_value=0.6):
+                c.get(rule, buffered=True)
+            self.assert_equal('', stream.getvalue())
+
+            with mock.patch('random.random', return_value=0.4):
+                c.get(rule, buffered=True)
+            self.assert_not_equal('', stream.getvalue())
+
+    def test_paths(self):
+        """
+        Test path allowlist
+        """
+
+        app, stream = self._create_profiled_application(paths=['/profiled'])
+        rule = self._add_route(app, '/profiled/' + self.rand_str(20))
+        other_rule = self._add_route(app)
+
+        with app.test_client() as c:
+
+            c.get(other_rule, buffered=True)
+            self.assert_equal('', stream.getvalue())
+
+            c.get(rule, buffered=True)
+            self.assert_not_equal('', stream.getvalue())
+
+    def test_trigger(self):
+        """
+        Test header and cookie trigger
+        """
+
+        app, stream = self._create_profiled_application(samplerate=0, trigger={'header': 'X-Profile',
+                                                                               'cookie': 'profile',
+                                                                               'value': 'secret'})
+        rule = self._add_route(app)
+
+        with app.test_client() as c:
+
+            c.get(rule, buffered=True)
+            c.get(rule, buffered=True, headers={'X-Profile': 'wrong'})
+            c.get(rule, buffered=True, headers={'X-Profile': ''})
+            self.assert_equal('', stream.getvalue())
+
+            c.get(rule, buffered=True, headers={'X-Profile': 'secret'})
+            value = stream.getvalue()
+            self.assert_not_equal('', value)
+
+            c.set_cookie('localhost', 'profile', 'secret')
+            c.get(rule, buffered=True)
+            self.assert_not_equal(value, stream.getvalue())
+
+    def test_slow_threshold(self):
+        """
+        Test slow threshold
+        """
+
+        app, stream = self._create_profiled_application(slowthreshold=0.05)
+        rule = self._add_route(app)
+
+        slow_rule = '/' + self.rand_str(20)
+        @app.route(slow_rule)
+        def handle_slow_route():
+            time.sleep(0.1)
+            return ''
+
+        with app.test_client() as c:
+
+            c.get(rule, buffered=True)
+            self.assert_equal('', stream.getvalue())
+
+            c.get(slow_rule, buffered=True)
+            self.assert_not_equal('', stream.getvalue())
+
+    def test_sampling_mode(self):
+        """
+        Test sampling mode
+        """
+
+        app, stream = self._create_profiled_application(mode='sampling', samplinginterval=0.001)
+
+        rule = '/' + self.rand_str(20)
+        @app.route(rule)
+        def handle_route():
+            end = time.time() + 0.1
+            while time.time() < end:
+                pass
+            return ''
+
+        with app.test_client() as c:
+            c.get(rule, buffered=True)
+            self.assert_in('handle_route', stream.getvalue())
+
+    def test_background(self):
+        """
+        Test processing profiles in the background
+        """
+
+        app, stream = self._create_profiled_application(background=True, queuesize=10, droppolicy='oldest')
+        rule = self._add_route(app)
+
+        middleware = app.wsgi_app
+        self.assert_is_instance(middleware, ProfilerMiddleware)
+        self.assert_is_instance(middleware._worker, ProfilerWorker)
+        self.assert_equal(10, middleware._worker._queue.maxsize)
+        self.assert_equal('oldest', middleware._worker._drop_policy)
+
+        with app.test_client() as c:
+            with mock.patch.object(middleware._worker, '_process', wraps=middleware._process) as process:
+                c.get(rule, buffered=True)
+                middleware._worker.join()
+
+        self.assert_not_equal('', stream.getvalue())
+        self.assert_is_instance(process.call_args[0][0], ProfileData)
+        self.assert_equal(rule, process.call_args[0][3]['PATH_INFO'])
+
+    def test_trigger_without_value(self):
+        """
+        Test a trigger requires a value
+        """
+
+        for trigger in [{'header': 'X-Profile'}, {'cookie': 'profile'}, {'header': 'X-Profile', 'value': ''}]:
+            with self.assert_raises_regexp(RuntimeError, 'missing a value'):
+                self._create_profiled_application(trigger=trigger)
+
+    def test_unknown_mode(self):
+        """
+        Test unknown mode
+        """
+
+        with self.assert_raises_regexp(RuntimeError, 'Unknown profiler mode'):
+            self._create_profiled_application(mode='unknown')
+
+    def _create_profiled_application(self, debug=True, **options):
+        """
+        Create an application with profiling to a stream
+        :param debug:   Debug-mode
+        :type  debug:   bool
+        :param options: The profiler options
+        :type  options: dict
+        :return:        The application and the stream
+        :rtype:         tuple
+        """
+
+        config = [
+            "from edmunds.profiler.drivers.stream import Stream \n",
+            "try: \n",
+            "   from cStringIO import StringIO \n",
+            "except ImportError: \n",
+            "   from io import StringIO \n",
+            "APP = { \n",
+            "   'debug': %r, \n" % debug,
+            "   'profiler': { \n",
+            "       'enabled': True, \n",
+        ]
+        for key in options:
+            config.append("       %r: %r, \n" % (key, options[key]))
+        config.extend([
+            "       'instances': [ \n",
+            "           { \n",
+            "               'name': 'stream',\n",
+            "               'driver': Stream,\n",
+            "               'stream': StringIO(),\n",
+            "           }, \n",
+            "       ], \n",
+            "   }, \n",
+            "} \n",
+        ])
+        self.write_config(config)
+
+        app = self.create_application()
+        stream = app.config('app.profiler.instances')[0]['stream']
+
+        return app, stream
+
+    def _add_route(self, app, rule=None):
+        """
+        Add a route
+        :param app:     The application
+        :type  app:     Application
+        :param rule:    The rule
+        :type  rule:    str
+        :return:        The rule
+        :rtype:         str
+        """
+
+        if rule is None:
+            rule = '/' + self.rand_str(20)
+
+        def handle_route():
+            return ''
+        app.route(rule, endpoint=rule)(handle_route)
+
+        return rule
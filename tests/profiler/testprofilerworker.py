@@ -0,0 +1,105 @@
+
+from tests.testcase import TestCase
+from edmunds.profiler.profilerworker import ProfilerWorker
+from threading import Event
+import mock
+
+
+class TestProfilerWorker(TestCase):
+    """
+    Test the Profiler Worker
+    """
+
+    def test_process(self):
+        """
+        Test processing in the background
+        """
+
+        process = mock.MagicMock()
+        worker = ProfilerWorker(self.app, process)
+
+        self.assert_true(worker.submit('profile', 1))
+        self.assert_true(worker.submit('profile2', 2))
+        worker.join()
+
+        self.assert_equal([mock.call('profile', 1), mock.call('profile2', 2)], process.call_args_list)
+        self.assert_equal(0, worker.dropped)
+
+    def test_error(self):
+        """
+        Test errors are logged and processing continues
+        """
+
+        process = mock.MagicMock(side_effect=[RuntimeError('error'), None])
+        app = mock.MagicMock()
+        worker = ProfilerWorker(app, process)
+
+        worker.submit('profile')
+        worker.submit('profile2')
+        worker.join()
+
+        self.assert_equal(2, process.call_count)
+        self.assert_equal(1, app.logger.error.call_count)
+
+    def test_drop_newest(self):
+        """
+        Test dropping the newest profile
+        """
+
+        processed, release = self._create_blocked_process()
+        worker = ProfilerWorker(self.app, processed.append_blocking, queue_size=1)
+
+        self.assert_true(worker.submit('profile'))
+        processed.started.wait(5)
+        self.assert_true(worker.submit('profile2'))
+        self.assert_false(worker.submit('profile3'))
+        self.assert_equal(1, worker.dropped)
+
+        release.set()
+        worker.join()
+        self.assert_equal(['profile', 'profile2'], processed)
+
+    def test_drop_oldest(self):
+        """
+        Test dropping the oldest profile
+        """
+
+        processed, release = self._create_blocked_process()
+        worker = ProfilerWorker(self.app, processed.append_blocking, queue_size=1, drop_policy='oldest')
+
+        self.assert_true(worker.submit('profile'))
+        processed.started.wait(5)
+        self.assert_true(worker.submit('profile2'))
+        self.assert_true(worker.submit('profile3'))
+        self.assert_equal(1, worker.dropped)
+
+        release.set()
+        worker.join()
+        self.assert_equal(['profile', 'profile3'], processed)
+
+    def test_unknown_drop_policy(self):
+        """
+        Test unknown drop policy
+        """
+
+        with self.assert_raises_regexp(RuntimeError, 'Unknown drop policy'):
+            ProfilerWorker(self.app, None, drop_policy='unknown')
+
+    def _create_blocked_process(self):
+        """
+        Create a process that blocks until released
+        :return:    The processed list and release event
+        :rtype:     tuple
+        """
+
+        release = Event()
+
+        class Processed(list):
+            started = Event()
+
+            def append_blocking(self, value):
+                self.append(value)
+                self.started.set()
+                release.wait(5)
+
+        return Processed(), release
@@ -0,0 +1,71 @@
+
+from tests.testcase import TestCase
+from edmunds.profiler.samplingprofiler import SamplingProfiler
+from pstats import Stats
+import time
+
+
+class TestSamplingProfiler(TestCase):
+    """
+    Test the Sampling Profiler
+    """
+
+    def test_sampling(self):
+        """
+        Test sampling the current thread
+        """
+
+        def busy():
+            end = time.time() + 0.1
+            while time.time() < end:
+                pass
+
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.runcall(busy)
+
+        # Sampler stopped sampling
+        samples = dict(profiler._samples)
+        time.sleep(0.01)
+        self.assert_equal(samples, profiler._samples)
+        self.assert_not_in(profiler, SamplingProfiler._enabled_profilers)
+
+        entries = dict((entry.code.co_name, entry) for entry in profiler.getstats() if hasattr(entry.code, 'co_name'))
+        self.assert_in('busy', entries)
+        self.assert_greater(entries['busy'].callcount, 0)
+        self.assert_in('busy', [subentry.code.co_name for subentry in entries['runcall'].calls])
+
+    def test_stats(self):
+        """
+        Test stats of samples
+        """
+
+        def outer():
+            pass
+
+        def inner():
+            pass
+
+        profiler = SamplingProfiler()
+        profiler._last_sample = 100
+        frame = mock_frame(inner.__code__, mock_frame(outer.__code__))
+        profiler.sample(frame, 101)
+        profiler.sample(frame, 103)
+        profiler.sample(mock_frame(outer.__code__), 104)
+
+        stats = Stats(profiler).stats
+        outer_label = (outer.__code__.co_filename, outer.__code__.co_firstlineno, 'outer')
+        inner_label = (inner.__code__.co_filename, inner.__code__.co_firstlineno, 'inner')
+
+        self.assert_equal((3, 3, 1, 4), stats[outer_label][0:4])
+        self.assert_equal((2, 2, 3, 3), stats[inner_label][0:4])
+        self.assert_equal({outer_label: (2, 2, 3, 3)}, stats[inner_label][4])
+
+
+class mock_frame(object):
+    """
+    Frame with only a code and back frame
+    """
+
+    def __init__(self, code, back=None):
+        self.f_code = code
+        self.f_back = back
@@ -0,0 +1,129 @@
+from tests.testcase import TestCase
+from edmunds.support.lazyattribute import LazyAttribute
+
+
+class TestLazyAttribute(TestCase):
+    """
+    Test the Lazy Attribute
+    """
+
+    def test_lazy_attribute(self):
+        """
+        Test lazy attribute
+        :return:    void
+        """
+
+        instance = MyLazyClass()
+
+        self.assert_is_instance(MyLazyClass.value, LazyAttribute)
+        self.assert_equal('Load value', MyLazyClass.value.__doc__.strip())
+        self.assert_false(hasattr(instance, '__dict__'))
+        self.assert_equal(0, instance.loaded)
+
+        # Loaded once
+        self.assert_equal(1, instance.value)
+        self.assert_equal(1, instance.value)
+        self.assert_equal(1, instance.loaded)
+
+        # Set value
+        instance.value = 'value'
+        self.assert_equal('value', instance.value)
+        self.assert_equal(1, instance.loaded)
+
+        # Other instance
+        other_instance = MyLazyClass()
+        self.assert_equal(1, other_instance.value)
+
+    def test_slot(self):
+        """
+        Test slot
+        :return:    void
+        """
+
+        instance = MyLazyClass()
+
+        self.assert_equal('_lazy_value', MyLazyClass.value.slot)
+        self.assert_equal('_my_slot', MyLazyClass.slot_value.slot)
+        self.assert_equal('slot value', instance.slot_value)
+        self.assert_equal('slot value', instance._my_slot)
+
+    def test_failed_load(self):
+        """
+        Test failed load is not stored
+        :return:    void
+        """
+
+        instance = MyLazyClass()
+
+        with self.assert_raises_regexp(RuntimeError, 'Failed'):
+            instance.failing_value
+        with self.assert_raises_regexp(RuntimeError, 'Failed'):
+            instance.failing_value
+        self.assert_equal(2, instance.loaded)
+
+    def test_none(self):
+        """
+        Test a value of None is loaded again
+        :return:    void
+        """
+
+        instance = MyLazyClass()
+
+        self.assert_is_none(instance.none_value)
+        self.assert_is_none(instance.none_value)
+        self.assert_equal(2, instance.loaded)
+
+        instance.value = None
+        self.assert_equal(3, instance.value)
+
+    def test_locked(self):
+        """
+        Test locked lazy attribute on a shared instance
+        :return:    void
+        """
+
+        instance = MyLazyClass()
+
+        def target():
+            self.assert_equal(1, instance.locked_value)
+
+        self.thread(target, count=50)
+
+        self.assert_equal(1, instance.loaded)
+
+
+class MyLazyClass(object):
+
+    __slots__ = ('loaded', '_lazy_value', '_my_slot', '_lazy_failing_value', '_lazy_none_value', '_lazy_locked_value')
+
+    def __init__(self):
+        self.loaded = 0
+
+    @LazyAttribute
+    def value(self):
+        """
+        Load value
+        """
+        self.loaded += 1
+        return self.loaded
+
+    def _load_slot_value(self):
+        return 'slot value'
+
+    slot_value = LazyAttribute(_load_slot_value, slot='_my_slot')
+
+    @LazyAttribute
+    def failing_value(self):
+        self.loaded += 1
+        raise RuntimeError('Failed')
+
+    @LazyAttribute
+    def none_value(self):
+        self.loaded += 1
+        return None
+
+    def _load_locked_value(self):
+        self.loaded += 1
+        return self.loaded
+
+    locked_value = LazyAttribute(_load_locked_value, slot='_lazy_locked_value', locked=True)
@@ -5,6 +5,7 @@ from flask import current_app as flask_current_app, \
     request as flask_request, \
     session as flask_session, \
     has_request_context as flask_has_request_context, \
+    has_app_context as flask_has_app_context, \
     make_response as flask_make_response, \
     abort as flask_abort, \
     g as flask_g, \
@@ -20,6 +21,7 @@ from edmunds.globals import abc, \
     request, \
     session, \
     has_request_context, \
+    has_app_context, \
     make_response, \
     abort, \
     g, \
@@ -55,6 +57,7 @@ class TestGlobals(TestCase):
             self.assert_equal_deep(flask_g, g)
 
         self.assert_equal_deep(flask_has_request_context, has_request_context)
+        self.assert_equal_deep(flask_has_app_context, has_app_context)
         self.assert_equal_deep(flask_make_response, make_response)
         self.assert_equal_deep(flask_abort, abort)
         self.assert_equal_deep(flask__request_ctx_stack, _request_ctx_stack)